@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Node backend's financial endpoints.
+
+Serves POST /api/plaid/financial-summary in the shape produced by getFinancialSummary
+in backend/plaidClient.js, after `latency_ms` of simulated Plaid + backend time.
+
+    python benchmarks/backend_stub.py --port 3001 --latency-ms 800
+    FINLEY_BACKEND_URL=http://127.0.0.1:3001 python pipecat_server.py -u ... -t ... -a stub-token
+"""
+
+import argparse
+import asyncio
+import logging
+
+from aiohttp import web
+
+logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+
+SAMPLE_SUMMARY = {
+    "balances": [
+        {"account_id": "stub-checking", "name": "Checking", "balances": {"current": 2450.12}},
+        {"account_id": "stub-savings", "name": "Savings", "balances": {"current": 8200.00}},
+    ],
+    "recentTransactions": [
+        {"transactionId": "tx_1", "amount": 12.45, "date": "2026-10-01", "merchantName": "Taco Bell",
+         "customCategory": "Delights", "customSubcategory": "Fast Food"},
+        {"transactionId": "tx_2", "amount": 86.10, "date": "2026-10-02", "merchantName": "Kroger",
+         "customCategory": "Foundations", "customSubcategory": "Groceries"},
+    ],
+    "summary": {
+        "totalBalance": "10650.12",
+        "monthlySpending": "1843.55",
+        "transactionCount": 57,
+        "topCategories": [
+            {"category": "Foundations", "amount": "1210.40", "subcategories": [
+                {"subcategory": "Housing", "amount": "900.00"},
+                {"subcategory": "Groceries", "amount": "240.15"},
+            ]},
+            {"category": "Delights", "amount": "433.15", "subcategories": [
+                {"subcategory": "Fast Food", "amount": "96.30"},
+                {"subcategory": "Restaurants", "amount": "180.85"},
+            ]},
+        ],
+        "topMerchants": [
+            {"merchant": "Landlord LLC", "amount": "900.00"},
+            {"merchant": "Kroger", "amount": "240.15"},
+        ],
+    },
+}
+
+
+def create_backend_stub_app(latency_ms: float = 800) -> web.Application:
+    app = web.Application()
+    app["stats"] = {"financial_summary": 0}
+
+    async def financial_summary(request: web.Request):
+        body = await request.json()
+        if not body.get("accessToken"):
+            return web.json_response({"error": "Access token is required"}, status=400)
+        await asyncio.sleep(latency_ms / 1000)
+        app["stats"]["financial_summary"] += 1
+        return web.json_response(SAMPLE_SUMMARY)
+
+    app.router.add_post("/api/plaid/financial-summary", financial_summary)
+    return app
+
+
+async def start_backend_stub(port: int = 0, **kwargs):
+    """Start the stub in the running loop; returns (runner, base_url)"""
+    runner = web.AppRunner(create_backend_stub_app(**kwargs), shutdown_timeout=1)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{bound_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    args = parser.parse_args()
+    web.run_app(create_backend_stub_app(args.latency_ms), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""FinancialAssistantProcessor throughput and memory over a long synthetic conversation.
+
+Every turn sends `--audio-frames` 20ms input audio frames (passed through), three
+interim transcripts and a final one through FinancialAssistantProcessor, with the
+financial summary cached from the local backend stub. An instant LLM answers each
+prompt with a fixed reply that AssistantTurnAggregator adds to the shared
+ConversationMemory. One run measures frames per second and the time from the final
+transcript to the prompt reaching the LLM. A second run, under tracemalloc, measures
+how much memory allocated by this repo's modules is still held after `--warmup` turns
+and at the end; pipecat's own queues are left out. Logging is off, so neither run
+includes the per-turn log lines.
+
+    python benchmarks/bench_assistant_processor.py --turns 2000 --audio-frames 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from typing import Deque, Dict, List
+
+from loguru import logger
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    InterimTranscriptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMMessagesFrame,
+    StartFrame,
+    TextFrame,
+    TranscriptionFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend_stub import start_backend_stub
+from pipecat_context import ConversationMemory
+from pipecat_financial_context import FinancialContextCache
+from pipecat_server import AssistantTurnAggregator, FinancialAssistantProcessor
+
+AUDIO = b"\x00\x00" * 320  # 20ms at 16kHz
+QUESTIONS = [
+    "How much did I spend on dining this month?",
+    "What's my checking balance?",
+    "Am I on track with groceries compared to last month, and where could I cut back?",
+    "Which merchant did I spend the most at?",
+    "Can I afford a four hundred dollar weekend trip?",
+]
+REPLY = "You spent about ninety six dollars on fast food this month, a little less than last month."
+
+
+def repo_bytes() -> int:
+    """Traced memory allocated by this repo's modules and still held"""
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, os.path.join(ROOT, "pipecat_*.py"))])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class InstantLLM(FrameProcessor):
+    """Answers every prompt at once, timing how long it took the prompt to get here"""
+
+    def __init__(self, sent: Deque[float]):
+        super().__init__()
+        self.sent = sent
+        self.prompt_ms: List[float] = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, LLMMessagesFrame):
+            self.prompt_ms.append((time.perf_counter() - self.sent.popleft()) * 1000)
+            await self.push_frame(LLMFullResponseStartFrame())
+            for word in REPLY.split():
+                await self.push_frame(TextFrame(word + " "))
+            await self.push_frame(LLMFullResponseEndFrame())
+        else:
+            await self.push_frame(frame, direction)
+
+
+class ReplyCounter(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.started = asyncio.Event()
+        self.replies = 0
+        self.replied = asyncio.Event()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartFrame):
+            self.started.set()
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            self.replies += 1
+            self.replied.set()
+        await self.push_frame(frame, direction)
+
+
+async def converse(args, financial_context: FinancialContextCache, traced: bool = False) -> Dict:
+    memory = ConversationMemory()
+    sent: Deque[float] = deque()
+    llm, counter = InstantLLM(sent), ReplyCounter()
+    processor = FinancialAssistantProcessor("bench-token", memory, financial_context)
+    task = PipelineTask(
+        Pipeline([processor, llm, AssistantTurnAggregator(memory), counter]),
+        params=PipelineParams(allow_interruptions=True),
+        idle_timeout_secs=None,  # Cancelling pipecat's idle monitor after a burst of frames can hang
+    )
+
+    async def feed():
+        await counter.started.wait()
+        frames, warm = 0, None
+        started = time.perf_counter()
+        for turn in range(args.turns):
+            if traced and turn == args.warmup:
+                warm = repo_bytes()
+            question = QUESTIONS[turn % len(QUESTIONS)]
+            for _ in range(args.audio_frames):
+                await task.queue_frame(InputAudioRawFrame(AUDIO, 16000, 1))
+            words = question.split()
+            for n in (len(words) // 4, len(words) // 2, 3 * len(words) // 4):
+                await task.queue_frame(InterimTranscriptionFrame(" ".join(words[:n + 1]), "user", ""))
+            counter.replied.clear()
+            sent.append(time.perf_counter())
+            await task.queue_frame(TranscriptionFrame(question, "user", ""))
+            await counter.replied.wait()
+            frames += args.audio_frames + 4
+        elapsed = time.perf_counter() - started
+        await task.queue_frame(EndFrame())
+        result = {"frames_per_s": round(frames / elapsed), "us_per_frame": round(elapsed / frames * 1e6, 2)}
+        if traced:
+            held = repo_bytes()
+            result = {
+                "held_kb": round(held / 1024, 1),
+                "growth_kb": round((held - warm) / 1024, 1),
+                "history_tokens": memory.history_tokens,
+                "summary_chars": len(memory.summary),
+            }
+        return result
+
+    _, result = await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), feed())
+    if not traced:
+        result["prompt_p50_ms"] = round(percentile(llm.prompt_ms, 0.5), 3)
+        result["prompt_p99_ms"] = round(percentile(llm.prompt_ms, 0.99), 3)
+    return result
+
+
+async def run(turns: int = 2000, audio_frames: int = 50, warmup: int = 100) -> Dict:
+    args = argparse.Namespace(turns=turns, audio_frames=audio_frames, warmup=min(warmup, turns - 1))
+    stub_runner, backend_url = await start_backend_stub(latency_ms=0)
+    financial_context = FinancialContextCache(backend_url)
+    await financial_context.refresh("bench-token")
+    try:
+        result = {"turns": turns, **await converse(args, financial_context)}
+        tracemalloc.start()
+        try:
+            result["memory"] = await converse(args, financial_context, traced=True)
+        finally:
+            tracemalloc.stop()
+    finally:
+        await financial_context.close()
+        await stub_runner.cleanup()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--audio-frames", type=int, default=50, help="Input audio frames per user turn")
+    parser.add_argument("--warmup", type=int, default=100, help="Turns before memory is measured")
+    args = parser.parse_args()
+    logger.remove()
+    logging.getLogger().setLevel(logging.WARNING)
+    print(json.dumps(asyncio.run(run(args.turns, args.audio_frames, args.warmup)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Per-frame CPU and allocations of the TTS audio conditioner against a naive copying one.
+
+Feeds a few seconds of synthetic speech-like audio (tone bursts with pauses) through
+AudioConditioner and through a straightforward implementation that converts every frame
+to float64, trims and resamples with fresh arrays and concatenates bytes. Reports time
+per frame, the share of one core a single call needs, and the transient memory allocated
+per frame as seen by tracemalloc.
+
+    python benchmarks/bench_audio_conditioning.py --frame-ms 20 --seconds 10
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipecat_audio import AudioConditioner, dbfs_to_amplitude
+
+SAMPLE_RATE = 24000  # Cartesia output
+
+
+class NaiveConditioner:
+    """The same trimming, gain and resampling with a fresh array at every step"""
+
+    def __init__(self, target_dbfs=-18.0, silence_dbfs=-50.0, output_rate=None, max_gain=4.0):
+        self.target_rms = dbfs_to_amplitude(target_dbfs) if target_dbfs is not None else None
+        self.threshold = dbfs_to_amplitude(silence_dbfs)
+        self.output_rate = output_rate
+        self.max_gain = max_gain
+        self.gain = 1.0
+        self.audible = False
+        self.held = b""
+
+    def process(self, audio: bytes, sample_rate: int) -> List[bytes]:
+        x = np.frombuffer(audio, dtype=np.int16).astype(np.float64)
+        loud = np.abs(x) > self.threshold
+        if not loud.any():
+            self.held = self.held + audio
+            return []
+        if not self.audible:
+            self.audible = True
+            x = x[int(np.argmax(loud)):]
+        if self.held:
+            x = np.concatenate([np.frombuffer(self.held, dtype=np.int16).astype(np.float64), x])
+            self.held = b""
+        if self.target_rms:
+            rms = np.sqrt(np.mean(x ** 2))
+            desired = min(self.max_gain, max(0.5, self.target_rms / rms))
+            self.gain += 0.2 * (desired - self.gain)
+            x = x * min(self.gain, 32767 / np.max(np.abs(x)))
+        if self.output_rate and self.output_rate != sample_rate:
+            count = int(len(x) * self.output_rate / sample_rate)
+            x = np.interp(np.arange(count) * sample_rate / self.output_rate, np.arange(len(x)), x)
+        return [np.clip(np.round(x), -32768, 32767).astype(np.int16).tobytes()]
+
+
+def speech_like(seconds: float, seed: int = 0) -> np.ndarray:
+    """Tone bursts of 200-700ms at varying loudness, separated by 100-400ms of near silence"""
+    rng = np.random.default_rng(seed)
+    parts, total = [], 0
+    while total < seconds * SAMPLE_RATE:
+        n = int(rng.uniform(0.2, 0.7) * SAMPLE_RATE)
+        t = np.arange(n) / SAMPLE_RATE
+        level = rng.uniform(0.02, 0.3) * 32767
+        burst = level * np.sin(2 * np.pi * rng.uniform(120, 300) * t) * np.hanning(n)
+        gap = rng.normal(0, 3, int(rng.uniform(0.1, 0.4) * SAMPLE_RATE))
+        parts += [burst, gap]
+        total += n + len(gap)
+    return np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+
+
+def measure(make, frames: List[bytes], repeats: int):
+    best = float("inf")
+    for _ in range(repeats):
+        conditioner = make()
+        started = time.perf_counter()
+        for frame in frames:
+            conditioner.process(frame, SAMPLE_RATE)
+        best = min(best, time.perf_counter() - started)
+
+    conditioner = make()
+    tracemalloc.start()
+    transient = 0
+    for frame in frames:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        conditioner.process(frame, SAMPLE_RATE)
+        transient += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return best / len(frames), transient / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    audio = speech_like(args.seconds).tobytes()
+    frame_bytes = SAMPLE_RATE * args.frame_ms // 1000 * 2
+    frames = [audio[i:i + frame_bytes] for i in range(0, len(audio), frame_bytes)]
+
+    cases = [
+        ("trim only", dict(target_dbfs=None), dict(target_dbfs=None)),
+        ("trim + gain", {}, {}),
+        ("trim + gain + 16kHz", dict(output_rate=16000), dict(output_rate=16000)),
+    ]
+    print(f"{len(frames)} frames of {args.frame_ms}ms at {SAMPLE_RATE}Hz\n")
+    print(f"{'case':<22} {'impl':<10} {'us/frame':>9} {'core %/call':>12} {'bytes/frame':>12}")
+    for name, options, naive_options in cases:
+        for impl, make in (
+            ("numpy", lambda: AudioConditioner(**options)),
+            ("naive", lambda: NaiveConditioner(**naive_options)),
+        ):
+            seconds, transient = measure(make, frames, args.repeats)
+            share = seconds / (args.frame_ms / 1000) * 100
+            print(f"{name:<22} {impl:<10} {seconds * 1e6:>9.1f} {share:>11.3f}% {transient:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
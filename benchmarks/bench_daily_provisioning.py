@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Session-start provisioning latency against the local Daily stub.
+
+Compares the old path (fresh ClientSession per call, room -> user token -> bot token
+in sequence) with the pooled session + concurrent tokens, and with a warm room cache.
+
+    python benchmarks/bench_daily_provisioning.py --iterations 50
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+
+from daily_stub import start_daily_stub
+
+logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+
+
+async def provision_unpooled(api_url: str):
+    """The pre-pooling behaviour: three sequential calls, each on a new session"""
+    headers = {"Authorization": "Bearer stub", "Content-Type": "application/json"}
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{api_url}/rooms", headers=headers, json={"properties": {}}) as response:
+            room_url = (await response.json())["url"]
+    for user_name in ("user", "finley_bot"):
+        token_config = {"properties": {"room_name": room_url.split("/")[-1], "user_name": user_name}}
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"{api_url}/meeting-tokens", headers=headers, json=token_config) as response:
+                await response.json()
+
+
+def summarize(name: str, samples_ms: list) -> dict:
+    ordered = sorted(samples_ms)
+    return {
+        "scenario": name,
+        "iterations": len(ordered),
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)], 2),
+        "mean_ms": round(statistics.fmean(ordered), 2),
+    }
+
+
+async def timed(iterations: int, call) -> list:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def run(iterations: int, latency_ms: float, handshake_ms: float) -> list:
+    runner, api_url = await start_daily_stub(latency_ms=latency_ms, handshake_ms=handshake_ms)
+    os.environ["DAILY_API_URL"] = api_url
+    os.environ["DAILY_API_KEY"] = "stub"
+
+    from pipecat_server_manager import DailyRoomCache, DailyRoomManager
+
+    results = [summarize("unpooled_sequential", await timed(iterations, lambda: provision_unpooled(api_url)))]
+
+    manager = DailyRoomManager()
+    results.append(summarize("pooled_concurrent", await timed(iterations, manager.create_credentials)))
+
+    cache = DailyRoomCache(manager, size=iterations)
+    await cache.start()
+    while len(cache._rooms) < iterations:
+        await asyncio.sleep(0.05)
+    results.append(summarize("room_cache_hit", await timed(iterations, cache.acquire)))
+    while len(cache._rooms) < iterations:  # let the refill settle before tearing down
+        await asyncio.sleep(0.05)
+
+    await cache.stop()
+    await manager.close()
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--handshake-ms", type=float, default=120)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations, args.latency_ms, args.handshake_ms))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scenario':<22} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for r in results:
+        print(f"{r['scenario']:<22} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['mean_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Time the session event sink adds per frame, against per-turn logging and against neither.
+
+The same synthetic conversation as benchmarks/bench_assistant_processor.py runs three
+times. Each turn is `--audio-frames` 20ms input frames, user speech start and stop, a
+final transcript, an instant LLM reply and its usage metrics:
+  off      no event sink, and the transcript log lines below DEBUG are skipped
+  logging  those lines at DEBUG, formatted and written to a pipe that a thread drains,
+           the way the node drains a bot's stdout (the behaviour before the sink)
+  sink     SessionEvents into an EventSink writing gzip JSONL to a temp directory, with
+           SessionEventTap in place of the LatencyTap the other runs end with
+The per-frame time of each run is reported, and the time the sink and logging add to
+the `off` run; as that difference is within the run-to-run spread, the time spent in
+emit and the writer thread's CPU time are measured directly too. Then `--burst` events
+are emitted back to back into a sink holding 1024. This shows that emit never waits for
+the writer once it falls behind, and that the overflow is sampled and then dropped. The
+slowest emit there is the interpreter switching to the writer thread mid-burst.
+
+    python benchmarks/bench_event_sink.py --turns 2000 --burst 100000
+"""
+
+import argparse
+import asyncio
+import glob
+import gzip
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from loguru import logger
+from pipecat.frames.frames import (
+    EndFrame,
+    InputAudioRawFrame,
+    MetricsFrame,
+    TextFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.metrics.metrics import LLMTokenUsage, LLMUsageMetricsData
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_assistant_processor import AUDIO, QUESTIONS, InstantLLM, ReplyCounter
+from pipecat_context import ConversationMemory
+from pipecat_event_sink import EventSink, SessionEvents
+from pipecat_metrics import TurnLatencyTracker
+from pipecat_server import AssistantTurnAggregator, FinancialAssistantProcessor, LatencyTap, SessionEventTap
+
+# The last stage before the output transport is a LatencyTap either way
+MARKS = [(TextFrame, "llm_first_token")]
+USAGE = LLMUsageMetricsData(
+    processor="bench-llm", model="instant",
+    value=LLMTokenUsage(prompt_tokens=420, completion_tokens=18, total_tokens=438),
+)
+
+
+class TimedEvents(SessionEvents):
+    """SessionEvents that adds up the time spent in emit"""
+
+    __slots__ = ("seconds",)
+
+    def __init__(self, sink: EventSink, session: str):
+        super().__init__(sink, session)
+        self.seconds = 0.0
+
+    def emit(self, event: str, **data):
+        started = time.perf_counter()
+        self.sink.emit(self.session, event, data)
+        self.seconds += time.perf_counter() - started
+
+
+class PipeLog:
+    """pipecat_server's log lines into a pipe, read by a thread as the node reads bot stdout"""
+
+    def __init__(self):
+        read_fd, write_fd = os.pipe()
+        self.reader = threading.Thread(target=self._drain, args=(read_fd,), daemon=True)
+        self.reader.start()
+        self.stream = os.fdopen(write_fd, "w")
+        self.handler = logging.StreamHandler(self.stream)
+        self.handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        self.logger = logging.getLogger("pipecat_server")
+
+    @staticmethod
+    def _drain(fd: int):
+        with os.fdopen(fd, "rb") as pipe:
+            while pipe.read1(65536):
+                pass
+
+    def __enter__(self):
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        return self
+
+    def __exit__(self, *exc):
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(logging.NOTSET)
+        self.logger.propagate = True
+        self.stream.close()
+        self.reader.join()
+
+
+async def converse(args, events: Optional[SessionEvents]) -> Tuple[float, int]:
+    """Microseconds per frame over `args.turns` turns, and the number of frames"""
+    memory = ConversationMemory()
+    sent: Deque[float] = deque()
+    llm, counter = InstantLLM(sent), ReplyCounter()
+    tracker = TurnLatencyTracker({}, lambda record: None)
+    stages = [
+        FinancialAssistantProcessor(None, memory, events=events),
+        llm,
+        AssistantTurnAggregator(memory, events),
+        SessionEventTap(events, tracker, MARKS) if events else LatencyTap(tracker, MARKS),
+        counter,
+    ]
+    task = PipelineTask(
+        Pipeline(stages),
+        params=PipelineParams(allow_interruptions=False),
+        idle_timeout_secs=None,  # Cancelling pipecat's idle monitor after a burst of frames can hang
+    )
+
+    async def feed():
+        await counter.started.wait()
+        frames = 0
+        started = time.perf_counter()
+        for turn in range(args.turns):
+            await task.queue_frame(UserStartedSpeakingFrame())
+            for _ in range(args.audio_frames):
+                await task.queue_frame(InputAudioRawFrame(AUDIO, 16000, 1))
+            await task.queue_frame(UserStoppedSpeakingFrame())
+            counter.replied.clear()
+            sent.append(time.perf_counter())
+            await task.queue_frame(TranscriptionFrame(QUESTIONS[turn % len(QUESTIONS)], "user", ""))
+            await task.queue_frame(MetricsFrame(data=[USAGE]))
+            await counter.replied.wait()
+            frames += args.audio_frames + 4
+        elapsed = time.perf_counter() - started
+        await task.queue_frame(EndFrame())
+        return elapsed / frames * 1e6, frames
+
+    _, result = await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), feed())
+    return result
+
+
+def read_events(directory: str) -> int:
+    lines = 0
+    for path in glob.glob(os.path.join(directory, "*.jsonl.gz")):
+        with gzip.open(path, "rt") as f:
+            for line in f:
+                json.loads(line)
+                lines += 1
+    return lines
+
+
+def burst(events: int) -> Dict:
+    directory = tempfile.mkdtemp(prefix="finley-events-")
+    sink = EventSink(directory, max_queue=1024, flush_interval=0.05)
+    slowest = 0.0
+    started = time.perf_counter()
+    for n in range(events):
+        before = time.perf_counter()
+        sink.emit("burst", "transcript", {"role": "user", "text": QUESTIONS[n % len(QUESTIONS)]})
+        slowest = max(slowest, time.perf_counter() - before)
+    elapsed = time.perf_counter() - started
+    sink.close()
+    stats = sink.stats()
+    return {
+        "events": events,
+        "emit_ns": round(elapsed / events * 1e9),
+        "slowest_emit_us": round(slowest * 1e6, 1),
+        "kept": stats["emitted"],
+        "sampled": stats["sampled"],
+        "dropped": stats["dropped"],
+        "lines_read_back": read_events(directory),
+    }
+
+
+async def run(turns: int = 2000, audio_frames: int = 50, burst_events: int = 100_000) -> Dict:
+    args = argparse.Namespace(turns=turns, audio_frames=audio_frames)
+    off, frames = await converse(args, None)
+    with PipeLog():
+        logged, _ = await converse(args, None)
+
+    directory = tempfile.mkdtemp(prefix="finley-events-")
+    sink = EventSink(directory)
+    events = TimedEvents(sink, "bench")
+    sunk, _ = await converse(args, events)
+    writer_cpu = time.clock_gettime(time.pthread_getcpuclockid(sink._writer.ident))
+    sink.close()
+    stats = sink.stats()
+
+    return {
+        "turns": turns,
+        "off_us_per_frame": round(off, 2),
+        "logging_us_per_frame": round(logged, 2),
+        "sink_us_per_frame": round(sunk, 2),
+        "logging_added_us": round(logged - off, 2),
+        "sink_added_us": round(sunk - off, 2),
+        # Measured directly: the run-to-run spread of the figures above is larger than these
+        "emit_us_per_frame": round(events.seconds / frames * 1e6, 3),
+        "writer_cpu_us_per_frame": round(writer_cpu / frames * 1e6, 3),
+        "sink": {
+            "events": stats["written"],
+            "batches": stats["batches"],
+            "bytes_per_event": round(stats["bytes_written"] / max(1, stats["written"]), 1),
+            "dropped": stats["dropped"],
+        },
+        "burst": burst(burst_events),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--audio-frames", type=int, default=50, help="Input audio frames per user turn")
+    parser.add_argument("--burst", type=int, default=100_000, help="Events emitted back to back")
+    args = parser.parse_args()
+    logger.remove()
+    logging.getLogger().setLevel(logging.WARNING)
+    print(json.dumps(asyncio.run(run(args.turns, args.audio_frames, args.burst)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Per-turn cost of adding financial context to the prompt, with and without the cache.
+
+Simulates a call of `--turns` user turns against the local backend stub. The uncached
+path fetches /api/plaid/financial-summary inside every turn; the cached path prefetches
+at bot start and only reads memory while building prompts.
+
+    python benchmarks/bench_financial_context.py --turns 20 --latency-ms 800
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend_stub import start_backend_stub
+from pipecat_financial_context import FinancialContextCache, format_financial_context
+
+
+async def uncached_turns(base_url: str, turns: int) -> list:
+    samples = []
+    async with aiohttp.ClientSession() as session:
+        for _ in range(turns):
+            started = time.perf_counter()
+            async with session.post(f"{base_url}/api/plaid/financial-summary", json={"accessToken": "stub"}) as r:
+                format_financial_context(await r.json())
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def cached_turns(cache: FinancialContextCache, turns: int, bot_start_s: float) -> list:
+    cache.prefetch("stub")
+    # The transport join happens while the prefetch runs
+    await asyncio.sleep(bot_start_s)
+    samples = []
+    for _ in range(turns):
+        started = time.perf_counter()
+        entry = cache.get("stub")
+        _ = entry.text if entry else ""
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0)
+    return samples
+
+
+async def run(turns: int, latency_ms: float, bot_start_s: float) -> dict:
+    runner, base_url = await start_backend_stub(latency_ms=latency_ms)
+    results = {}
+
+    samples = await uncached_turns(base_url, turns)
+    results["uncached"] = {"p50_ms": round(statistics.median(samples), 3), "max_ms": round(max(samples), 3)}
+
+    cache = FinancialContextCache(backend_url=base_url, ttl=300)
+    samples = await cached_turns(cache, turns, bot_start_s)
+    results["cached"] = {"p50_ms": round(statistics.median(samples), 4), "max_ms": round(max(samples), 4)}
+    results["cache_stats"] = cache.stats()
+
+    await cache.close()
+    await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--bot-start-s", type=float, default=1.0, help="Time between bot start and the first turn")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.turns, args.latency_ms, args.bot_start_s)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Cost of FrameProfiler per frame, and what its trace shows for a pipeline with a hot spot.
+
+Pushes `--frames` 20ms input audio frames plus a text frame every 50th through a pipeline
+of pass-through stages. One stage burns `--busy-us` of CPU per text frame and another
+blocks the event loop for `--block-ms` every 100th frame. The same pipeline runs
+without the profiler and with it, and the difference per frame and stage is the
+profiler's overhead. The profiled run writes its trace and prints the summary's busiest
+stages and the loop lag it saw.
+
+    python benchmarks/bench_frame_profiler.py --frames 5000 --stages 12
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+from loguru import logger
+from pipecat.frames.frames import EndFrame, Frame, InputAudioRawFrame, StartFrame, TextFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipecat_profiler import FrameProfiler
+
+AUDIO = b"\x00\x00" * 320  # 20ms at 16kHz
+
+
+class PassThrough(FrameProcessor):
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+
+class BusyText(FrameProcessor):
+    """Spins for `busy_us` on every text frame"""
+
+    def __init__(self, busy_us: float):
+        super().__init__()
+        self.busy = busy_us / 1e6
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, TextFrame):
+            until = time.perf_counter() + self.busy
+            while time.perf_counter() < until:
+                pass
+        await self.push_frame(frame, direction)
+
+
+class LoopBlocker(FrameProcessor):
+    """Blocks the event loop for `block_ms` on every 100th audio frame"""
+
+    def __init__(self, block_ms: float):
+        super().__init__()
+        self.block = block_ms / 1000
+        self.seen = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, InputAudioRawFrame):
+            self.seen += 1
+            if self.seen % 100 == 0:
+                time.sleep(self.block)
+        await self.push_frame(frame, direction)
+
+
+class Counter(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.started = asyncio.Event()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartFrame):
+            self.started.set()
+        elif isinstance(frame, (InputAudioRawFrame, TextFrame)):
+            self.count += 1
+        await self.push_frame(frame, direction)
+
+
+async def run_once(args, profiler=None) -> float:
+    counter = Counter()
+    stages = [PassThrough() for _ in range(args.stages)]
+    stages[len(stages) // 2] = BusyText(args.busy_us)
+    stages[len(stages) // 3] = LoopBlocker(args.block_ms)
+    stages.append(counter)
+    if profiler:
+        profiler.instrument(stages)
+    # No idle monitor: cancelling it after a burst of frames can hang pipecat's shutdown
+    task = PipelineTask(Pipeline(stages), params=PipelineParams(allow_interruptions=True), idle_timeout_secs=None)
+    total = args.frames + args.frames // 50
+
+    async def feed():
+        await counter.started.wait()
+        started = time.perf_counter()
+        for i in range(args.frames):
+            await task.queue_frame(InputAudioRawFrame(AUDIO, 16000, 1))
+            if i % 50 == 0:
+                await task.queue_frame(TextFrame("Your dining spend is up twelve percent."))
+            if i % 20 == 0:
+                await asyncio.sleep(0)  # Let queued text frames drain like a live stream would
+        while counter.count < total:
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - started
+        await task.queue_frame(EndFrame())
+        return elapsed
+
+    _, elapsed = await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), feed())
+    return elapsed / total
+
+
+async def run(args):
+    plain = min([await run_once(args) for _ in range(args.repeats)])
+    profiled = []
+    for _ in range(args.repeats):
+        profiler = FrameProfiler(os.path.join(args.out, "bench.trace.json.gz"))
+        profiled.append(await run_once(args, profiler))
+    overhead = min(profiled) - plain
+
+    print(f"{args.frames} audio frames through {args.stages + 1} stages")
+    print(f"  unprofiled  {plain * 1e6:8.1f} us/frame")
+    print(f"  profiled    {min(profiled) * 1e6:8.1f} us/frame  (+{overhead * 1e6:.1f}, {overhead * 1e6 / (args.stages + 1):.2f} us per stage)")
+
+    size = os.path.getsize(profiler.path)
+    with gzip.open(profiler.path, "rt") as f:
+        trace = json.load(f)
+    summary = trace["otherData"]
+    busiest = sorted(
+        ((sum(v["total_ms"] for v in stage["frames"].values()), name) for name, stage in summary["stages"].items()),
+        reverse=True,
+    )[:3]
+    print(f"\ntrace {profiler.path}: {len(trace['traceEvents'])} events, {size / 1024:.0f} KB gzipped")
+    print("busiest stages: " + ", ".join(f"{name} {ms:.0f}ms" for ms, name in busiest))
+    print(f"loop lag: {summary['loop_lag_ms']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--stages", type=int, default=12)
+    parser.add_argument("--busy-us", type=float, default=500)
+    parser.add_argument("--block-ms", type=float, default=30)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--out", default=os.path.join(tempfile.gettempdir(), "finley-frame-profiles"))
+    args = parser.parse_args()
+    logger.remove()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
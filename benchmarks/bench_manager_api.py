@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Manager API latency under concurrent clients, against the Daily stub and stand-in bots.
+
+Runs `pipecat_server_manager.py` under uvicorn with its embedded node. The node spawns
+benchmarks/fake_bot.py through PIPECAT_BOT_SCRIPT, so every start pays for room and
+token calls to the local Daily stub (benchmarks/daily_stub.py), admission and the
+handoff to a warm worker process, but no Pipecat session. `--concurrency` clients then
+  start       --sessions bots through /api/v1/bots/start
+  list        --requests calls to /api/v1/bots with all of them running
+  health      --requests calls to /api/health
+  stop        every bot through /api/v1/bots/stop
+and the latency quantiles and request rate of each phase are reported.
+
+    python benchmarks/bench_manager_api.py --sessions 20 --concurrency 8 --requests 400
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from daily_stub import start_daily_stub
+from sim_multinode import free_port, wait_for
+
+logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def start_manager(port: int, daily_url: str, args) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PIPECAT_BOT_SCRIPT": os.path.join(ROOT, "benchmarks", "fake_bot.py"),
+        "PIPECAT_REGISTRY_URL": f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='finley-bench-'), 'sessions.db')}",
+        "PIPECAT_NODE_URL": f"http://127.0.0.1:{port}",
+        # Every start gets a warm worker, so start latency is the manager's and not Python's startup
+        "PIPECAT_WORKER_POOL_SIZE": str(args.sessions),
+        # Only the session count limits admission; CPU spent spawning workers would queue starts
+        "PIPECAT_MAX_CONCURRENT_BOTS": str(args.sessions),
+        "PIPECAT_ADMISSION_SESSION_CPU": "0.001",
+        "PIPECAT_ADMISSION_MAX_CPU": "1000",
+        "PIPECAT_ADMISSION_MAX_LOAD": "1000",
+        "PIPECAT_ADMISSION_MIN_FREE_MB": "0",
+        "DAILY_API_URL": daily_url,
+        "DAILY_API_KEY": "stub",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "pipecat_server_manager:app", "--port", str(port)],
+        cwd=ROOT, env=env, start_new_session=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def pool_ready(session: aiohttp.ClientSession, base: str, timeout: float = 60):
+    """Wait until the embedded node's worker pool is full and warm again"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        async with session.get(f"{base}/api/health") as response:
+            pool = (await response.json())["worker_pool"]
+        if pool["ready"] >= pool["size"]:
+            return
+        await asyncio.sleep(0.2)
+    raise TimeoutError("worker pool did not refill")
+
+
+async def phase(concurrency: int, calls: List) -> Dict:
+    """Run the calls (coroutine factories returning an HTTP status) `concurrency` at a time"""
+    latencies, errors = [], 0
+    pending = iter(calls)
+
+    async def client():
+        nonlocal errors
+        for call in pending:
+            started = time.perf_counter()
+            status = await call()
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += status != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 0.5), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "per_s": round(len(latencies) / elapsed, 1),
+    }
+
+
+async def run(sessions: int = 20, concurrency: int = 8, requests: int = 400, daily_latency_ms: float = 5) -> Dict:
+    args = argparse.Namespace(sessions=sessions)
+    stub_runner, daily_url = await start_daily_stub(latency_ms=daily_latency_ms, handshake_ms=0)
+    port = free_port()
+    manager = start_manager(port, daily_url, args)
+    base = f"http://127.0.0.1:{port}"
+    bot_ids: List[str] = []
+    results = {}
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_for(session, f"{base}/api/health")
+            await pool_ready(session, base, timeout=30 + sessions)
+
+            async def start():
+                async with session.post(f"{base}/api/v1/bots/start") as response:
+                    if response.status == 200:
+                        bot_ids.append((await response.json())["bot_id"])
+                    return response.status
+
+            async def get(path: str):
+                async with session.get(f"{base}{path}") as response:
+                    await response.read()
+                    return response.status
+
+            def stop(bot_id: str):
+                async def call():
+                    async with session.post(f"{base}/api/v1/bots/stop", params={"bot_id": bot_id}) as response:
+                        return response.status
+                return call
+
+            results["start"] = await phase(concurrency, [start] * sessions)
+            await pool_ready(session, base, timeout=30 + sessions)  # Spawning replacement workers would skew the next phases
+            results["list"] = await phase(concurrency, [lambda: get("/api/v1/bots")] * requests)
+            results["health"] = await phase(concurrency, [lambda: get("/api/health")] * requests)
+            results["stop"] = await phase(concurrency, [stop(bot_id) for bot_id in list(bot_ids)])
+    finally:
+        if manager.poll() is None:
+            os.killpg(manager.pid, signal.SIGTERM)
+        manager.wait()
+        await stub_runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400, help="Calls each to the list and health endpoints")
+    parser.add_argument("--daily-latency-ms", type=float, default=5)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.sessions, args.concurrency, args.requests, args.daily_latency_ms)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
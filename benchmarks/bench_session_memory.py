@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Compare resident memory per bot session: one process per session vs a multi-session host.
+
+Sessions are built (transport, services, pipeline task) but never joined to a room,
+so the numbers cover the per-session object graph and shared model weights only.
+
+    python benchmarks/bench_session_memory.py --sessions 1 10 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Services only need keys to be constructed; nothing connects while building
+BENCH_ENV = {
+    "DEEPGRAM_API_KEY": "bench",
+    "OPENAI_API_KEY": "bench",
+    "CARTESIA_API_KEY": "bench",
+}
+
+
+def read_rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+async def build_sessions(mode: str, count: int):
+    """Child side: build `count` sessions the way the given mode would"""
+    import pipecat_server
+    from pipecat_bot_host import SharedBotResources
+
+    resources = None
+    if mode == "host":
+        resources = SharedBotResources(pipecat_server.create_service("vad")[1])
+
+    tasks = []
+    for index in range(count):
+        tasks.append(pipecat_server.build_financial_assistant_task(
+            f"https://bench.daily.co/room-{index}", "bench-token", resources=resources
+        ))
+
+    print(json.dumps({"built": len(tasks)}), flush=True)
+    # Stay alive so the parent can sample RSS
+    await asyncio.sleep(3600)
+
+
+def spawn_child(mode: str, count: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, __file__, "--child", mode, "--sessions", str(count)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, **BENCH_ENV},
+    )
+    process.stdout.readline()  # wait until the sessions are built
+    return process
+
+
+def measure(mode: str, sessions: int) -> dict:
+    started = time.perf_counter()
+    if mode == "process":
+        children = [spawn_child("process", 1) for _ in range(sessions)]
+    else:
+        children = [spawn_child("host", sessions)]
+    elapsed = time.perf_counter() - started
+
+    total_kb = sum(read_rss_kb(child.pid) for child in children)
+    for child in children:
+        child.kill()
+        child.wait()
+
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "processes": len(children),
+        "total_rss_mb": round(total_kb / 1024, 1),
+        "rss_per_session_mb": round(total_kb / 1024 / sessions, 2),
+        "startup_s": round(elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--child", choices=["process", "host"], help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.child:
+        asyncio.run(build_sessions(args.child, args.sessions[0]))
+        return
+
+    results = []
+    for count in args.sessions:
+        for mode in ("process", "host"):
+            results.append(measure(mode, count))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':<8} {'sessions':>8} {'procs':>6} {'total MB':>10} {'MB/session':>11} {'startup s':>10}")
+    for r in results:
+        print(
+            f"{r['mode']:<8} {r['sessions']:>8} {r['processes']:>6} "
+            f"{r['total_rss_mb']:>10} {r['rss_per_session_mb']:>11} {r['startup_s']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
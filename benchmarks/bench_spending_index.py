@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Spending index build time and per-query latency over a synthetic transaction history.
+
+Generates `--transactions` Convex-shaped records (amount, date, merchant, category and
+rawPlaid.customSubcategory) spread over `--months` months, builds the SpendingIndex and
+times each voice tool against a naive pass over the raw records.
+
+    python benchmarks/bench_spending_index.py --transactions 100000
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipecat_spending_index import CATEGORY_STRUCTURE, DAY_MS, SpendingIndex, SpendingTools
+
+MERCHANTS = {
+    "Fast Food": ["Taco Bell", "McDonald's", "Chipotle", "Wendy's"],
+    "Groceries": ["Kroger", "Whole Foods", "Trader Joe's"],
+    "Restaurants": ["Olive Garden", "Local Bistro"],
+    "Transportation": ["Shell", "Uber", "Metro Transit"],
+}
+
+
+def synthetic_transactions(count: int, months: int, today: datetime.date, seed: int = 7):
+    rng = random.Random(seed)
+    end_ms = int(datetime.datetime(today.year, today.month, today.day, tzinfo=datetime.timezone.utc).timestamp() * 1000)
+    start_ms = end_ms - months * 30 * DAY_MS
+    pairs = [(cat, sub) for cat, subs in CATEGORY_STRUCTURE.items() for sub in subs]
+    records = []
+    for i in range(count):
+        category, subcategory = rng.choice(pairs)
+        merchant = rng.choice(MERCHANTS.get(subcategory, [f"{subcategory} Merchant {rng.randint(1, 40)}"]))
+        records.append({
+            "txId": f"tx_{i}",
+            "amount": round(rng.lognormvariate(3, 1), 2) * (1 if rng.random() > 0.05 else -1),
+            "date": rng.randint(start_ms, end_ms),
+            "merchant": merchant,
+            "category": category.lower() if rng.random() < 0.5 else category,
+            "rawPlaid": json.dumps({"customCategory": category, "customSubcategory": subcategory}),
+        })
+    return records
+
+
+def naive_total(records, name: str, start_ms: int, end_ms: int) -> float:
+    """What answering from raw records costs: parse and filter every transaction"""
+    total = 0.0
+    for tx in records:
+        if tx["amount"] <= 0 or not (start_ms <= tx["date"] < end_ms):
+            continue
+        raw = json.loads(tx["rawPlaid"])
+        if raw.get("customSubcategory") == name:
+            total += tx["amount"]
+    return total
+
+
+def time_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return round(statistics.median(samples), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    today = datetime.date.today()
+    records = synthetic_transactions(args.transactions, args.months, today)
+
+    started = time.perf_counter()
+    index = SpendingIndex.from_transactions(records)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    tools = SpendingTools(loader=None)
+    queries = {
+        "fast_food_this_month": ("get_spending_total", {"name": "fast food", "period": "this_month"}),
+        "delights_last_30_days": ("get_spending_total", {"name": "Delights", "period": "last_30_days"}),
+        "merchant_this_year": ("get_spending_total", {"name": "taco bell", "period": "this_year"}),
+        "top_merchants_last_month": ("get_top_merchants", {"period": "last_month"}),
+        "category_breakdown_this_month": ("get_category_breakdown", {"period": "this_month"}),
+        "monthly_trend_groceries": ("get_monthly_trend", {"name": "Groceries", "months": 6}),
+    }
+    results = {
+        name: {
+            "median_us": time_us(lambda: tools.answer(index, fn, params), args.repeat),
+            "answer": tools.answer(index, fn, params),
+        }
+        for name, (fn, params) in queries.items()
+    }
+
+    start_day, end_day, _ = index.period_bounds("this_month", today)
+    naive_ms = time_us(lambda: naive_total(records, "Fast Food", start_day * DAY_MS, end_day * DAY_MS), 3) / 1000
+
+    print(json.dumps({
+        "transactions": args.transactions,
+        "indexed": len(index),
+        "build_ms": round(build_ms, 1),
+        "naive_fast_food_this_month_ms": round(naive_ms, 1),
+        "queries": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
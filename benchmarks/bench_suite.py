@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Run the offline benchmark suite, write its results as JSON and compare them with a baseline.
+
+  manager_api          benchmarks/bench_manager_api.py: start, list, health and stop
+                       latency under concurrent clients
+  assistant_processor  benchmarks/bench_assistant_processor.py: FinancialAssistantProcessor
+                       frames/s, prompt latency and held memory over a long conversation
+  ws_transport         benchmarks/bench_ws_transport.py: session setup time and per-frame
+                       cost of the WebSocket transport and the Daily path
+  event_sink           benchmarks/bench_event_sink.py: per-frame time of the session event
+                       sink and of per-turn logging, and emit under a burst
+
+Each benchmark runs --repeats times and every figure is the median of those runs.
+Results go to --out as {"meta": ..., "results": {bench: {...}}}. With a baseline file
+(written by --save-baseline on the same machine), every latency, rate, error count and
+memory figure is compared with it. A figure is a regression when it is worse by more
+than --tolerance (relative) and by more than its noise floor. The script then exits with
+status 1, so CI can run it as a gate.
+
+    python benchmarks/bench_suite.py --save-baseline            # on main
+    python benchmarks/bench_suite.py                            # on a branch, same machine
+    python benchmarks/bench_suite.py --only assistant_processor --quick
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCHMARKS)
+
+import bench_assistant_processor
+import bench_event_sink
+import bench_manager_api
+import bench_ws_transport
+
+# name -> (full run, --quick run)
+SUITE = {
+    "manager_api": (
+        lambda: bench_manager_api.run(sessions=20, concurrency=8, requests=400),
+        lambda: bench_manager_api.run(sessions=6, concurrency=4, requests=100),
+    ),
+    "assistant_processor": (
+        lambda: bench_assistant_processor.run(turns=2000),
+        lambda: bench_assistant_processor.run(turns=300, warmup=50),
+    ),
+    "ws_transport": (
+        lambda: bench_ws_transport.run(sessions=20, frames=2000),
+        lambda: bench_ws_transport.run(sessions=5, frames=300),
+    ),
+    "event_sink": (
+        lambda: bench_event_sink.run(turns=2000),
+        lambda: bench_event_sink.run(turns=300, burst_events=20_000),
+    ),
+}
+
+# Metric name suffix -> (which way is better, changes smaller than this are noise)
+DIRECTIONS: List[Tuple[str, str, float]] = [
+    ("per_s", "higher", 0.0),
+    ("errors", "lower", 0.0),
+    ("us_per_frame", "lower", 5.0),
+    ("_ms", "lower", 1.0),
+    ("_kb", "lower", 64.0),
+]
+
+
+def flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def median_of(runs: List[Dict]) -> Dict:
+    """One result with the median of every figure over repeated runs"""
+    merged = {}
+    for key, value in runs[0].items():
+        if isinstance(value, dict):
+            merged[key] = median_of([run[key] for run in runs])
+        elif isinstance(value, (int, float)):
+            merged[key] = statistics.median(run[key] for run in runs)
+        else:
+            merged[key] = value
+    return merged
+
+
+def direction(name: str) -> Optional[Tuple[str, float]]:
+    """(better, noise floor) for metrics worth comparing; counts and sizes of the run are not"""
+    for suffix, better, floor in DIRECTIONS:
+        if name.endswith(suffix):
+            return better, floor
+    return None
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float) -> List[Tuple[str, float, float, float, bool]]:
+    """(metric, baseline, current, relative change, regressed) for metrics in both runs"""
+    rows = []
+    before, after = flatten(baseline["results"]), flatten(current["results"])
+    for name in sorted(before.keys() & after.keys()):
+        rule = direction(name)
+        if rule is None:
+            continue
+        better, floor = rule
+        old, new = before[name], after[name]
+        worse = (old - new) if better == "higher" else (new - old)
+        change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+        regressed = worse > floor and (old == 0 or worse / abs(old) > tolerance)
+        rows.append((name, old, new, change, regressed))
+    return rows
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_suite(names: List[str], quick: bool, repeats: int) -> Dict:
+    results = {}
+    for name in names:
+        started = time.perf_counter()
+        print(f"running {name} x{repeats}...", flush=True)
+        results[name] = median_of([await SUITE[name][1 if quick else 0]() for _ in range(repeats)])
+        print(f"  done in {time.perf_counter() - started:.1f}s", flush=True)
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": quick,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", action="append", choices=list(SUITE), help="Run just this benchmark (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="Smaller runs, for a smoke test")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per benchmark; each figure is their median")
+    parser.add_argument("--out", default=os.path.join(BENCHMARKS, "results", "latest.json"))
+    parser.add_argument("--baseline", default=os.path.join(BENCHMARKS, "results", "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Relative slowdown counted as a regression")
+    args = parser.parse_args()
+    logger.remove()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    current = asyncio.run(run_suite(args.only or list(SUITE), args.quick, args.repeats))
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nresults written to {args.out}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline to store one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("quick") != current["meta"]["quick"]:
+        print("warning: baseline and this run differ in --quick, sizes are not comparable")
+    rows = compare(baseline, current, args.tolerance)
+    print(f"\ncompared with {args.baseline} ({baseline['meta'].get('revision')}, {baseline['meta'].get('timestamp')})")
+    print(f"{'metric':<46} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, old, new, change, regressed in rows:
+        print(f"{name:<46} {old:>10g} {new:>10g} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+    regressions = sum(row[4] for row in rows)
+    print(f"\n{regressions} regression(s) beyond {args.tolerance:.0%}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""TTS phrase cache: per-tier lookup latency and hit rate on a repetitive reply workload.
+
+Replays `--replies` reply openings drawn from a skewed phrase distribution (a few stock
+lines such as greetings and "connect your account" dominate) through PhraseAudioCache with
+a fake synthesizer. A second cache instance on the same directory stands in for another bot
+process on the host and shows disk-tier sharing.
+
+    python benchmarks/bench_tts_cache.py --replies 2000 --synth-ms 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipecat_tts_cache import PhraseAudioCache, phrase_key
+
+STOCK_PHRASES = [
+    "Hi, I'm Finley, your financial assistant.",
+    "I'll need you to connect your account before I can look at that.",
+    "Sorry, I didn't catch that.",
+    "Could you say that again?",
+    "Happy to help with that.",
+    "Let me take a look.",
+]
+VOICE = ("a0e99841-438c-4a64-b679-ae501e7d6091", "sonic-multilingual", 24000)
+
+
+def silence(text: str, sample_rate: int = 24000) -> bytes:
+    return b"\x00\x00" * (sample_rate * 60 // 1000) * len(text)
+
+
+def workload(replies: int, seed: int = 3):
+    rng = random.Random(seed)
+    for i in range(replies):
+        if rng.random() < 0.6:
+            # Zipf-like skew over the stock lines
+            yield STOCK_PHRASES[min(len(STOCK_PHRASES) - 1, int(rng.paretovariate(1.2)) - 1)]
+        else:
+            yield f"You spent ${rng.randint(1, 900)}.{rng.randint(0, 99):02d} on that this month."
+
+
+async def run(replies: int, synth_ms: float) -> dict:
+    calls = {"synth": 0}
+
+    async def synthesize(text: str) -> bytes:
+        calls["synth"] += 1
+        await asyncio.sleep(synth_ms / 1000)
+        return silence(text)
+
+    with tempfile.TemporaryDirectory() as disk_dir:
+        bot_a = PhraseAudioCache(disk_dir=disk_dir, memory_bytes=8 * 1024 * 1024)
+        timings = {"memory_hit": [], "disk_hit": [], "miss": []}
+        spoken_ms = []
+
+        for phrase in workload(replies):
+            key = phrase_key(phrase, *VOICE)
+            started = time.perf_counter()
+            audio, outcome = bot_a.lookup(key)
+            timings[outcome].append((time.perf_counter() - started) * 1e6)
+            if audio is None:
+                # The live TTS round trip the caller waits for on a miss
+                await asyncio.sleep(synth_ms / 1000)
+                if bot_a.should_fill(key):
+                    bot_a.schedule_fill(key, phrase, synthesize)
+            spoken_ms.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0)
+        await asyncio.gather(*bot_a._fill_tasks)
+
+        # Another bot process on the host: cold memory tier, warm shared disk tier
+        bot_b = PhraseAudioCache(disk_dir=disk_dir, memory_bytes=8 * 1024 * 1024)
+        for phrase in STOCK_PHRASES:
+            key = phrase_key(phrase, *VOICE)
+            started = time.perf_counter()
+            _, outcome = bot_b.lookup(key)
+            timings[outcome].append((time.perf_counter() - started) * 1e6)
+
+        return {
+            "replies": replies,
+            "lookup_us": {
+                outcome: round(statistics.median(samples), 1) if samples else None
+                for outcome, samples in timings.items()
+            },
+            "avg_time_to_audio_ms": round(statistics.mean(spoken_ms), 1),
+            "uncached_time_to_audio_ms": synth_ms,
+            "fill_synth_calls": calls["synth"],
+            "bot_a": bot_a.stats(),
+            "bot_b": bot_b.stats(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replies", type=int, default=2000)
+    parser.add_argument("--synth-ms", type=float, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.replies, args.synth_ms)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Time to first audio for each TTS flush policy, with a fake token-streaming LLM.
+
+A fake LLM streams sample replies token by token (`--ttft` then one token every
+`--token-ms`). ClauseChunker decides when text is handed to a fake TTS, which starts
+audio `--tts-ms` after it receives a chunk. Chunk counts and sizes are reported as a proxy
+for prosody: fewer, longer chunks sound more natural.
+
+    python benchmarks/bench_tts_flush.py --token-ms 35 --tts-ms 150
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipecat_clause_aggregator import FLUSH_POLICIES, ClauseChunker, parse_flush_policy
+
+REPLIES = [
+    "You spent $412.38 on fast food this month, which is about 20% more than last month. "
+    "Most of it was at Taco Bell and Chipotle.",
+    "Your Delights spending is on track, but groceries are running a little high. "
+    "Want me to suggest a weekly grocery budget?",
+    "Sure, I can help with that. Connect your bank account and I'll break down your spending by category.",
+    "That's a great question. Building an emergency fund of three to six months of expenses "
+    "gives you a cushion, and you can start small.",
+]
+
+
+async def fake_llm(reply: str, ttft: float, token_interval: float):
+    """Yield the reply in word-sized tokens, the way streamed completions arrive"""
+    await asyncio.sleep(ttft)
+    for token in re.findall(r"\s*\S+", reply):
+        yield token
+        await asyncio.sleep(token_interval)
+
+
+async def run_reply(policy, reply: str, ttft: float, token_interval: float, tts_latency: float) -> dict:
+    chunker = ClauseChunker(policy)
+    started = time.perf_counter()
+    first_chunk_at = None
+    chunks = []
+
+    async for token in fake_llm(reply, ttft, token_interval):
+        for chunk in chunker.feed(token):
+            first_chunk_at = first_chunk_at or time.perf_counter()
+            chunks.append(chunk)
+    remainder = chunker.flush()
+    if remainder:
+        first_chunk_at = first_chunk_at or time.perf_counter()
+        chunks.append(remainder)
+
+    words = [len(c.split()) for c in chunks]
+    return {
+        "ttfa_ms": (first_chunk_at - started + tts_latency) * 1000,
+        "chunks": len(chunks),
+        "first_chunk_words": words[0],
+        "min_chunk_words": min(words),
+        "avg_chunk_words": statistics.mean(words),
+    }
+
+
+async def run(policies, ttft: float, token_interval: float, tts_latency: float) -> dict:
+    results = {}
+    for name in policies:
+        policy = parse_flush_policy(name)
+        runs = [await run_reply(policy, reply, ttft, token_interval, tts_latency) for reply in REPLIES]
+        results[name] = {
+            "ttfa_ms_mean": round(statistics.mean(r["ttfa_ms"] for r in runs), 1),
+            "ttfa_ms_max": round(max(r["ttfa_ms"] for r in runs), 1),
+            "chunks_per_reply": round(statistics.mean(r["chunks"] for r in runs), 2),
+            "first_chunk_words": round(statistics.mean(r["first_chunk_words"] for r in runs), 1),
+            "avg_chunk_words": round(statistics.mean(r["avg_chunk_words"] for r in runs), 1),
+            "min_chunk_words": min(r["min_chunk_words"] for r in runs),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--policies", nargs="+", default=list(FLUSH_POLICIES))
+    parser.add_argument("--ttft", type=float, default=0.3, help="Fake LLM time to first token (s)")
+    parser.add_argument("--token-ms", type=float, default=35, help="Fake LLM time between tokens")
+    parser.add_argument("--tts-ms", type=float, default=150, help="Fake TTS time from chunk to first audio")
+    args = parser.parse_args()
+    results = asyncio.run(run(args.policies, args.ttft, args.token_ms / 1000, args.tts_ms / 1000))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Session setup time and per-frame overhead of the WebSocket transport against the Daily path.
+
+Setup runs `pipecat_server_manager.py` with its embedded node and stand-in bots
+(benchmarks/fake_bot.py) and starts --sessions sessions one after another each way:
+  daily      /api/v1/bots/start: room and two tokens from the Daily stub, each call
+             --daily-latency-ms away, then the handoff to a warm worker. The client's
+             WebRTC join comes on top and needs Daily, so it is not in this figure.
+  websocket  /api/v1/bots/start?transport=websocket, connecting to the returned ws_url
+             and waiting for the bot's "ready" event: audio can flow at that point.
+
+Per-frame overhead runs RelayTransport from pipecat_ws_transport.py in a pipeline in
+this process, with no VAD, and sends --frames 20ms frames one at a time:
+  direct     push_audio_frame on the input transport; where DailyInputTransport hands
+             over the audio daily-python has received and decoded, so the least any
+             transport costs (Daily's Opus decoding and thread handoff add to it)
+  websocket  client WebSocket -> uvicorn -> relay_websocket -> unix socket ->
+             RelayTransport, with the client in this process too
+The latency of each frame to the first stage after the transport, and CPU per frame,
+are reported for both.
+
+    python benchmarks/bench_ws_transport.py --sessions 20 --frames 2000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import aiohttp
+import uvicorn
+from fastapi import FastAPI, WebSocket
+from loguru import logger
+from pipecat.frames.frames import EndFrame, Frame, InputAudioRawFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_manager_api import pool_ready, start_manager
+from daily_stub import start_daily_stub
+from pipecat_ws_relay import MSG_AUDIO, MSG_EVENT, relay_room_url, relay_socket_path, relay_websocket
+from pipecat_ws_transport import RelayTransport
+from sim_multinode import free_port, wait_for
+
+logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+
+AUDIO = b"\x00\x00" * 320  # 20ms at 16kHz
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def quantiles(values_ms: List[float]) -> Dict:
+    return {
+        "p50_ms": round(percentile(values_ms, 0.5), 3),
+        "p95_ms": round(percentile(values_ms, 0.95), 3),
+        "p99_ms": round(percentile(values_ms, 0.99), 3),
+    }
+
+
+async def setup_times(sessions: int, daily_latency_ms: float) -> Dict:
+    stub_runner, daily_url = await start_daily_stub(latency_ms=daily_latency_ms, handshake_ms=0)
+    os.environ["PIPECAT_WS_SOCKET_DIR"] = tempfile.mkdtemp(prefix="finley-ws-")  # Inherited by the bots
+    port = free_port()
+    manager = start_manager(port, daily_url, argparse.Namespace(sessions=sessions))
+    base = f"http://127.0.0.1:{port}"
+    timings: Dict[str, List[float]] = {"daily": [], "websocket": []}
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_for(session, f"{base}/api/health")
+            for transport in ("daily", "websocket"):
+                await pool_ready(session, base, timeout=30 + sessions)
+                for _ in range(sessions):
+                    started = time.perf_counter()
+                    async with session.post(f"{base}/api/v1/bots/start", params={"transport": transport}) as response:
+                        response.raise_for_status()
+                        data = await response.json()
+                    if transport == "websocket":
+                        async with session.ws_connect(data["ws_url"]) as websocket:
+                            message = await websocket.receive_bytes()
+                            assert message[0] == MSG_EVENT and json.loads(message[1:])["type"] == "ready"
+                            timings[transport].append((time.perf_counter() - started) * 1000)
+                    else:
+                        timings[transport].append((time.perf_counter() - started) * 1000)
+                    async with session.post(f"{base}/api/v1/bots/stop", params={"bot_id": data["bot_id"]}):
+                        pass
+    finally:
+        if manager.poll() is None:
+            os.killpg(manager.pid, signal.SIGTERM)
+        manager.wait()
+        await stub_runner.cleanup()
+    return {transport: quantiles(values) for transport, values in timings.items()}
+
+
+class ArrivalTimer(FrameProcessor):
+    """The first stage after the transport: times each audio frame since it was sent"""
+
+    def __init__(self):
+        super().__init__()
+        self.arrived = asyncio.Event()
+        self.sent = 0.0
+        self.latency_ms: List[float] = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, InputAudioRawFrame):
+            self.latency_ms.append((time.perf_counter() - self.sent) * 1000)
+            self.arrived.set()
+        else:
+            await self.push_frame(frame, direction)
+
+
+async def frame_overhead(frames: int, via_websocket: bool) -> Dict:
+    room_url = relay_room_url()
+    path = relay_socket_path(room_url)
+    transport = RelayTransport(path, None)
+    timer = ArrivalTimer()
+    task = PipelineTask(
+        Pipeline([transport.input(), timer, transport.output()]),
+        params=PipelineParams(audio_in_sample_rate=16000),
+        idle_timeout_secs=None,
+    )
+
+    app = FastAPI()
+
+    @app.websocket("/audio")
+    async def audio(websocket: WebSocket):
+        await websocket.accept()
+        await relay_websocket(websocket, path)
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+
+    async def feed():
+        while not os.path.exists(path):  # The transport listens once the pipeline has started
+            await asyncio.sleep(0.01)
+        message = bytes([MSG_AUDIO]) + AUDIO
+        async with aiohttp.ClientSession() as session:
+            websocket = await session.ws_connect(f"ws://127.0.0.1:{port}/audio") if via_websocket else None
+            if websocket:
+                await websocket.receive_bytes()  # ready
+            cpu, wall = time.process_time(), time.perf_counter()
+            for _ in range(frames):
+                timer.arrived.clear()
+                timer.sent = time.perf_counter()
+                if websocket:
+                    await websocket.send_bytes(message)
+                else:
+                    await transport.input().push_audio_frame(InputAudioRawFrame(AUDIO, 16000, 1))
+                await timer.arrived.wait()
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+            if websocket:
+                await websocket.close()
+        await task.queue_frame(EndFrame())
+        return {
+            **quantiles(timer.latency_ms),
+            "cpu_us_per_frame": round(cpu / frames * 1e6, 1),
+            "frames_per_s": round(frames / wall),
+        }
+
+    serving = asyncio.create_task(server.serve())
+    try:
+        _, result = await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), feed())
+    finally:
+        server.should_exit = True
+        await serving
+    return result
+
+
+async def run(sessions: int = 20, frames: int = 2000, daily_latency_ms: float = 40) -> Dict:
+    return {
+        "setup": await setup_times(sessions, daily_latency_ms),
+        "frame": {
+            "direct": await frame_overhead(frames, via_websocket=False),
+            "websocket": await frame_overhead(frames, via_websocket=True),
+            # Client to server: type byte, 4-byte WebSocket header (payload over 125 bytes), 4-byte mask
+            "websocket_wire_bytes": len(AUDIO) + 1 + 4 + 4,
+            "pcm_bytes": len(AUDIO),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="Sessions started each way")
+    parser.add_argument("--frames", type=int, default=2000, help="20ms frames sent each way")
+    parser.add_argument("--daily-latency-ms", type=float, default=40, help="Round trip to the Daily API")
+    args = parser.parse_args()
+    logger.remove()
+    logging.getLogger().setLevel(logging.WARNING)
+    print(json.dumps(asyncio.run(run(args.sessions, args.frames, args.daily_latency_ms)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Daily REST API (rooms and meeting tokens).
+
+Each request waits `latency_ms`; the first request on a new connection also waits
+`handshake_ms` to model the TCP+TLS setup that a fresh client session pays.
+
+    python benchmarks/daily_stub.py --port 8711 --latency-ms 40 --handshake-ms 120
+    DAILY_API_URL=http://127.0.0.1:8711/v1 DAILY_API_KEY=stub python pipecat_server_manager.py
+"""
+
+import argparse
+import asyncio
+import itertools
+import uuid
+import weakref
+
+from aiohttp import web
+
+
+def create_daily_stub_app(latency_ms: float = 40, handshake_ms: float = 120) -> web.Application:
+    app = web.Application()
+    seen_transports = weakref.WeakSet()
+    room_numbers = itertools.count(1)
+    app["stats"] = {"rooms": 0, "tokens": 0, "connections": 0}
+
+    async def simulate_network(request: web.Request):
+        delay = latency_ms
+        if request.transport not in seen_transports:
+            seen_transports.add(request.transport)
+            app["stats"]["connections"] += 1
+            delay += handshake_ms
+        await asyncio.sleep(delay / 1000)
+
+    async def create_room(request: web.Request):
+        await simulate_network(request)
+        body = await request.json()
+        name = body.get("name") or f"stub-room-{next(room_numbers)}"
+        app["stats"]["rooms"] += 1
+        return web.json_response({
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "url": f"https://stub.daily.co/{name}",
+            "config": body.get("properties", {}),
+        })
+
+    async def create_token(request: web.Request):
+        await simulate_network(request)
+        body = await request.json()
+        app["stats"]["tokens"] += 1
+        room_name = body.get("properties", {}).get("room_name", "")
+        return web.json_response({"token": f"stub-token-{room_name}-{uuid.uuid4().hex[:8]}"})
+
+    app.router.add_post("/v1/rooms", create_room)
+    app.router.add_post("/v1/meeting-tokens", create_token)
+    return app
+
+
+async def start_daily_stub(port: int = 0, **kwargs):
+    """Start the stub in the running loop; returns (runner, base_url)"""
+    runner = web.AppRunner(create_daily_stub_app(**kwargs), shutdown_timeout=1)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{bound_port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8711)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--handshake-ms", type=float, default=120)
+    args = parser.parse_args()
+    web.run_app(
+        create_daily_stub_app(args.latency_ms, args.handshake_ms),
+        host="127.0.0.1",
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
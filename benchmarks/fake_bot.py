@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Stand-in for pipecat_server.py that speaks the worker and host protocols without Pipecat.
+
+Sessions never join a room; they idle until stopped. WebSocket sessions (relay: room
+URLs) listen on their relay socket, announce themselves and echo client audio back.
+Point a node at it with
+
+    PIPECAT_BOT_SCRIPT=benchmarks/fake_bot.py python pipecat_bot_node.py --port 7871
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pipecat_bot_host import BotHost
+from pipecat_worker_pool import BotJob, announce_worker_ready, read_worker_job
+from pipecat_ws_relay import BOT_HEADER, MSG_EVENT, is_relay_room, relay_socket_path
+
+
+async def echo(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    ready = json.dumps({"type": "ready", "sample_rate_in": 16000, "sample_rate_out": 16000}).encode()
+    writer.write(BOT_HEADER.pack(len(ready) + 1, MSG_EVENT) + ready)
+    try:
+        while True:
+            header = await reader.readexactly(BOT_HEADER.size)
+            size, _ = BOT_HEADER.unpack(header)
+            writer.write(header + await reader.readexactly(size - 1))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        writer.close()
+
+
+async def run_session(job: BotJob):
+    try:
+        print(f"fake bot in {job.room_url}", flush=True)
+    except BrokenPipeError:
+        pass  # The node that started it is gone; keep running to be adopted, like a real bot
+    if is_relay_room(job.room_url):
+        path = relay_socket_path(job.room_url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        await asyncio.start_unix_server(echo, path)
+    await asyncio.Event().wait()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--worker", action="store_true")
+    parser.add_argument("--host", action="store_true")
+    args = parser.parse_args()
+
+    if args.host:
+        await BotHost(run_session).run()
+        return
+
+    announce_worker_ready()
+    await run_session(await read_worker_job())
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Scripted stand-ins for STT, LLM and TTS services, for running pipelines offline.
+
+ScriptedSTT replays interim/final transcripts on a timeline, TurnSTT transcribes each
+VAD turn as a fixed question, FakeLLM answers any messages or context frame after a fixed
+time to first token, FakeTTS turns sentences into silence (or a tone) after a fixed
+latency or fails on request, FrameRecorder timestamps what reaches the end of the
+pipeline, and EnergyVAD scores synthetic speech by loudness.
+"""
+
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+from pipecat.frames.frames import (
+    EndFrame,
+    ErrorFrame,
+    Frame,
+    InterimTranscriptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMMessagesFrame,
+    StartFrame,
+    StartInterruptionFrame,
+    TextFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContextFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+# (seconds after start, kind, text) with kind one of interim, final, stopped, started
+Script = List[Tuple[float, str, str]]
+
+
+class ScriptedSTT(FrameProcessor):
+    """Pushes transcript frames at scripted times once the pipeline starts"""
+
+    def __init__(self, script: Script):
+        super().__init__()
+        self.script = script
+        self.final_at: List[float] = []
+        self.done = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+        if isinstance(frame, StartFrame):
+            self._task = self.create_task(self._play())
+        elif isinstance(frame, EndFrame) and self._task:
+            await self.cancel_task(self._task)
+
+    async def _play(self):
+        started = time.perf_counter()
+        for at, kind, text in self.script:
+            await asyncio.sleep(max(0.0, started + at - time.perf_counter()))
+            if kind == "interim":
+                await self.push_frame(InterimTranscriptionFrame(text, "user", ""))
+            elif kind == "final":
+                self.final_at.append(time.perf_counter())
+                await self.push_frame(TranscriptionFrame(text, "user", ""))
+            elif kind == "stopped":
+                await self.push_frame(UserStoppedSpeakingFrame())
+            elif kind == "started":
+                await self.push_frame(StartInterruptionFrame())
+        self.done.set()
+
+
+class TurnSTT(FrameProcessor):
+    """Transcribes every user turn as `text`, `latency` seconds after VAD reports its end"""
+
+    def __init__(self, text: str = "How much did I spend on dining this month?", latency: float = 0.15):
+        super().__init__()
+        self.text = text
+        self.latency = latency
+        self.transcribed = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+        if isinstance(frame, UserStoppedSpeakingFrame):
+            # Off the transport's audio task, like a streaming STT's receive loop
+            self.create_task(self._transcribe())
+
+    async def _transcribe(self):
+        await asyncio.sleep(self.latency)
+        self.transcribed += 1
+        await self.push_frame(TranscriptionFrame(self.text, "user", ""))
+
+
+class FakeLLM(FrameProcessor):
+    """Streams a canned answer to the last user message after `ttft` seconds"""
+
+    def __init__(self, ttft: float = 0.4, token_interval: float = 0.02):
+        super().__init__()
+        self.ttft = ttft
+        self.token_interval = token_interval
+        self.calls = 0
+        self.completed = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, LLMMessagesFrame):
+            await self._respond(frame.messages)
+        elif isinstance(frame, OpenAILLMContextFrame):
+            await self._respond(frame.context.messages)
+        else:
+            await self.push_frame(frame, direction)
+
+    async def _respond(self, messages):
+        self.calls += 1
+        question = messages[-1]["content"] if messages else ""
+        await self.push_frame(LLMFullResponseStartFrame())
+        await asyncio.sleep(self.ttft)
+        for word in f"Answer to: {question}".split():
+            await self.push_frame(TextFrame(word + " "))
+            await asyncio.sleep(self.token_interval)
+        await self.push_frame(LLMFullResponseEndFrame())
+        self.completed += 1
+
+
+def silence(text: str, sample_rate: int = 24000) -> bytes:
+    """Stand-in audio: 60ms of 16-bit silence per character"""
+    return b"\x00\x00" * (sample_rate * 60 // 1000) * len(text)
+
+
+def tone(text: str, sample_rate: int = 24000) -> bytes:
+    """Stand-in audio that survives silence trimming: 60ms of a 220Hz tone per character"""
+    t = np.arange(sample_rate * 60 // 1000 * len(text)) / sample_rate
+    return (3000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16).tobytes()
+
+
+def fake_synthesizer(latency: float = 0.2, sample_rate: int = 24000):
+    """Synthesizer (text -> PCM) with a fixed round trip, counting its calls"""
+
+    async def synthesize(text: str) -> bytes:
+        synthesize.calls += 1
+        await asyncio.sleep(latency)
+        return silence(text, sample_rate)
+
+    synthesize.calls = 0
+    return synthesize
+
+
+class FakeTTS(FrameProcessor):
+    """Speaks each sentence as silence after `latency` seconds, counting sentences sent to it
+
+    While `failing` is set it reports an ErrorFrame upstream instead of speaking. `audio`
+    makes the PCM for a sentence, e.g. `tone` where silence would be trimmed away.
+    """
+
+    def __init__(self, latency: float = 0.2, sample_rate: int = 24000, failing: bool = False, audio=silence):
+        super().__init__()
+        self.latency = latency
+        self.sample_rate = sample_rate
+        self.failing = failing
+        self.audio = audio
+        self.sentences: List[str] = []
+        self._text = ""
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, TextFrame) and not isinstance(frame, (TranscriptionFrame, InterimTranscriptionFrame)):
+            self._text += frame.text
+            if self._text.rstrip().endswith((".", "!", "?")):
+                await self._speak()
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            await self._speak()
+            await self.push_frame(frame, direction)
+        else:
+            await self.push_frame(frame, direction)
+
+    async def _speak(self):
+        text, self._text = self._text.strip(), ""
+        if not text:
+            return
+        self.sentences.append(text)
+        await asyncio.sleep(self.latency)
+        if self.failing:
+            await self.push_error(ErrorFrame("injected TTS failure"))
+            return
+        await self.push_frame(TTSStartedFrame())
+        await self.push_frame(TTSAudioRawFrame(self.audio(text, self.sample_rate), self.sample_rate, 1))
+        await self.push_frame(TTSStoppedFrame())
+
+
+class FrameRecorder(FrameProcessor):
+    """Records when LLM text reaches the end of the pipeline"""
+
+    def __init__(self):
+        super().__init__()
+        self.text_at: List[Tuple[float, str]] = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if type(frame) is TextFrame:
+            self.text_at.append((time.perf_counter(), frame.text))
+        await self.push_frame(frame, direction)
+
+
+class EnergyVAD(VADAnalyzer):
+    """Voice confidence from RMS level, so synthetic tones count as speech (Silero's don't)"""
+
+    def __init__(self, sample_rate: int = 16000, params: Optional[VADParams] = None, speech_rms: float = 1000.0):
+        super().__init__(sample_rate=sample_rate, params=params)
+        self.speech_rms = speech_rms
+
+    def num_frames_required(self) -> int:
+        return 512 if self.sample_rate == 16000 else 256
+
+    def voice_confidence(self, buffer) -> float:
+        samples = np.frombuffer(buffer, dtype=np.int16).astype(np.float32)
+        return min(1.0, float(np.sqrt(np.mean(samples * samples))) / self.speech_rms)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Local stand-in for an OpenAI-compatible streaming chat completions endpoint.
+
+Every request waits `ttft_ms` before its first chunk and `token_ms` between chunks.
+A `fail_rate` share of requests get a 500, and `stall` requests never send a token.
+All of them can be changed while it runs with POST /control, e.g.
+{"ttft_ms": 2000, "fail_rate": 0.5}.
+
+    python benchmarks/llm_stub.py --port 8712 --ttft-ms 300
+    OPENAI_BASE_URL=http://127.0.0.1:8712/v1 python pipecat_server.py -u ... -t ...
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from aiohttp import web
+
+REPLY = "Your dining spend is up twelve percent this month, mostly from weekend delivery orders."
+
+
+def create_llm_stub_app(
+    ttft_ms: float = 300,
+    token_ms: float = 20,
+    fail_rate: float = 0.0,
+    stall: bool = False,
+    seed: int = 0,
+) -> web.Application:
+    app = web.Application()
+    app["settings"] = {"ttft_ms": ttft_ms, "token_ms": token_ms, "fail_rate": fail_rate, "stall": stall}
+    app["stats"] = {"requests": 0, "failed": 0, "completed": 0, "cancelled": 0}
+    rng = random.Random(seed)
+
+    def chunk(completion_id: str, model: str, delta: dict, finish_reason=None, usage=None) -> bytes:
+        body = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        if usage:
+            body["usage"] = usage
+        return f"data: {json.dumps(body)}\n\n".encode()
+
+    async def chat_completions(request: web.Request):
+        settings = app["settings"]
+        stats = app["stats"]
+        stats["requests"] += 1
+        body = await request.json()
+        model = body.get("model", "stub")
+        if rng.random() < settings["fail_rate"]:
+            stats["failed"] += 1
+            return web.json_response(
+                {"error": {"message": "injected failure", "type": "server_error"}}, status=500
+            )
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        try:
+            if settings["stall"]:
+                await asyncio.Event().wait()
+            await asyncio.sleep(settings["ttft_ms"] / 1000)
+            await response.write(chunk(completion_id, model, {"role": "assistant", "content": ""}))
+            words = REPLY.split()
+            for i, word in enumerate(words):
+                await response.write(chunk(completion_id, model, {"content": word + (" " if i < len(words) - 1 else "")}))
+                await asyncio.sleep(settings["token_ms"] / 1000)
+            await response.write(chunk(completion_id, model, {}, finish_reason="stop"))
+            if body.get("stream_options", {}).get("include_usage"):
+                usage = {"prompt_tokens": 50, "completion_tokens": len(words), "total_tokens": 50 + len(words)}
+                await response.write(chunk(completion_id, model, {}, usage=usage))
+            await response.write(b"data: [DONE]\n\n")
+            stats["completed"] += 1
+        except asyncio.CancelledError:
+            # The client closed the stream, e.g. a hedged request that lost
+            stats["cancelled"] += 1
+            raise
+        except ConnectionResetError:
+            stats["cancelled"] += 1
+        return response
+
+    async def control(request: web.Request):
+        app["settings"].update(await request.json())
+        return web.json_response(app["settings"])
+
+    async def stats(request: web.Request):
+        return web.json_response(app["stats"])
+
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_post("/control", control)
+    app.router.add_get("/stats", stats)
+    return app
+
+
+async def start_llm_stub(port: int = 0, **kwargs):
+    """Start the stub in the running loop; returns (runner, base_url)"""
+    runner = web.AppRunner(create_llm_stub_app(**kwargs), shutdown_timeout=1)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{bound_port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8712)
+    parser.add_argument("--ttft-ms", type=float, default=300)
+    parser.add_argument("--token-ms", type=float, default=20)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--stall", action="store_true")
+    args = parser.parse_args()
+    web.run_app(
+        create_llm_stub_app(args.ttft_ms, args.token_ms, args.fail_rate, args.stall),
+        host="127.0.0.1",
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
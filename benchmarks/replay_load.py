@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Concurrent bot sessions replaying recorded audio, to find sessions per core before frames run late.
+
+Every session is the real pipeline from build_financial_assistant_task, with its
+providers swapped for local ones registered as "replay": the transport pushes a
+recording's audio frames (memory-mapped, see pipecat_session_recording.py) on their
+recorded schedule or --speed times faster, EnergyVAD or Silero (--vad silero) runs on
+them as it does live, and STT/LLM/TTS are fakes answering every turn after --stt-ms,
+--llm-ttft-ms and --tts-ms. Recordings come from a bot run with --record-sessions; without any, one
+synthetic conversation (benchmarks/sim_endpointing.py's average speaker) is recorded
+and replayed.
+
+For each count in --sessions that many sessions run in this one process, so on one
+core, starting 50ms apart and replaying --seconds of audio each. A frame is late by
+the time from its scheduled arrival to leaving the input transport, VAD included. The
+last count whose p99 lateness stays under --late-ms is what one core sustains; the
+ramp stops at the first count past it.
+
+    python pipecat_server.py -u ROOM -t TOKEN --record-sessions recordings/
+    python benchmarks/replay_load.py recordings/*.fses --vad silero --sessions 1,4,8,16
+    python benchmarks/replay_load.py --sessions 1,8,16,32,64 --seconds 20
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from loguru import logger
+from pipecat.frames.frames import EndFrame, Frame, InputAudioRawFrame, OutputAudioRawFrame, StartFrame
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.transports.base_input import BaseInputTransport
+from pipecat.transports.base_transport import BaseTransport, TransportParams
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pipecat_server
+from pipecat_metrics import TurnLatencyMetrics
+from pipecat_providers import KINDS, register_provider
+from pipecat_session_recording import SessionRecorder, SessionRecording
+from sim_endpointing import FRAME_MS, SAMPLE_RATE, SPEAKERS, synthesize
+
+STAGGER_SECS = 0.05
+
+
+class Replay:
+    """One session's recording, schedule and what its input transport measured"""
+
+    def __init__(self, recording: SessionRecording, seconds: float, speed: float, delay: float):
+        self.recording = recording
+        self.seconds = seconds
+        self.speed = speed
+        self.delay = delay
+        self.lateness: List[float] = []
+        self.done = asyncio.Event()
+
+
+# room URL -> replay, for the transport factory
+REPLAYS: Dict[str, Replay] = {}
+
+
+class ReplayInput(BaseInputTransport):
+    """Pushes a recording's frames at their recorded times, timing each one through VAD"""
+
+    def __init__(self, replay: Replay, params: TransportParams):
+        super().__init__(params)
+        self.replay = replay
+        self._due: Deque[float] = deque()
+        self._feeder: Optional[asyncio.Task] = None
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        await self.set_transport_ready(frame)
+        self._feeder = self.create_task(self._feed())
+
+    async def stop(self, frame: EndFrame):
+        await self._stop_feeder()
+        await super().stop(frame)
+
+    async def cancel(self, frame):
+        await self._stop_feeder()
+        await super().cancel(frame)
+
+    async def _stop_feeder(self):
+        if self._feeder:
+            await self.cancel_task(self._feeder)
+            self._feeder = None
+
+    async def _feed(self):
+        await asyncio.sleep(self.replay.delay)
+        started = time.perf_counter()
+        for recorded in self.replay.recording:
+            if recorded.at > self.replay.seconds:
+                break
+            due = started + recorded.at / self.replay.speed
+            wait = due - time.perf_counter()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._due.append(due)
+            await self.push_audio_frame(
+                InputAudioRawFrame(bytes(recorded.audio), recorded.sample_rate, recorded.num_channels)
+            )
+        self.replay.done.set()
+
+    async def push_frame(self, frame: Frame, direction: FrameDirection = FrameDirection.DOWNSTREAM):
+        # The audio task pushes input frames in the order they were queued, once VAD has seen them
+        if isinstance(frame, InputAudioRawFrame) and self._due:
+            self.replay.lateness.append(time.perf_counter() - self._due.popleft())
+        await super().push_frame(frame, direction)
+
+
+class ReplayOutput(FrameProcessor):
+    """Stands in for the room: counts the bot's audio and drops it"""
+
+    def __init__(self):
+        super().__init__()
+        self.audio_bytes = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, OutputAudioRawFrame):
+            self.audio_bytes += len(frame.audio)
+        else:
+            await self.push_frame(frame, direction)
+
+
+class ReplayTransport(BaseTransport):
+    def __init__(self, replay: Replay, vad_analyzer):
+        super().__init__()
+        first = next(iter(replay.recording))
+        self._input = ReplayInput(replay, TransportParams(
+            audio_in_enabled=True,
+            audio_in_sample_rate=first.sample_rate,
+            vad_analyzer=vad_analyzer,
+        ))
+        self._output = ReplayOutput()
+
+    def input(self) -> FrameProcessor:
+        return self._input
+
+    def output(self) -> FrameProcessor:
+        return self._output
+
+
+def register_replay_providers(args):
+    """Replay providers for every kind, selected through PIPECAT_<KIND>_PROVIDER"""
+
+    @register_provider("vad", "replay", "Replay VAD", "fakes")
+    def replay_vad(module, resources, **_):
+        if args.vad == "silero":
+            from pipecat.audio.vad.silero import SileroVADAnalyzer
+            return SileroVADAnalyzer()
+        return module.EnergyVAD()
+
+    @register_provider("transport", "replay", "Replay", "fakes")
+    def replay_transport(module, resources, room_url: str, vad_analyzer, **_):
+        return ReplayTransport(REPLAYS[room_url], vad_analyzer)
+
+    @register_provider("stt", "replay", "Turn STT", "fakes")
+    def replay_stt(module, resources, **_):
+        return module.TurnSTT(latency=args.stt_ms / 1000)
+
+    @register_provider("llm", "replay", "Fake LLM", "fakes")
+    def replay_llm(module, resources, **_):
+        return module.FakeLLM(ttft=args.llm_ttft_ms / 1000, token_interval=args.token_ms / 1000)
+
+    @register_provider("tts", "replay", "Fake TTS", "fakes")
+    def replay_tts(module, resources, sample_rate: int, **_):
+        return module.FakeTTS(latency=args.tts_ms / 1000, sample_rate=sample_rate, audio=module.tone)
+
+    for kind in KINDS:
+        os.environ[f"PIPECAT_{kind.upper()}_PROVIDER"] = "replay"
+    os.environ["PIPECAT_PROVIDER_FAILOVER"] = "false"
+
+
+def record_synthetic(path: str, seconds: float):
+    """Record the average speaker's turns as 20ms frames arriving exactly on time"""
+    pcm, _ = synthesize(SPEAKERS["average"], max(1, int(seconds // 6) + 1), seed=0)
+    audio = pcm.tobytes()
+    chunk = SAMPLE_RATE * FRAME_MS // 1000 * 2
+    recorder = SessionRecorder(path)
+    for index, offset in enumerate(range(0, len(audio), chunk)):
+        recorder.write(audio[offset:offset + chunk], SAMPLE_RATE, at=index * FRAME_MS / 1000)
+    recorder.close()
+
+
+async def run_level(sessions: int, recordings: List[SessionRecording], args, metrics: TurnLatencyMetrics) -> Dict:
+    replays = []
+    runs = []
+    for index in range(sessions):
+        replay = Replay(recordings[index % len(recordings)], args.seconds, args.speed, index * STAGGER_SECS)
+        room_url = f"replay://session-{sessions}-{index}"
+        REPLAYS[room_url] = replay
+        _, task, _ = pipecat_server.build_financial_assistant_task(room_url, "replay-token")
+        replays.append(replay)
+
+        async def run(task=task, replay=replay):
+            async def end_when_done():
+                await replay.done.wait()
+                await asyncio.sleep(args.drain_ms / 1000)  # Let the last turn's reply finish
+                await task.queue_frame(EndFrame())
+
+            await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), end_when_done())
+
+        runs.append(run())
+
+    async def replayed():
+        # CPU share while audio arrives, not while the sessions shut down
+        cpu, wall = time.process_time(), time.perf_counter()
+        await asyncio.gather(*(replay.done.wait() for replay in replays))
+        return (time.process_time() - cpu) / (time.perf_counter() - wall)
+
+    cpu, *_ = await asyncio.gather(replayed(), *runs)
+    REPLAYS.clear()
+
+    lateness = sorted(late for replay in replays for late in replay.lateness)
+    quantile = lambda q: lateness[min(len(lateness) - 1, int(q * len(lateness)))] * 1000
+    return {
+        "sessions": sessions,
+        "frames": len(lateness),
+        "p50_ms": quantile(0.5),
+        "p99_ms": quantile(0.99),
+        "max_ms": lateness[-1] * 1000,
+        "late_share": sum(late * 1000 > args.late_ms for late in lateness) / len(lateness),
+        "cpu": cpu,
+    }
+
+
+async def run(args):
+    paths = args.recordings
+    if not paths:
+        paths = [os.path.join(tempfile.gettempdir(), "finley-replay-synthetic.fses")]
+        record_synthetic(paths[0], args.seconds)
+    recordings = [SessionRecording(path) for path in paths]
+    print(
+        f"{len(recordings)} recording(s), {sum(len(r) for r in recordings)} frames,"
+        f" replaying {args.seconds:.0f}s each at {args.speed:g}x with {args.vad} VAD; late after {args.late_ms:.0f}ms\n"
+    )
+
+    # The pipeline reports turn_metrics events for the manager; collect them here instead
+    metrics = TurnLatencyMetrics()
+    pipecat_server.emit_event = lambda event, **data: metrics.observe(data) if event == "turn_metrics" else None
+
+    print(f"{'sessions':>8} {'frames':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'late':>6} {'cpu':>5}")
+    sustained = None
+    for sessions in args.sessions:
+        result = await run_level(sessions, recordings, args, metrics)
+        print(
+            f"{result['sessions']:>8} {result['frames']:>8} {result['p50_ms']:>7.1f} {result['p99_ms']:>7.1f}"
+            f" {result['max_ms']:>7.1f} {result['late_share']:>6.1%} {result['cpu']:>5.0%}"
+        )
+        if result["p99_ms"] > args.late_ms:
+            break
+        sustained = result
+
+    if sustained:
+        print(f"\nsustained: {sustained['sessions']} sessions per core, at {sustained['cpu']:.0%} of it")
+    else:
+        print(f"\nnot even {args.sessions[0]} session(s) kept p99 lateness under {args.late_ms:.0f}ms")
+    voice = metrics.summary().get("total")
+    if voice:
+        print(f"end of speech to first audio over {metrics.turns} turns: {voice}")
+
+    for recording in recordings:
+        recording.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recordings", nargs="*", help="Session recordings (.fses) to replay, round robin")
+    parser.add_argument("--sessions", type=lambda s: [int(n) for n in s.split(",")], default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--seconds", type=float, default=30, help="Audio replayed per session")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay this many times faster than recorded")
+    parser.add_argument("--late-ms", type=float, default=20, help="One 20ms frame")
+    parser.add_argument("--vad", choices=["energy", "silero"], default="energy")
+    parser.add_argument("--stt-ms", type=float, default=150)
+    parser.add_argument("--llm-ttft-ms", type=float, default=400)
+    parser.add_argument("--token-ms", type=float, default=20)
+    parser.add_argument("--tts-ms", type=float, default=200)
+    parser.add_argument("--drain-ms", type=float, default=2000)
+    args = parser.parse_args()
+    logger.remove()  # Every session logs its providers and VAD parameters
+    logging.getLogger().setLevel(logging.WARNING)
+    register_replay_providers(args)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
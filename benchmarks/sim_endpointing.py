@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""End-of-speech delay and cut-offs with fixed and adaptive VAD endpointing.
+
+Synthesizes user turns for three kinds of speaker: phrases of tone bursts separated by
+pauses whose lengths are known, then a few seconds of near silence while the bot
+answers. The same 16kHz PCM goes through the fixed VAD state machine (stop after the
+default 0.8s of silence) and through AdaptiveVADAnalyzer, both scoring speech with
+EnergyVAD. A turn's endpointing delay is the time from its last speech to the VAD
+stop; a cut-off is a stop inside a pause of an unfinished turn.
+
+  fast       phrase pauses of 120-350ms
+  average    phrase pauses of 200-600ms
+  slow       phrase pauses of 350-950ms
+
+    python benchmarks/sim_endpointing.py --turns 30
+    python benchmarks/sim_endpointing.py --pcm recording.wav    # Silero, prints each endpoint
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import wave
+from typing import List, Tuple
+
+import numpy as np
+from loguru import logger
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import EnergyVAD
+from pipecat_endpointing import AdaptiveVADAnalyzer
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20  # Transport input chunks
+
+SPEAKERS = {
+    "fast": (0.12, 0.35),
+    "average": (0.2, 0.6),
+    "slow": (0.35, 0.95),
+}
+
+
+def synthesize(pauses: Tuple[float, float], turns: int, seed: int) -> Tuple[np.ndarray, List[Tuple[float, float]]]:
+    """PCM plus (last speech, next turn start) in seconds for every turn"""
+    rng = np.random.default_rng(seed)
+    parts, turn_ends, total = [], [], 0
+
+    def add(samples: np.ndarray):
+        nonlocal total
+        parts.append(samples)
+        total += len(samples)
+
+    add(rng.normal(0, 20, SAMPLE_RATE))
+    for _ in range(turns):
+        for phrase in range(int(rng.integers(2, 6))):
+            if phrase:
+                add(rng.normal(0, 20, int(rng.uniform(*pauses) * SAMPLE_RATE)))
+            n = int(rng.uniform(0.6, 2.0) * SAMPLE_RATE)
+            t = np.arange(n) / SAMPLE_RATE
+            envelope = 0.6 + 0.4 * np.sin(2 * np.pi * rng.uniform(3, 6) * t)  # Syllable rhythm
+            add(rng.uniform(4000, 9000) * envelope * np.sin(2 * np.pi * rng.uniform(110, 220) * t))
+        speech_end = total / SAMPLE_RATE
+        add(rng.normal(0, 20, int(rng.uniform(2.5, 4.0) * SAMPLE_RATE)))
+        turn_ends.append((speech_end, total / SAMPLE_RATE))
+    return np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16), turn_ends
+
+
+def endpoints(analyzer: VADAnalyzer, audio: bytes) -> List[float]:
+    """Times in seconds at which the analyzer reported the end of speech"""
+    analyzer.set_sample_rate(SAMPLE_RATE)
+    chunk = SAMPLE_RATE * FRAME_MS // 1000 * 2
+    stops, state = [], VADState.QUIET
+    for offset in range(0, len(audio), chunk):
+        new_state = analyzer.analyze_audio(audio[offset:offset + chunk])
+        if new_state == VADState.QUIET and state != VADState.QUIET:
+            stops.append((offset + chunk) / 2 / SAMPLE_RATE)
+        state = new_state
+    return stops
+
+
+def score(stops: List[float], turn_ends: List[Tuple[float, float]]):
+    """(delay per finished turn in ms, cut-offs)"""
+    delays, cutoffs, previous_start = [], 0, 0.0
+    for speech_end, next_start in turn_ends:
+        inside = [s for s in stops if previous_start < s <= speech_end]
+        after = [s for s in stops if speech_end < s <= next_start]
+        cutoffs += len(inside)
+        if after:
+            delays.append((after[0] - speech_end) * 1000)
+        previous_start = next_start
+    return delays, cutoffs
+
+
+def run_synthetic(args):
+    print(f"{args.turns} turns per speaker\n")
+    print(f"{'speaker':<10} {'vad':<9} {'p50 ms':>7} {'p95 ms':>7} {'cut-offs':>9} {'stop ms':>8} {'saved ms/turn':>14}")
+    for index, (speaker, pauses) in enumerate(SPEAKERS.items()):
+        pcm, turn_ends = synthesize(pauses, args.turns, args.seed + index)
+        audio = pcm.tobytes()
+        adaptive = AdaptiveVADAnalyzer(EnergyVAD(SAMPLE_RATE))
+        results = {}
+        for name, analyzer in (("fixed", EnergyVAD(SAMPLE_RATE)), ("adaptive", adaptive)):
+            results[name] = score(endpoints(analyzer, audio), turn_ends)
+        fixed_p50 = statistics.median(results["fixed"][0])
+        for name, (delays, cutoffs) in results.items():
+            ordered = sorted(delays)
+            stop = adaptive.endpointer.stats()["stop_ms"] if name == "adaptive" else round(adaptive.endpointer.default_stop_secs * 1000)
+            saved = f"{fixed_p50 - statistics.median(delays):>14.0f}" if name == "adaptive" else f"{'':>14}"
+            print(
+                f"{speaker:<10} {name:<9} {statistics.median(ordered):>7.0f} {ordered[int(0.95 * (len(ordered) - 1))]:>7.0f}"
+                f" {cutoffs:>9} {stop:>8} {saved}"
+            )
+        print(f"{'':<10} endpointer: {adaptive.endpointer.stats()}")
+
+
+def run_recording(args):
+    from pipecat.audio.vad.silero import SileroVADAnalyzer
+
+    with wave.open(args.pcm) as recording:
+        if recording.getframerate() != SAMPLE_RATE or recording.getnchannels() != 1:
+            raise SystemExit(f"{args.pcm}: need 16kHz mono 16-bit PCM")
+        audio = recording.readframes(recording.getnframes())
+
+    analyzer = AdaptiveVADAnalyzer(SileroVADAnalyzer())
+    analyzer.set_sample_rate(SAMPLE_RATE)
+    chunk = SAMPLE_RATE * FRAME_MS // 1000 * 2
+    state = VADState.QUIET
+    for offset in range(0, len(audio), chunk):
+        new_state = analyzer.analyze_audio(audio[offset:offset + chunk])
+        if new_state == VADState.QUIET and state != VADState.QUIET:
+            stop, saved = analyzer.endpointer.last_turn
+            print(f"{offset / 2 / SAMPLE_RATE:8.2f}s  end of speech after {stop * 1000:.0f}ms silence, saved {saved * 1000:+.0f}ms")
+        state = new_state
+    print(analyzer.endpointer.stats())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pcm", help="16kHz mono WAV to run through Silero with adaptive endpointing")
+    args = parser.parse_args()
+    logger.remove()  # VADAnalyzer logs every parameter change
+    if args.pcm:
+        run_recording(args)
+    else:
+        run_synthetic(args)
+
+
+if __name__ == "__main__":
+    main()
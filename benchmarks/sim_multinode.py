@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Run the manager with several uvicorn workers against several local bot nodes.
+
+Each node is a `pipecat_bot_node.py` process running stand-in bots (benchmarks/fake_bot.py),
+all sharing one SQLite session registry. The script checks that manager workers run no
+embedded node, placement spread, stops that land on a different manager worker, 429s once
+every node is full, re-adoption after the manager and a node are killed, and cleanup after a
+node disappears for good. Then a single manager
+with its embedded node is restarted gracefully (SIGTERM): its bots must survive and be
+re-adopted, unless PIPECAT_STOP_BOTS_ON_SHUTDOWN=true asks for them to be stopped.
+
+    python benchmarks/sim_multinode.py --nodes 3 --bots-per-node 3 --manager-workers 2
+"""
+
+import argparse
+import asyncio
+import collections
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from daily_stub import start_daily_stub
+from pipecat_session_registry import open_registry
+
+NODE_TTL = 3
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Cluster:
+    def __init__(self, args, registry_url: str, daily_url: str):
+        self.args = args
+        self.env = {
+            **os.environ,
+            "PIPECAT_REGISTRY_URL": registry_url,
+            "PIPECAT_BOT_SCRIPT": os.path.join(ROOT, "benchmarks", "fake_bot.py"),
+            "PIPECAT_WORKER_POOL_SIZE": "1",
+            "PIPECAT_MAX_CONCURRENT_BOTS": str(args.bots_per_node),
+            "PIPECAT_ADMISSION_QUEUE_TIMEOUT": "0.5",
+            "PIPECAT_ADMISSION_RETRY_AFTER": "2",
+            "PIPECAT_NODE_TTL": str(NODE_TTL),
+            "DAILY_API_URL": daily_url,
+            "DAILY_API_KEY": "stub",
+        }
+        self.node_ports = {f"node-{i}": free_port() for i in range(args.nodes)}
+        self.nodes = {}
+        self.manager_port = free_port()
+        self.manager = None
+
+    def _spawn(self, args):
+        return subprocess.Popen(
+            args, cwd=ROOT, env=self.env, start_new_session=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def start_node(self, node_id: str):
+        port = self.node_ports[node_id]
+        self.nodes[node_id] = self._spawn([
+            sys.executable, "pipecat_bot_node.py", "--port", str(port), "--node-id", node_id,
+            "--advertise-url", f"http://127.0.0.1:{port}",
+        ])
+
+    def kill_node(self, node_id: str):
+        """SIGKILL the node process only; its bots keep running like after a crash"""
+        self.nodes.pop(node_id).kill()
+
+    def start_manager(self):
+        self.manager = self._spawn([
+            sys.executable, "-m", "uvicorn", "pipecat_server_manager:app",
+            "--port", str(self.manager_port), "--workers", str(self.args.manager_workers),
+        ])
+
+    def embedded_node_refused(self) -> bool:
+        """Whether a manager with several workers refuses to import with its embedded node on"""
+        importer = f"import sys; sys.argv = ['uvicorn', '--workers', '{self.args.manager_workers}']; import pipecat_server_manager"
+        result = subprocess.run(
+            [sys.executable, "-c", importer], cwd=ROOT, env={**self.env, "PIPECAT_EMBEDDED_NODE": "true"},
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        return result.returncode != 0 and "needs a single manager worker" in result.stderr
+
+    def start_embedded_manager(self, **env):
+        """One manager process running its own bots, like the default deployment"""
+        self.env.update({
+            "PIPECAT_EMBEDDED_NODE": "true",
+            "PIPECAT_NODE_ID": "embedded",
+            "PIPECAT_NODE_URL": self.url,
+            **env,
+        })
+        self.manager = self._spawn([
+            sys.executable, "-m", "uvicorn", "pipecat_server_manager:app", "--port", str(self.manager_port),
+        ])
+
+    def stop_manager(self):
+        """SIGTERM to the manager only, as a process manager restarting it would send"""
+        self.manager.terminate()
+        self.manager.wait()
+
+    def kill_manager(self):
+        os.killpg(self.manager.pid, signal.SIGKILL)
+        self.manager.wait()
+
+    def stop_all(self):
+        for process in [self.manager, *self.nodes.values()]:
+            if process and process.poll() is None:
+                os.killpg(process.pid, signal.SIGTERM)
+        for process in [self.manager, *self.nodes.values()]:
+            if process:
+                process.wait()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.manager_port}"
+
+
+async def wait_for(session: aiohttp.ClientSession, url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(url) as response:
+                if response.status < 500:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"{url} did not come up")
+
+
+async def start_bot(session, base: str):
+    async with session.post(f"{base}/api/v1/bots/start") as response:
+        return response.status, await response.json(), response.headers.get("Retry-After")
+
+
+async def stop_bot(session, base: str, bot_id: str) -> int:
+    async with session.post(f"{base}/api/v1/bots/stop", params={"bot_id": bot_id}) as response:
+        return response.status
+
+
+async def list_bots(session, base: str) -> dict:
+    async with session.get(f"{base}/api/v1/bots") as response:
+        return {s["bot_id"]: s["node_id"] for s in (await response.json())["sessions"]}
+
+
+def check(results, name: str, ok: bool, detail: str = ""):
+    results.append((name, ok, detail))
+    print(f"{'PASS' if ok else 'FAIL'}  {name}  {detail}")
+
+
+def pid_alive(pid: int) -> bool:
+    """Running, not a zombie: bots outlive the manager that started them, so nobody may reap them"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+async def embedded_restart(session, args, daily_url: str, results) -> list:
+    """Graceful restarts of a manager with an embedded node; returns pids left to clean up"""
+    registry_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='finley-sim-'), 'sessions.db')}"
+    registry = open_registry(registry_url)
+    cluster = Cluster(args, registry_url, daily_url)
+    pids = []
+    try:
+        cluster.start_embedded_manager()
+        await wait_for(session, f"{cluster.url}/api/health")
+        await asyncio.sleep(2.5)  # Warm worker
+        started = set()
+        for _ in range(2):
+            status, body, _ = await start_bot(session, cluster.url)
+            if status == 200:
+                started.add(body["bot_id"])
+        pids = [s.pid for s in await registry.sessions()]
+
+        cluster.stop_manager()
+        check(results, "graceful manager stop leaves embedded bots running",
+              len(started) == 2 and len(pids) == 2 and all(pid_alive(pid) for pid in pids), f"{pids}")
+        cluster.start_embedded_manager()
+        await wait_for(session, f"{cluster.url}/api/health")
+        check(results, "restarted manager re-adopts its embedded bots", set(await list_bots(session, cluster.url)) == started)
+        statuses = [await stop_bot(session, cluster.url, bot_id) for bot_id in started]
+        await asyncio.sleep(0.5)
+        check(results, "re-adopted embedded bots can be stopped",
+              statuses == [200, 200] and not any(pid_alive(pid) for pid in pids), f"{statuses}")
+
+        # Opting out: a graceful stop ends the bots, as before adoption existed
+        cluster.stop_manager()
+        cluster.start_embedded_manager(PIPECAT_STOP_BOTS_ON_SHUTDOWN="true")
+        await wait_for(session, f"{cluster.url}/api/health")
+        await asyncio.sleep(2.5)
+        status, body, _ = await start_bot(session, cluster.url)
+        pids = [s.pid for s in await registry.sessions()]
+        cluster.stop_manager()
+        check(results, "PIPECAT_STOP_BOTS_ON_SHUTDOWN=true stops embedded bots on shutdown",
+              status == 200 and bool(pids) and not any(pid_alive(pid) for pid in pids)
+              and not await registry.sessions(), f"{pids}")
+    finally:
+        cluster.stop_all()
+        registry.close()
+    return pids
+
+
+async def run(args):
+    results = []
+    registry_path = os.path.join(tempfile.mkdtemp(prefix="finley-sim-"), "sessions.db")
+    registry_url = f"sqlite:///{registry_path}"
+    stub_runner, daily_url = await start_daily_stub(latency_ms=5, handshake_ms=0)
+    cluster = Cluster(args, registry_url, daily_url)
+    orphans = []
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            for node_id in cluster.node_ports:
+                cluster.start_node(node_id)
+            cluster.start_manager()
+            for port in cluster.node_ports.values():
+                await wait_for(session, f"http://127.0.0.1:{port}/node/v1/health")
+            await wait_for(session, f"{cluster.url}/api/health")
+            await asyncio.sleep(2.5)  # First heartbeats with warm workers
+
+            # Manager workers run no embedded node of their own
+            registry = open_registry(registry_url)
+            registered = {node.node_id for node in await registry.nodes()}
+            check(results, "multi-worker manager registers no embedded node",
+                  registered == set(cluster.node_ports), f"{sorted(registered)}")
+            check(results, "multi-worker manager refuses PIPECAT_EMBEDDED_NODE=true", cluster.embedded_node_refused())
+
+            # Fill every node, plus a couple more that must be turned away
+            capacity = args.nodes * args.bots_per_node
+            started, rejected = {}, []
+            for _ in range(capacity + 2):
+                status, body, retry_after = await start_bot(session, cluster.url)
+                if status == 200:
+                    started[body["bot_id"]] = None
+                else:
+                    rejected.append((status, retry_after))
+            placement = await list_bots(session, cluster.url)
+            spread = collections.Counter(placement.values())
+            check(results, "placement fills every node evenly", len(started) == capacity
+                  and set(spread.values()) == {args.bots_per_node}, f"{dict(spread)}")
+            check(results, "over capacity gets 429 with Retry-After",
+                  len(rejected) == 2 and all(s == 429 and r for s, r in rejected), f"{rejected}")
+
+            # Stops land on whichever manager worker uvicorn picks
+            to_stop = list(started)[: capacity // 2]
+            statuses = [await stop_bot(session, cluster.url, bot_id) for bot_id in to_stop]
+            remaining = set(started) - set(to_stop)
+            check(results, "stops succeed from any manager worker",
+                  statuses == [200] * len(to_stop), f"{collections.Counter(statuses)}")
+            check(results, "registry matches the running bots",
+                  set(await list_bots(session, cluster.url)) == remaining)
+
+            # Manager crash: bots live on the nodes, so nothing is lost
+            cluster.kill_manager()
+            cluster.start_manager()
+            await wait_for(session, f"{cluster.url}/api/health")
+            check(results, "manager restart re-adopts every bot",
+                  set(await list_bots(session, cluster.url)) == remaining)
+
+            # Node crash and restart under the same id: its bots are adopted, not lost
+            victim = collections.Counter((await list_bots(session, cluster.url)).values()).most_common(1)[0][0]
+            before = {b for b, n in (await list_bots(session, cluster.url)).items() if n == victim}
+            cluster.kill_node(victim)
+            cluster.start_node(victim)
+            await wait_for(session, f"http://127.0.0.1:{cluster.node_ports[victim]}/node/v1/health")
+            await asyncio.sleep(2.5)
+            after = {b for b, n in (await list_bots(session, cluster.url)).items() if n == victim}
+            check(results, f"restarted {victim} re-adopts its bots", before == after and bool(before),
+                  f"{len(after)}/{len(before)}")
+            adopted = next(iter(after))
+            check(results, "adopted bot can be stopped", await stop_bot(session, cluster.url, adopted) == 200)
+            remaining.discard(adopted)
+
+            # A node that never comes back: its sessions leave the registry after the TTL
+            gone = next(n for n in cluster.node_ports if n != victim)
+            lost = {s.bot_id for s in await registry.sessions(gone)}
+            orphans = [s.pid for s in await registry.sessions(gone)]
+            cluster.kill_node(gone)
+            await asyncio.sleep(NODE_TTL * 2 + 1)
+            listed = await list_bots(session, cluster.url)
+            check(results, f"dead {gone} is swept with its sessions",
+                  bool(lost) and set(listed) == remaining - lost, f"{len(lost)} dropped")
+            status, body, _ = await start_bot(session, cluster.url)
+            listed = await list_bots(session, cluster.url)
+            check(results, "new sessions avoid the dead node",
+                  status == 200 and listed.get(body["bot_id"]) not in (None, gone))
+
+            orphans += await embedded_restart(session, args, daily_url, results)
+    finally:
+        cluster.stop_all()
+        for pid in orphans:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        await stub_runner.cleanup()
+
+    failed = [name for name, ok, _ in results if not ok]
+    print(f"\n{len(results) - len(failed)}/{len(results)} checks passed")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--bots-per-node", type=int, default=3)
+    parser.add_argument("--manager-workers", type=int, default=2)
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
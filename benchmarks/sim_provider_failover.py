@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Time to first token through RoutedChatClient while the primary LLM degrades.
+
+Two local OpenAI-compatible stand-ins (benchmarks/llm_stub.py) play the primary and
+the fallback. Each scenario sends `--requests` chat completions through the real
+AsyncOpenAI client and reports time to first token, plus which endpoint answered:
+
+  healthy       both endpoints fine
+  slow          primary takes --slow-ms to its first token, with and without hedging;
+                without, requests move once its median passes --slow-after-ms
+  failing       primary returns 500 for every request
+  stalled       primary accepts requests but never streams
+
+Then a TTS pipeline with two FakeTTS branches behind the failover router, where the
+first one fails every sentence, reports how many replies were spoken and by whom.
+
+    python benchmarks/sim_provider_failover.py --requests 40 --slow-ms 2000 --hedge-ms 400
+"""
+
+import argparse
+import asyncio
+import collections
+import logging
+import os
+import statistics
+import sys
+import time
+
+from openai import AsyncOpenAI
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    TextFrame,
+    TTSAudioRawFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import FakeTTS
+from llm_stub import start_llm_stub
+from pipecat_providers import Provider
+from pipecat_routing import ChatRoute, HealthBoard, RoutedChatClient
+from pipecat_server import TTS_FAILOVER, failover_service
+
+MESSAGES = [{"role": "user", "content": "How much did I spend on dining this month?"}]
+
+
+async def ask(client: RoutedChatClient) -> float:
+    started = time.perf_counter()
+    first = None
+    stream = await client.chat.completions.create(
+        model="ignored", stream=True, messages=MESSAGES, stream_options={"include_usage": True}
+    )
+    async for chunk in stream:
+        if first is None and chunk.choices and chunk.choices[0].delta.content:
+            first = time.perf_counter() - started
+    return first
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_scenario(name: str, stubs, args, settings, hedge_ms: float = 0):
+    primary, fallback = stubs
+    for stub in stubs:
+        stub.app["settings"].update(ttft_ms=args.ttft_ms, fail_rate=0.0, stall=False)
+        stub.app["stats"].update(requests=0, failed=0, completed=0, cancelled=0)
+    primary.app["settings"].update(settings)
+
+    events = collections.Counter()
+    clients = [AsyncOpenAI(api_key="stub", base_url=url, max_retries=0) for url in (args.primary_url, args.fallback_url)]
+    router = RoutedChatClient(
+        [ChatRoute("primary", clients[0], "stub-a"), ChatRoute("fallback", clients[1], "stub-b")],
+        board=HealthBoard(cooldown=args.cooldown, slow_after={"llm": args.slow_after_ms / 1000}),
+        hedge_after=hedge_ms / 1000 if hedge_ms else None,
+        first_token_timeout=args.first_token_timeout,
+        report=lambda event, outcome: events.update([f"{event}:{outcome}"]),
+    )
+    ttfts, errors = [], 0
+    for _ in range(args.requests):
+        try:
+            ttfts.append(await ask(router))
+        except Exception:
+            errors += 1
+    await asyncio.sleep(0.1)  # Let hedged losers close
+    for client in clients:
+        await client.close()
+
+    ms = [t * 1000 for t in ttfts]
+    print(
+        f"{name:<22} {statistics.median(ms) if ms else float('nan'):>8.0f} {percentile(ms, 0.95) if ms else float('nan'):>8.0f}"
+        f" {errors:>6} {primary.app['stats']['requests']:>8} {fallback.app['stats']['requests']:>9}  {dict(events)}"
+    )
+    return ms, errors
+
+
+class AudioCounter(FrameProcessor):
+    """Counts replies that produced audio"""
+
+    def __init__(self):
+        super().__init__()
+        self.spoken = 0
+        self._in_reply = False
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, LLMFullResponseStartFrame):
+            self._in_reply = True
+        elif isinstance(frame, TTSAudioRawFrame) and self._in_reply:
+            self.spoken += 1
+            self._in_reply = False
+        await self.push_frame(frame, direction)
+
+
+async def run_tts_failover(args):
+    def provider(name: str) -> Provider:
+        return Provider("tts", name, name, "", (), lambda *a, **k: None)
+
+    primary, fallback = FakeTTS(latency=0.1, failing=True), FakeTTS(latency=0.1)
+    counter = AudioCounter()
+    tts = failover_service("tts", [(provider("primary"), primary), (provider("fallback"), fallback)], TTS_FAILOVER)
+    task = PipelineTask(Pipeline([tts, counter]), params=PipelineParams(allow_interruptions=True))
+
+    async def speak():
+        for i in range(args.replies):
+            await task.queue_frames([
+                LLMFullResponseStartFrame(), TextFrame(f"Reply number {i} is ready."), LLMFullResponseEndFrame()
+            ])
+            await asyncio.sleep(0.3)
+        await task.queue_frame(EndFrame())
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), speak())
+    print(
+        f"\ntts failover: {counter.spoken}/{args.replies} replies spoken, "
+        f"primary tried {len(primary.sentences)}, fallback spoke {len(fallback.sentences)}"
+    )
+
+
+async def run(args):
+    runners = []
+    for _ in range(2):
+        runner, url = await start_llm_stub(ttft_ms=args.ttft_ms, token_ms=args.token_ms)
+        runners.append((runner, url))
+    (primary, args.primary_url), (fallback, args.fallback_url) = runners
+    stubs = (primary, fallback)
+
+    print(f"{'scenario':<22} {'p50 ms':>8} {'p95 ms':>8} {'errors':>6} {'primary':>8} {'fallback':>9}  events")
+    try:
+        await run_scenario("healthy", stubs, args, {})
+        await run_scenario("slow, no hedge", stubs, args, {"ttft_ms": args.slow_ms})
+        await run_scenario(f"slow, hedge {args.hedge_ms:.0f}ms", stubs, args, {"ttft_ms": args.slow_ms}, args.hedge_ms)
+        await run_scenario("failing", stubs, args, {"fail_rate": 1.0})
+        await run_scenario("half failing", stubs, args, {"fail_rate": 0.5})
+        await run_scenario("stalled", stubs, args, {"stall": True})
+    finally:
+        for runner, _ in runners:
+            await runner.cleanup()
+
+    await run_tts_failover(args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--ttft-ms", type=float, default=300)
+    parser.add_argument("--token-ms", type=float, default=5)
+    parser.add_argument("--slow-ms", type=float, default=2000)
+    parser.add_argument("--hedge-ms", type=float, default=400)
+    parser.add_argument("--first-token-timeout", type=float, default=3.0)
+    parser.add_argument("--cooldown", type=float, default=30.0)
+    parser.add_argument("--slow-after-ms", type=float, default=1500)
+    parser.add_argument("--replies", type=int, default=6)
+    args = parser.parse_args()
+    for noisy in ("aiohttp.access", "httpx"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Speculative LLM generation on interim transcripts, simulated with scripted STT and a fake LLM.
+
+Runs FinancialAssistantProcessor -> FakeLLM -> SpeculationGate over a few scripted turns,
+with and without speculation. It reports the time from the final transcript to the first
+LLM text leaving the gate, the LLM calls made and the hit/miss/wasted counters.
+
+    python benchmarks/sim_speculation.py --ttft 0.4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pipecat.frames.frames import EndFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+
+from fakes import FakeLLM, FrameRecorder, ScriptedSTT
+from pipecat_context import ConversationMemory
+from pipecat_server import FinancialAssistantProcessor, SpeculationGate
+from pipecat_speculation import SpeculationController
+
+QUESTION = "how much did I spend on fast food"
+
+SCENARIOS = {
+    # Interims settle early and the final agrees: speculation should hit
+    "stable": [
+        (0.10, "interim", "how much"),
+        (0.25, "interim", QUESTION),
+        (0.40, "interim", QUESTION),
+        (0.50, "stopped", ""),
+        (0.90, "final", "How much did I spend on fast food?"),
+    ],
+    # The final adds words the interims never showed: a miss, regenerated
+    "revised_final": [
+        (0.10, "interim", QUESTION),
+        (0.25, "interim", QUESTION),
+        (0.50, "stopped", ""),
+        (0.90, "final", f"{QUESTION} this month"),
+    ],
+    # The user pauses, then keeps talking: the first speculation is wasted
+    "kept_talking": [
+        (0.10, "interim", QUESTION),
+        (0.25, "interim", QUESTION),
+        (0.60, "started", ""),
+        (0.70, "interim", f"{QUESTION} last month"),
+        (0.85, "interim", f"{QUESTION} last month"),
+        (1.30, "final", f"{QUESTION} last month"),
+    ],
+}
+
+
+async def run_scenario(script, speculate: bool, ttft: float) -> dict:
+    stt = ScriptedSTT(script)
+    llm = FakeLLM(ttft=ttft)
+    recorder = FrameRecorder()
+    speculation = SpeculationController() if speculate else None
+    processor = FinancialAssistantProcessor(memory=ConversationMemory(), speculation=speculation)
+
+    task = PipelineTask(
+        Pipeline([stt, processor, llm, SpeculationGate(), recorder]),
+        params=PipelineParams(allow_interruptions=True),
+    )
+
+    async def end_after_script():
+        await stt.done.wait()
+        await asyncio.sleep(ttft + 1.0)
+        await task.queue_frame(EndFrame())
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), end_after_script())
+
+    final_at = stt.final_at[-1]
+    first_text = next((at for at, _ in recorder.text_at if at >= final_at), None)
+    return {
+        "final_to_first_text_ms": round((first_text - final_at) * 1000, 1) if first_text else None,
+        "llm_calls": llm.calls,
+        "llm_completed": llm.completed,
+        "speculation": speculation.stats() if speculation else None,
+    }
+
+
+async def run(ttft: float) -> dict:
+    results = {}
+    for name, script in SCENARIOS.items():
+        results[name] = {
+            "baseline": await run_scenario(script, speculate=False, ttft=ttft),
+            "speculative": await run_scenario(script, speculate=True, ttft=ttft),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ttft", type=float, default=0.4, help="Fake LLM time to first token (s)")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.ttft)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
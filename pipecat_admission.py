@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def read_process_usage(pid: int) -> Optional[Tuple[float, int]]:
+    """(CPU seconds used, resident bytes) for a process from /proc; None once it is gone"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name can contain spaces; fields resume after its closing paren
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (FileNotFoundError, ProcessLookupError, IndexError):
+        return None
+    utime, stime = int(fields[11]), int(fields[12])
+    return (utime + stime) / CLOCK_TICKS, resident_pages * PAGE_SIZE
+
+
+def read_host_cpu() -> Tuple[int, int]:
+    """(busy jiffies, total jiffies) across all cores from /proc/stat"""
+    with open("/proc/stat") as f:
+        values = [int(v) for v in f.readline().split()[1:]]
+    idle = values[3] + (values[4] if len(values) > 4 else 0)  # idle + iowait
+    total = sum(values[:8])
+    return total - idle, total
+
+
+def read_mem_available() -> int:
+    with open("/proc/meminfo") as f:
+        for line in f:
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+@dataclass
+class HostSample:
+    taken_at: float
+    host_cpu: float          # Busy fraction of all cores since the previous sample
+    load_per_core: float     # 1-minute load average / cores
+    mem_available: int
+    bot_cpu_cores: float     # Cores used by bot processes since the previous sample
+    bot_rss: int
+    bot_processes: int
+
+
+class HostSampler:
+    """Samples host CPU, load and memory plus the CPU and RSS of the bot processes"""
+
+    def __init__(self, bot_pids: Callable[[], Iterable[int]], interval: float = 1.0):
+        self.bot_pids = bot_pids
+        self.interval = interval
+        self.cores = os.cpu_count() or 1
+        self.latest: Optional[HostSample] = None
+        self.listeners = []  # Called after every sample
+        self._previous_host: Optional[Tuple[int, int]] = None
+        self._previous_cpu: Dict[int, Tuple[float, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def sample(self) -> HostSample:
+        now = time.monotonic()
+        busy, total = read_host_cpu()
+        host_cpu = 0.0
+        if self._previous_host and total > self._previous_host[1]:
+            host_cpu = (busy - self._previous_host[0]) / (total - self._previous_host[1])
+        self._previous_host = (busy, total)
+
+        bot_cpu, bot_rss, seen = 0.0, 0, {}
+        for pid in set(self.bot_pids()):
+            usage = read_process_usage(pid)
+            if usage is None:
+                continue
+            cpu_seconds, rss = usage
+            previous = self._previous_cpu.get(pid)
+            if previous and now > previous[1]:
+                bot_cpu += (cpu_seconds - previous[0]) / (now - previous[1])
+            seen[pid] = (cpu_seconds, now)
+            bot_rss += rss
+        self._previous_cpu = seen
+
+        self.latest = HostSample(
+            taken_at=now,
+            host_cpu=host_cpu,
+            load_per_core=os.getloadavg()[0] / self.cores,
+            mem_available=read_mem_available(),
+            bot_cpu_cores=bot_cpu,
+            bot_rss=bot_rss,
+            bot_processes=len(seen),
+        )
+        for listener in self.listeners:
+            listener(self.latest)
+        return self.latest
+
+    async def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"⚠️ Host sampling failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Admits new bot sessions only while the host has headroom for another one
+
+    Headroom is the smallest of: the bot count limit, spare CPU divided by the CPU a
+    session uses, and spare memory divided by a session's RSS. Per-session costs are
+    measured from running bots, falling back to configured estimates until there are any.
+    Requests over capacity wait in a bounded FIFO queue until a deadline, or are rejected
+    straight away when the queue is full.
+    """
+
+    def __init__(
+        self,
+        sampler: HostSampler,
+        active_sessions: Callable[[], int],
+        max_bots: int = 0,
+        max_cpu: float = 0.85,
+        max_load: float = 1.5,
+        min_free_bytes: int = 512 * 1024 * 1024,
+        session_cpu: float = 0.25,
+        session_rss: int = 150 * 1024 * 1024,
+        queue_size: int = 16,
+        queue_timeout: float = 10.0,
+        retry_after: int = 5,
+    ):
+        self.sampler = sampler
+        self.active_sessions = active_sessions
+        self.max_bots = max_bots
+        self.max_cpu = max_cpu
+        self.max_load = max_load
+        self.min_free_bytes = min_free_bytes
+        self.default_session_cpu = session_cpu
+        self.default_session_rss = session_rss
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._starting = 0  # Admitted sessions not yet visible in active_sessions()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected: Dict[str, int] = {}
+        sampler.listeners.append(lambda _: self.notify())
+
+    def _session_costs(self, sample: HostSample) -> Tuple[float, int]:
+        sessions = self.active_sessions()
+        if sessions <= 0 or sample.bot_processes == 0:
+            return self.default_session_cpu, self.default_session_rss
+        # Never assume a session is cheaper than a tenth of the configured estimate
+        return (
+            max(sample.bot_cpu_cores / sessions, self.default_session_cpu / 10),
+            max(sample.bot_rss // sessions, self.default_session_rss // 10),
+        )
+
+    def headroom(self) -> Tuple[int, str]:
+        """(sessions that still fit, the resource that limits them)"""
+        sample = self.sampler.latest or self.sampler.sample()
+        sessions = self.active_sessions() + self._starting
+        session_cpu, session_rss = self._session_costs(sample)
+
+        limits = {
+            "cpu": math.floor((self.max_cpu - sample.host_cpu) * self.sampler.cores / session_cpu),
+            "memory": (sample.mem_available - self.min_free_bytes) // session_rss,
+        }
+        if self.max_bots:
+            limits["max_bots"] = self.max_bots - sessions
+        if sample.load_per_core >= self.max_load:
+            limits["load"] = 0
+        # Measured usage lags new sessions; count the ones still starting against CPU and memory
+        limits["cpu"] -= self._starting
+        limits["memory"] -= self._starting
+
+        reason = min(limits, key=limits.get)
+        return max(0, limits[reason]), reason
+
+    def notify(self):
+        """Wake queued requests in order while there is headroom for them"""
+        while self._waiters:
+            waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if self.headroom()[0] <= 0:
+                return
+            self._waiters.popleft()
+            self._starting += 1
+            waiter.set_result(True)
+
+    def _reject(self, why: str) -> AdmissionRejected:
+        reason = self.headroom()[1]
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        logger.warning(f"🚦 Rejecting bot start: {why}, limited by {reason}")
+        return AdmissionRejected(f"{why}, limited by {reason}", self.retry_after)
+
+    async def acquire(self):
+        """Wait for a session slot; raises AdmissionRejected when the host stays full"""
+        if self.headroom()[0] > 0 and not self._waiters:
+            self._starting += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            raise self._reject("wait queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Admitted just as the deadline hit
+                self.admitted += 1
+                return
+            waiter.cancel()
+            self._waiters.remove(waiter)
+            raise self._reject(f"no capacity within {self.queue_timeout:g}s")
+        except asyncio.CancelledError:
+            # The client went away while queued; hand back a slot it may already hold
+            if waiter.done():
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            raise
+        self.admitted += 1
+
+    def release(self):
+        """The admitted session is running (or failed to start) and counts as itself now"""
+        self._starting = max(0, self._starting - 1)
+        self.notify()
+
+    def stats(self) -> Dict:
+        free, reason = self.headroom()
+        sample = self.sampler.latest
+        session_cpu, session_rss = self._session_costs(sample)
+        return {
+            "accepting": free > 0,
+            "headroom": free,
+            "limited_by": reason,
+            "active_sessions": self.active_sessions(),
+            "starting": self._starting,
+            "queued": len(self._waiters),
+            "host_cpu": round(sample.host_cpu, 3),
+            "load_per_core": round(sample.load_per_core, 2),
+            "mem_available_mb": sample.mem_available // (1024 * 1024),
+            "session_cpu_cores": round(session_cpu, 3),
+            "session_rss_mb": round(session_rss / (1024 * 1024), 1),
+            "admitted_total": self.admitted,
+            "queued_total": self.queued,
+            "rejected_total": self.rejected,
+        }
+
+
+def admission_from_env(
+    bot_pids: Callable[[], Iterable[int]], active_sessions: Callable[[], int]
+) -> AdmissionController:
+    """Admission controller configured from the PIPECAT_ADMISSION_* environment"""
+    return AdmissionController(
+        # Host sessions share their host's pid; the sampler counts each process once
+        HostSampler(bot_pids, interval=float(os.getenv("PIPECAT_ADMISSION_SAMPLE_INTERVAL", "1"))),
+        active_sessions=active_sessions,
+        max_bots=int(os.getenv("PIPECAT_MAX_CONCURRENT_BOTS", "0")),
+        max_cpu=float(os.getenv("PIPECAT_ADMISSION_MAX_CPU", "0.85")),
+        max_load=float(os.getenv("PIPECAT_ADMISSION_MAX_LOAD", "1.5")),
+        min_free_bytes=int(os.getenv("PIPECAT_ADMISSION_MIN_FREE_MB", "512")) * 1024 * 1024,
+        session_cpu=float(os.getenv("PIPECAT_ADMISSION_SESSION_CPU", "0.25")),
+        session_rss=int(os.getenv("PIPECAT_ADMISSION_SESSION_MB", "150")) * 1024 * 1024,
+        queue_size=int(os.getenv("PIPECAT_ADMISSION_QUEUE_SIZE", "16")),
+        queue_timeout=float(os.getenv("PIPECAT_ADMISSION_QUEUE_TIMEOUT", "10")),
+        retry_after=int(os.getenv("PIPECAT_ADMISSION_RETRY_AFTER", "5")),
+    )
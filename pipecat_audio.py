@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 16-bit mono PCM throughout, as every service in the pipeline produces and consumes it
+SAMPLE_BYTES = 2
+FULL_SCALE = 32768.0
+
+Chunk = Tuple[bytes, int]  # (PCM, sample rate)
+
+
+def dbfs_to_amplitude(dbfs: float) -> float:
+    return FULL_SCALE * 10 ** (dbfs / 20)
+
+
+def pcm_view(audio) -> np.ndarray:
+    """int16 samples over a bytes-like buffer without copying it"""
+    return np.frombuffer(audio, dtype=np.int16, count=len(audio) // SAMPLE_BYTES)
+
+
+class _Scratch:
+    """Growable work buffers reused across frames, one per name"""
+
+    def __init__(self):
+        self._buffers: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str, dtype, size: int) -> np.ndarray:
+        buffer = self._buffers.get(name)
+        if buffer is None or len(buffer) < size:
+            buffer = self._buffers[name] = np.empty(max(size, 4096), dtype=dtype)
+        return buffer[:size]
+
+
+class LinearResampler:
+    """Streaming linear-interpolation resampler that keeps phase across frames
+
+    Interpolation plans are cached per (frame length, phase); with 10ms-multiple frames
+    between the usual speech rates the phase is always zero, so every frame after the
+    first reuses one plan. There is no anti-aliasing filter, which is fine for speech
+    between 16 and 48kHz but not for general audio.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int):
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.step = in_rate / out_rate
+        self._phase = 0.0  # Position of the next output sample, relative to this frame's first
+        self._last = 0.0   # Previous frame's last sample, at position -1
+        self._plans: Dict[Tuple[int, float], Tuple[np.ndarray, np.ndarray, np.ndarray, float]] = {}
+
+    def _plan(self, n: int):
+        key = (n, round(self._phase, 9))
+        plan = self._plans.get(key)
+        if plan is None:
+            count = int(math.floor((n - 1 - self._phase) / self.step)) + 1 if n else 0
+            positions = self._phase + np.arange(max(count, 0)) * self.step + 1  # +1: index in [last, *frame]
+            lower = np.floor(positions).astype(np.intp)
+            upper = np.minimum(lower + 1, n)
+            weights = (positions - lower).astype(np.float32)
+            next_phase = self._phase + max(count, 0) * self.step - n
+            plan = self._plans[key] = (lower, upper, weights, next_phase)
+            if len(self._plans) > 64:
+                self._plans.pop(next(iter(self._plans)))
+        return plan
+
+    def process(self, samples: np.ndarray, scratch: _Scratch) -> np.ndarray:
+        """float32 output samples (a scratch view, valid until the next call)"""
+        n = len(samples)
+        extended = scratch.get("resample_in", np.float32, n + 1)
+        extended[0] = self._last
+        np.copyto(extended[1:], samples, casting="unsafe")
+        lower, upper, weights, next_phase = self._plan(n)
+
+        out = scratch.get("resample_out", np.float32, len(lower))
+        delta = scratch.get("resample_delta", np.float32, len(lower))
+        np.take(extended, lower, out=out)
+        np.take(extended, upper, out=delta)
+        np.subtract(delta, out, out=delta)
+        np.multiply(delta, weights, out=delta)
+        np.add(out, delta, out=out)
+
+        if n:
+            self._last = float(extended[n])
+        self._phase = next_phase
+        return out
+
+    def reset(self):
+        self._phase = 0.0
+        self._last = 0.0
+
+
+class AudioConditioner:
+    """Conditions one stream of TTS audio: silence trimming, gain normalization, resampling
+
+    Works on each frame's bytes through an int16 view and reusable float32 scratch
+    buffers, so the only allocation per changed frame is its output bytes, and frames
+    that need no change pass through as the same object.
+
+    - Leading silence of an utterance is dropped up to `pad_ms` before the first audible
+      sample. Silence inside the utterance is held back (up to `max_hold_ms`) and released
+      once audio follows; whatever is still held when the utterance ends is dropped,
+      except its first `pad_ms`.
+    - Gain follows the RMS of audible frames towards `target_dbfs`, between `min_gain`
+      and `max_gain`, smoothed by `smoothing` per frame and limited so peaks never clip.
+    - With `output_rate` set, frames at any other rate are resampled to it.
+    """
+
+    def __init__(
+        self,
+        trim_silence: bool = True,
+        silence_dbfs: float = -50.0,
+        pad_ms: float = 20.0,
+        max_hold_ms: float = 1000.0,
+        target_dbfs: Optional[float] = -18.0,
+        min_gain: float = 0.5,
+        max_gain: float = 4.0,
+        smoothing: float = 0.2,
+        output_rate: Optional[int] = None,
+    ):
+        self.trim_silence = trim_silence
+        self.silence_threshold = dbfs_to_amplitude(silence_dbfs)
+        self.pad_ms = pad_ms
+        self.max_hold_ms = max_hold_ms
+        self.target_rms = dbfs_to_amplitude(target_dbfs) if target_dbfs is not None else None
+        self.min_gain = min_gain
+        self.max_gain = max_gain
+        self.smoothing = smoothing
+        self.output_rate = output_rate
+        self.gain = 1.0
+        self.trimmed_ms = 0.0  # Silence dropped so far
+        self._scratch = _Scratch()
+        self._resamplers: Dict[int, LinearResampler] = {}
+        self._audible = False  # An audible sample was seen in this utterance
+        self._preroll: Optional[Chunk] = None  # Tail of the leading silence
+        self._held: List[Chunk] = []  # Silence after audio, until more audio or the end
+        self._held_ms = 0.0
+
+    def start_utterance(self):
+        if self._preroll:
+            self._drop(*self._preroll)
+        for audio, rate in self._held:
+            self._drop(audio, rate)
+        self._audible = False
+        self._preroll = None
+        self._held = []
+        self._held_ms = 0.0
+
+    def end_utterance(self) -> List[Chunk]:
+        """The first `pad_ms` of trailing silence; the rest of it is dropped"""
+        tail: List[Chunk] = []
+        remaining_ms = self.pad_ms
+        while self._held and remaining_ms > 0:
+            audio, rate = self._held.pop(0)
+            keep = min(len(audio), int(rate * remaining_ms / 1000) * SAMPLE_BYTES)
+            if keep < len(audio):
+                self._drop(audio[keep:], rate)
+                audio = audio[:keep]
+            remaining_ms -= keep / SAMPLE_BYTES * 1000 / rate
+            if audio:
+                tail.append(self._condition(audio, rate, pcm_view(audio), 0))
+        self.start_utterance()
+        return tail
+
+    def reset(self):
+        """Interrupted: nothing held is ever played"""
+        self.start_utterance()
+        for resampler in self._resamplers.values():
+            resampler.reset()
+
+    def process(self, audio: bytes, sample_rate: int) -> List[Chunk]:
+        """Chunks to play now for one input frame, in order (possibly none)"""
+        samples = pcm_view(audio)
+        if not len(samples):
+            return []
+        # ufunc reductions skip the Python-level wrappers of ndarray.max/min
+        peak = max(int(np.maximum.reduce(samples)), -int(np.minimum.reduce(samples)))
+        audible = peak > self.silence_threshold
+        if not self.trim_silence:
+            return [self._condition(audio, sample_rate, samples, peak if audible else 0)]
+
+        if not audible:
+            self._hold(audio, sample_rate)
+            if self._held_ms > self.max_hold_ms:
+                # A pause this long is part of the speech; play it
+                return self._release()
+            return []
+
+        chunks = self._release()
+        if not self._audible:
+            self._audible = True
+            chunks += self._cut_leading(audio, sample_rate, samples)
+            audio = chunks.pop()[0]
+            samples = pcm_view(audio)
+        chunks.append(self._condition(audio, sample_rate, samples, peak))
+        return chunks
+
+    def _pad_bytes(self, rate: int) -> int:
+        return int(rate * self.pad_ms / 1000) * SAMPLE_BYTES
+
+    def _drop(self, audio: bytes, rate: int):
+        self.trimmed_ms += len(audio) / SAMPLE_BYTES * 1000 / rate
+
+    def _hold(self, audio: bytes, rate: int):
+        if self._audible:
+            self._held.append((audio, rate))
+            self._held_ms += len(audio) / SAMPLE_BYTES * 1000 / rate
+            return
+        # Leading silence: only its last pad_ms may be needed as pre-roll
+        if self._preroll:
+            self._drop(*self._preroll)
+        keep = min(len(audio), self._pad_bytes(rate))
+        self._drop(audio[:len(audio) - keep], rate)
+        self._preroll = (audio[len(audio) - keep:], rate)
+
+    def _release(self) -> List[Chunk]:
+        held, self._held, self._held_ms = self._held, [], 0.0
+        return [self._condition(audio, rate, pcm_view(audio), 0) for audio, rate in held]
+
+    def _cut_leading(self, audio: bytes, rate: int, samples: np.ndarray) -> List[Chunk]:
+        """Pre-roll (if any) and the frame cut to `pad_ms` before its first audible sample"""
+        loud = np.flatnonzero((samples > self.silence_threshold) | (samples < -self.silence_threshold))
+        start = int(loud[0]) * SAMPLE_BYTES - self._pad_bytes(rate)
+        preroll, self._preroll = self._preroll, None
+        chunks: List[Chunk] = []
+        if start > 0:
+            if preroll:
+                self._drop(*preroll)
+            self._drop(audio[:start], rate)
+            audio = audio[start:]
+        elif preroll:
+            needed = min(-start, len(preroll[0]))
+            self._drop(preroll[0][:len(preroll[0]) - needed], preroll[1])
+            if needed:
+                pre = preroll[0][len(preroll[0]) - needed:]
+                chunks.append(self._condition(pre, preroll[1], pcm_view(pre), 0))
+        chunks.append((audio, rate))
+        return chunks
+
+    def _resampler(self, rate: int) -> Optional[LinearResampler]:
+        if not self.output_rate or rate == self.output_rate:
+            return None
+        if rate not in self._resamplers:
+            self._resamplers[rate] = LinearResampler(rate, self.output_rate)
+        return self._resamplers[rate]
+
+    def _condition(self, audio: bytes, rate: int, samples: np.ndarray, peak: int) -> Chunk:
+        """Gain and resampling for one chunk; `peak` is 0 for silence, which never moves the gain"""
+        resampler = self._resampler(rate)
+        n = len(samples)
+        work = self._scratch.get("work", np.float32, n)
+        np.copyto(work, samples, casting="unsafe")
+
+        gain = self.gain
+        if peak and self.target_rms:
+            rms = math.sqrt(float(np.dot(work, work)) / n)
+            if rms > 0:
+                desired = min(self.max_gain, max(self.min_gain, self.target_rms / rms))
+                self.gain += self.smoothing * (desired - self.gain)
+        # Never push this frame's peak past full scale; silence peaks below the threshold
+        gain = min(self.gain, (FULL_SCALE - 1) / (peak or self.silence_threshold))
+
+        if resampler is None and abs(gain - 1.0) < 0.01:
+            return audio, rate
+
+        if resampler:
+            work = resampler.process(work, self._scratch)
+            rate = self.output_rate
+        if abs(gain - 1.0) >= 0.01:
+            np.multiply(work, gain, out=work)
+        # No clipping needed: gain is capped by the peak, and interpolation stays within the input
+        np.rint(work, out=work)
+        out = self._scratch.get("out", np.int16, len(work))
+        np.copyto(out, work, casting="unsafe")
+        return out.tobytes(), rate
+
+
+def conditioner_from_env() -> Optional[AudioConditioner]:
+    """A conditioner for one session's TTS output with PIPECAT_AUDIO_CONDITIONING=true, otherwise None"""
+    if os.getenv("PIPECAT_AUDIO_CONDITIONING", "false").lower() != "true":
+        return None
+    target = os.getenv("PIPECAT_AUDIO_TARGET_DBFS", "-18")
+    output_rate = int(os.getenv("PIPECAT_AUDIO_OUTPUT_SAMPLE_RATE", "0"))
+    return AudioConditioner(
+        trim_silence=os.getenv("PIPECAT_AUDIO_TRIM_SILENCE", "true").lower() == "true",
+        silence_dbfs=float(os.getenv("PIPECAT_AUDIO_SILENCE_DBFS", "-50")),
+        target_dbfs=None if target.lower() == "off" else float(target),
+        max_gain=float(os.getenv("PIPECAT_AUDIO_MAX_GAIN", "4")),
+        output_rate=output_rate or None,
+    )
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+import asyncio
+import copy
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+from pipecat_bot_supervisor import BotSupervisor, ManagedProcess
+from pipecat_worker_pool import BOT_SCRIPT, BotJob, emit_event
+
+logger = logging.getLogger(__name__)
+
+
+class SharedBotResources:
+    """Read-only models and pooled clients shared by every session in a host process"""
+
+    def __init__(self, vad_template):
+        # One loaded Silero model; sessions get their own recurrent state on top of it
+        self._vad_template = vad_template
+        self._openai_clients: Dict[Tuple[str, Optional[str]], object] = {}
+        self._http_session: Optional[aiohttp.ClientSession] = None
+
+    def vad_analyzer(self):
+        """Per-session VAD analyzer that reuses the template's ONNX inference session"""
+        analyzer = copy.copy(self._vad_template)
+        model = getattr(analyzer, "_model", None)
+        if model is not None:
+            analyzer._model = copy.copy(model)
+            analyzer._model.reset_states()
+        return analyzer
+
+    def openai_client(self, api_key: str, base_url: Optional[str] = None):
+        """Pooled OpenAI-compatible client, one per (key, endpoint) for the whole host"""
+        key = (api_key, base_url)
+        if key not in self._openai_clients:
+            from openai import AsyncOpenAI
+
+            self._openai_clients[key] = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        return self._openai_clients[key]
+
+    @property
+    def http_session(self) -> aiohttp.ClientSession:
+        """Keep-alive HTTP session for plain REST calls made by sessions"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+            )
+        return self._http_session
+
+    async def close(self):
+        for client in self._openai_clients.values():
+            await client.close()
+        self._openai_clients.clear()
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
+
+
+class BotHost:
+    """Runs many bot sessions as asyncio tasks inside one process (host side)"""
+
+    def __init__(self, session_factory: Callable[[BotJob], Awaitable[None]]):
+        self.session_factory = session_factory
+        self.sessions: Dict[str, asyncio.Task] = {}
+
+    def _start_session(self, session_id: str, job: BotJob):
+        task = asyncio.create_task(self.session_factory(job))
+        self.sessions[session_id] = task
+        task.add_done_callback(lambda t: self._session_done(session_id, t))
+        logger.info(f"🏠 Host started session {session_id} ({len(self.sessions)} active)")
+        emit_event("started", session_id=session_id)
+
+    def _session_done(self, session_id: str, task: asyncio.Task):
+        self.sessions.pop(session_id, None)
+        error = None
+        if not task.cancelled() and task.exception():
+            error = str(task.exception())
+            logger.error(f"❌ Host session {session_id} failed: {error}")
+        emit_event("ended", session_id=session_id, error=error)
+
+    async def run(self):
+        """Read session commands from stdin until the manager closes the pipe"""
+        loop = asyncio.get_running_loop()
+        emit_event("ready", pid=os.getpid())
+
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            try:
+                command = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"⚠️ Ignoring malformed host command: {line!r}")
+                continue
+
+            session_id = str(command.get("session_id"))
+            if command.get("op") == "start":
+                self._start_session(session_id, BotJob.decode(json.dumps(command["job"])))
+            elif command.get("op") == "stop" and session_id in self.sessions:
+                self.sessions[session_id].cancel()
+
+        logger.info("👋 Host command channel closed, stopping all sessions")
+        for task in list(self.sessions.values()):
+            task.cancel()
+        await asyncio.gather(*self.sessions.values(), return_exceptions=True)
+
+
+@dataclass
+class HostProcess:
+    managed: ManagedProcess
+    ready: bool = False
+    sessions: Set[str] = field(default_factory=set)
+
+    @property
+    def process(self) -> asyncio.subprocess.Process:
+        return self.managed.process
+
+    @property
+    def alive(self) -> bool:
+        return self.managed.alive
+
+    @property
+    def load(self) -> int:
+        return len(self.sessions)
+
+    def send(self, command: Dict):
+        self.process.stdin.write((json.dumps(command) + "\n").encode())
+
+
+class BotHostPool:
+    """Keeps one multi-session host per CPU core and places sessions on the least-loaded one"""
+
+    def __init__(
+        self,
+        supervisor: BotSupervisor,
+        host_count: Optional[int] = None,
+        on_session_ended: Optional[Callable[[str], None]] = None,
+    ):
+        self.supervisor = supervisor
+        self.host_count = host_count or os.cpu_count() or 1
+        self.on_session_ended = on_session_ended
+        self.hosts: List[HostProcess] = []
+
+    async def _spawn_host(self) -> HostProcess:
+        host: Optional[HostProcess] = None
+
+        def on_stdout_line(line: str) -> bool:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                return False
+            if not isinstance(event, dict) or "event" not in event:
+                return False
+            self._handle_event(host, event)
+            return True
+
+        managed = await self.supervisor.spawn(
+            [sys.executable, BOT_SCRIPT, "--host"],
+            name="bot host",
+            on_stdout_line=on_stdout_line,
+        )
+        host = HostProcess(managed=managed)
+        managed.on_exit.append(lambda _: self._host_exited(host))
+        logger.info(f"🏠 Spawned bot host {managed.pid}")
+        return host
+
+    def _handle_event(self, host: HostProcess, event: Dict):
+        """Track session lifecycle events reported by a host"""
+        if event["event"] == "ready":
+            host.ready = True
+            logger.info(f"✅ Bot host {host.process.pid} ready")
+        elif event["event"] == "ended":
+            self._session_ended(host, event.get("session_id"))
+
+    def _session_ended(self, host: HostProcess, session_id: str):
+        host.sessions.discard(session_id)
+        if self.on_session_ended:
+            self.on_session_ended(session_id)
+
+    def _host_exited(self, host: HostProcess):
+        if host.sessions:
+            logger.warning(f"⚠️ Bot host {host.process.pid} exited with {host.load} sessions")
+        for session_id in list(host.sessions):
+            self._session_ended(host, session_id)
+
+    async def start(self):
+        for _ in range(self.host_count):
+            self.hosts.append(await self._spawn_host())
+        logger.info(f"🏠 Bot host pool started ({self.host_count} hosts)")
+
+    async def stop(self):
+        """Close every host's command channel, then stop them in parallel"""
+        for host in self.hosts:
+            if host.alive:
+                host.process.stdin.close()
+        await asyncio.gather(*(self.supervisor.terminate(h.managed, timeout=5) for h in self.hosts))
+        self.hosts.clear()
+
+    async def _least_loaded(self) -> HostProcess:
+        # Replace hosts that died so capacity stays at one per core
+        for index, host in enumerate(self.hosts):
+            if not host.alive:
+                self.hosts[index] = await self._spawn_host()
+        return min(self.hosts, key=lambda h: (not h.ready, h.load))
+
+    async def place(self, job: BotJob, session_id: str) -> HostProcess:
+        """Start a session on the least-loaded host and return that host"""
+        host = await self._least_loaded()
+        host.sessions.add(session_id)
+        host.send({"op": "start", "session_id": session_id, "job": job.__dict__})
+        await host.process.stdin.drain()
+        logger.info(f"📍 Placed session {session_id} on host {host.process.pid} (load {host.load})")
+        return host
+
+    async def stop_session(self, host: HostProcess, session_id: str):
+        if host.alive:
+            host.send({"op": "stop", "session_id": session_id})
+            await host.process.stdin.drain()
+        host.sessions.discard(session_id)
+
+    def stats(self) -> Dict:
+        return {
+            "hosts": [
+                {"pid": h.process.pid, "ready": h.ready, "alive": h.alive, "sessions": h.load}
+                for h in self.hosts
+            ],
+            "total_sessions": sum(h.load for h in self.hosts),
+        }
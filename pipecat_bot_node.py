@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+import aiohttp
+from fastapi import APIRouter, FastAPI, HTTPException, Request, WebSocket
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from pipecat_admission import AdmissionRejected, admission_from_env
+from pipecat_bot_host import BotHostPool, HostProcess
+from pipecat_bot_supervisor import BotSupervisor, ManagedProcess
+from pipecat_metrics import OUTCOME_COUNTERS, TurnLatencyMetrics
+from pipecat_session_registry import NodeRecord, SessionRecord, SessionRegistry, open_registry
+from pipecat_worker_pool import BOT_SCRIPT, BotJob, BotWorkerPool
+from pipecat_ws_relay import is_relay_room, relay_socket_path, relay_websocket
+
+logger = logging.getLogger(__name__)
+
+NODE_API_PREFIX = "/node/v1"
+
+# A graceful shutdown leaves process-mode bots running for the node's next process to adopt;
+# set this to stop them instead
+STOP_BOTS_ON_SHUTDOWN = os.getenv("PIPECAT_STOP_BOTS_ON_SHUTDOWN", "false").lower() == "true"
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def is_bot_process(pid: int) -> bool:
+    """Guards adoption against a recycled pid now belonging to something else"""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return os.path.basename(BOT_SCRIPT).encode() in f.read()
+    except OSError:
+        return False
+
+
+@dataclass
+class BotProcess:
+    bot_id: str
+    room_url: str
+    # None for a bot adopted from a previous node process: it keeps running, but its
+    # output pipes died with that process
+    process: Optional[ManagedProcess] = None
+    pid: int = 0
+    access_token: Optional[str] = None
+    user_id: Optional[str] = None
+    host: Optional[HostProcess] = None  # Set when the session runs inside a shared bot host
+    started_at: float = 0.0
+
+    @property
+    def running(self) -> bool:
+        if self.host:
+            return self.host.alive and self.bot_id in self.host.sessions
+        if self.process is None:
+            # An adopted bot is no child of ours; once it exits it may linger as a zombie
+            return pid_alive(self.pid) and is_bot_process(self.pid)
+        return self.process.alive
+
+    def record(self, node_id: str) -> SessionRecord:
+        return SessionRecord(
+            bot_id=self.bot_id,
+            node_id=node_id,
+            room_url=self.room_url,
+            pid=self.pid,
+            user_id=self.user_id,
+            has_access_token=bool(self.access_token),
+            started_at=self.started_at,
+        )
+
+
+class BotNode:
+    """Owns the bot processes on one machine and reports them to the session registry
+
+    The node admits, starts and stops sessions; managers only place sessions on nodes and
+    look them up in the registry, so they hold no state of their own.
+    """
+
+    def __init__(
+        self,
+        registry: SessionRegistry,
+        node_id: Optional[str] = None,
+        url: str = "",
+        mode: str = "process",
+        heartbeat_interval: float = 2.0,
+    ):
+        self.registry = registry
+        self.node_id = node_id or socket.gethostname()
+        self.url = url
+        self.mode = mode
+        self.heartbeat_interval = heartbeat_interval
+        self.sessions: Dict[str, BotProcess] = {}
+
+        # Owns every bot child process: output draining, reaping and parallel shutdown
+        self.supervisor = BotSupervisor()
+
+        # Per-turn stage latencies reported by bots over their stdout event channel
+        self.turn_metrics = TurnLatencyMetrics()
+        self.supervisor.event_handlers["turn_metrics"] = lambda managed, event: self.turn_metrics.observe(event)
+        for outcome_event in OUTCOME_COUNTERS:
+            self.supervisor.event_handlers[outcome_event] = (
+                lambda managed, event: self.turn_metrics.observe_outcome(event["event"], event["outcome"])
+            )
+
+        # Pre-warmed bot workers (0 disables pre-warming; every session then starts cold)
+        self.worker_pool = BotWorkerPool(self.supervisor, size=int(os.getenv("PIPECAT_WORKER_POOL_SIZE", "2")))
+
+        # Multi-session bot hosts, one per CPU core unless PIPECAT_HOST_COUNT says otherwise
+        self.host_pool = BotHostPool(
+            self.supervisor,
+            host_count=int(os.getenv("PIPECAT_HOST_COUNT", "0")) or None,
+            on_session_ended=self._session_ended,
+        )
+
+        # Admits new sessions against live host CPU, load and memory and the bot count
+        self.admission = admission_from_env(
+            lambda: [bot.pid for bot in self.sessions.values()],
+            lambda: len(self.sessions),
+        )
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._registry_tasks: Set[asyncio.Task] = set()
+
+    def _session_ended(self, bot_id: str):
+        if self.sessions.pop(bot_id, None):
+            # Called from exit callbacks; a failed removal is repaired by the next heartbeat
+            task = asyncio.create_task(self.registry.remove_session(bot_id))
+            self._registry_tasks.add(task)
+            task.add_done_callback(self._registry_tasks.discard)
+            self.admission.notify()
+
+    async def _adopt(self):
+        """Keep sessions a previous process of this node left running; forget the rest"""
+        for record in await self.registry.sessions(self.node_id):
+            # Host sessions stop with their host once its command pipe closes
+            if self.mode == "process" and pid_alive(record.pid) and is_bot_process(record.pid):
+                self.sessions[record.bot_id] = BotProcess(
+                    bot_id=record.bot_id,
+                    room_url=record.room_url,
+                    pid=record.pid,
+                    user_id=record.user_id,
+                    started_at=record.started_at,
+                )
+                logger.info(f"🧲 Adopted running bot {record.bot_id} (pid {record.pid})")
+            else:
+                await self.registry.remove_session(record.bot_id)
+
+    async def heartbeat(self, accepting: bool = True):
+        """Publish capacity and re-sync this node's sessions in the registry"""
+        for bot in [b for b in self.sessions.values() if b.process is None and not b.running]:
+            # Adopted bots have no exit callback; notice them ending here
+            self._session_ended(bot.bot_id)
+        headroom, _ = self.admission.headroom()
+        await self.registry.sync_node(
+            NodeRecord(
+                node_id=self.node_id,
+                url=self.url,
+                headroom=headroom if accepting else 0,
+                active_sessions=len(self.sessions),
+                accepting=accepting and headroom > 0,
+            ),
+            [bot.record(self.node_id) for bot in self.sessions.values()],
+        )
+
+    async def _heartbeat_loop(self):
+        while True:
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                logger.warning(f"⚠️ Node heartbeat failed: {e}")
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def start(self):
+        """Adopt surviving bots, start the worker pool or the bot hosts, then begin heartbeats"""
+        await self.admission.sampler.start()
+        await self._adopt()
+        if self.mode == "host":
+            await self.host_pool.start()
+        else:
+            await self.worker_pool.start()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        logger.info(f"🖥️ Bot node {self.node_id} started ({self.mode} mode, {len(self.sessions)} adopted)")
+
+    async def stop(self, detach: bool = False):
+        """Stop every bot on this node and take the node out of the registry
+
+        With `detach` (process mode), running bots are left running and registered, and the
+        node's next process adopts them; only idle pool workers are stopped. Host sessions
+        end with their host, so host mode always stops them.
+        """
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+
+        await self.admission.sampler.stop()
+        await asyncio.gather(self.worker_pool.stop(), self.host_pool.stop())
+
+        if detach and self.mode == "process":
+            # Final sync: nothing is placed here until the next process heartbeats again
+            await self.heartbeat(accepting=False)
+            logger.info(f"🧲 Leaving {len(self.sessions)} bots running for node {self.node_id} to adopt")
+            self.sessions.clear()
+            return
+
+        # Whatever is left is a running bot; stop them all in parallel
+        await self.supervisor.stop_all(timeout=3)
+        for bot in self.sessions.values():
+            if bot.process is None and pid_alive(bot.pid):
+                os.kill(bot.pid, signal.SIGTERM)
+
+        self.sessions.clear()
+        await self.registry.remove_node(self.node_id)
+
+    async def start_session(self, job: BotJob) -> BotProcess:
+        """Admit and start one session; raises AdmissionRejected while the node is full"""
+        await self.admission.acquire()
+        try:
+            bot_id = uuid.uuid4().hex
+            bot = BotProcess(
+                bot_id=bot_id,
+                room_url=job.room_url,
+                access_token=job.access_token,
+                user_id=job.user_id,
+                started_at=time.time(),
+            )
+            if self.mode == "host":
+                bot.host = await self.host_pool.place(job, bot_id)
+                bot.process = bot.host.managed
+            else:
+                bot.process = await self.worker_pool.launch(job.room_url, job.token, job.access_token, job.user_id)
+                # The supervisor calls this when the process exits
+                bot.process.on_exit.append(lambda managed: self._session_ended(bot_id))
+            bot.pid = bot.process.pid
+            self.sessions[bot_id] = bot
+            await self.registry.add_session(bot.record(self.node_id))
+        finally:
+            # Started or failed, the session no longer holds a starting slot
+            self.admission.release()
+
+        logger.info(f"🚀 Started bot {bot_id} (pid {bot.pid}) for room {job.room_url}")
+        return bot
+
+    async def stop_session(self, bot_id: str) -> bool:
+        """Stop one session; False if this node doesn't run it"""
+        bot = self.sessions.get(bot_id)
+        if bot is None:
+            return False
+        if bot.host:
+            await self.host_pool.stop_session(bot.host, bot_id)
+        elif bot.process is None:
+            if pid_alive(bot.pid):
+                os.kill(bot.pid, signal.SIGTERM)
+        else:
+            await self.supervisor.terminate(bot.process, timeout=5)
+
+        self._session_ended(bot_id)
+        logger.info(f"🛑 Stopped bot session {bot_id}")
+        return True
+
+    async def follow_logs(self, bot_id: str, tail: int = 100, follow: bool = False) -> AsyncIterator[str]:
+        """A session's recent output; host sessions share their host's output"""
+        bot = self.sessions[bot_id]
+        if bot.process is None:
+            yield "(output unavailable: bot adopted from a previous node process)"
+            return
+        async for line in self.supervisor.follow_logs(bot.process, tail=tail, follow=follow):
+            yield line
+
+    def stats(self) -> Dict:
+        return {
+            "node_id": self.node_id,
+            "bot_mode": self.mode,
+            "active_bots": len(self.sessions),
+            "worker_pool": self.worker_pool.stats(),
+            "bot_hosts": self.host_pool.stats() if self.mode == "host" else None,
+            "capacity": self.admission.stats(),
+            "turn_latency": self.turn_metrics.summary(),
+            "llm_speculation": self.turn_metrics.outcomes.get("speculation", {}),
+            "tts_cache": self.turn_metrics.outcomes.get("tts_cache", {}),
+            "provider_failover": self.turn_metrics.outcomes.get("provider_failover", {}),
+            "llm_hedge": self.turn_metrics.outcomes.get("llm_hedge", {}),
+            "endpointing": self.turn_metrics.endpointing_summary(),
+        }
+
+
+def create_node_router(node: BotNode) -> APIRouter:
+    """The API managers use to start, stop and inspect sessions on this node"""
+    router = APIRouter(prefix=NODE_API_PREFIX)
+
+    @router.post("/sessions")
+    async def start_session(request: Request):
+        try:
+            bot = await node.start_session(BotJob.decode(await request.body()))
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Node at capacity: {e.reason}",
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        return {"bot_id": bot.bot_id, "node_id": node.node_id, "pid": bot.pid}
+
+    @router.delete("/sessions/{bot_id}")
+    async def stop_session(bot_id: str):
+        if not await node.stop_session(bot_id):
+            raise HTTPException(status_code=404, detail="Bot session not found")
+        return {"status": "stopped", "bot_id": bot_id}
+
+    @router.get("/sessions")
+    async def list_sessions():
+        return {"node_id": node.node_id, "sessions": list(node.sessions)}
+
+    @router.get("/sessions/{bot_id}/logs")
+    async def stream_logs(bot_id: str, tail: int = 100, follow: bool = False):
+        if bot_id not in node.sessions:
+            raise HTTPException(status_code=404, detail="Bot session not found")
+
+        async def lines():
+            async for line in node.follow_logs(bot_id, tail=tail, follow=follow):
+                yield line + "\n"
+
+        return StreamingResponse(lines(), media_type="text/plain")
+
+    @router.websocket("/sessions/{bot_id}/audio")
+    async def session_audio(websocket: WebSocket, bot_id: str):
+        # WebSocket sessions only: the client's PCM goes to the bot's socket and back untouched
+        bot = node.sessions.get(bot_id)
+        if bot is None or not is_relay_room(bot.room_url):
+            await websocket.close(code=4404)
+            return
+        await websocket.accept()
+        await relay_websocket(websocket, relay_socket_path(bot.room_url))
+
+    @router.get("/health")
+    async def health():
+        return node.stats()
+
+    @router.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        return node.turn_metrics.render_prometheus({
+            "finley_active_bots": len(node.sessions),
+            "finley_worker_pool_ready": node.worker_pool.stats()["ready"],
+            "finley_capacity_headroom_sessions": node.admission.headroom()[0],
+        })
+
+    return router
+
+
+class BotCluster:
+    """Manager-side view of the nodes: placement, stop and logs by bot id
+
+    Sessions go to the live node with the most headroom. A node that turns the session away
+    (429), fails to start the bot, times out or can't be reached is skipped for the next one. Calls to a node running in the
+    manager's own process skip HTTP.
+    """
+
+    def __init__(self, registry: SessionRegistry, local_node: Optional[BotNode] = None, node_ttl: float = 10.0):
+        self.registry = registry
+        self.local_node = local_node
+        self.node_ttl = node_ttl
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self._session
+
+    def _is_local(self, node_id: str) -> bool:
+        return self.local_node is not None and node_id == self.local_node.node_id
+
+    async def live_nodes(self) -> List[NodeRecord]:
+        """Nodes with a fresh heartbeat, best placement first"""
+        cutoff = time.time() - self.node_ttl
+        nodes = [n for n in await self.registry.nodes() if n.heartbeat_at >= cutoff]
+        return sorted(nodes, key=lambda n: (not n.accepting, -n.headroom, n.active_sessions))
+
+    async def sweep(self):
+        """Drop nodes that stopped heartbeating, and with them their sessions"""
+        cutoff = time.time() - self.node_ttl
+        for node in await self.registry.nodes():
+            if node.heartbeat_at < cutoff and not self._is_local(node.node_id):
+                logger.warning(f"⚠️ Node {node.node_id} missed its heartbeats, dropping its sessions")
+                await self.registry.remove_node(node.node_id)
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.node_ttl)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning(f"⚠️ Node sweep failed: {e}")
+
+    async def start(self):
+        """Pick up whatever the registry already knows, then keep it free of dead nodes"""
+        await self.sweep()
+        logger.info(
+            f"🗂️ Cluster has {len(await self.live_nodes())} live nodes and "
+            f"{len(await self.registry.sessions())} running sessions"
+        )
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def close(self):
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def _start_on(self, node: NodeRecord, job: BotJob) -> Dict:
+        if self._is_local(node.node_id):
+            bot = await self.local_node.start_session(job)
+            return {"bot_id": bot.bot_id, "node_id": node.node_id, "pid": bot.pid}
+        async with self.session().post(f"{node.url}{NODE_API_PREFIX}/sessions", data=job.encode()) as response:
+            if response.status == 429:
+                raise AdmissionRejected(
+                    (await response.json()).get("detail", "node at capacity"),
+                    int(response.headers.get("Retry-After", "5")),
+                )
+            if response.status != 200:
+                raise RuntimeError(f"Node {node.node_id} failed to start the bot: {await response.text()}")
+            return await response.json()
+
+    async def start_session(self, job: BotJob) -> Dict:
+        """Place a session on the best live node; raises AdmissionRejected when all are full"""
+        nodes = await self.live_nodes()
+        if not nodes:
+            raise AdmissionRejected("no bot nodes registered", 5)
+
+        retry_after = None
+        for node in nodes:
+            try:
+                started = await self._start_on(node, job)
+            except AdmissionRejected as e:
+                retry_after = min(retry_after or e.retry_after, e.retry_after)
+                continue
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"⚠️ Node {node.node_id} unreachable: {e!r}")
+                continue
+            except RuntimeError as e:
+                logger.warning(f"⚠️ {e}, trying the next node")
+                continue
+            # Spread concurrent placements from other managers until the node's next heartbeat
+            await self.registry.reserve(node.node_id)
+            logger.info(f"📍 Placed bot {started['bot_id']} on node {node.node_id}")
+            return {**started, "node_url": node.url}
+
+        raise AdmissionRejected("every bot node is at capacity", retry_after or 5)
+
+    async def stop_session(self, bot_id: str) -> bool:
+        """Stop a session on whichever node runs it; False if no node does"""
+        record = await self.registry.get_session(bot_id)
+        if record is None:
+            return False
+        if self._is_local(record.node_id):
+            return await self.local_node.stop_session(bot_id)
+
+        node = await self.registry.get_node(record.node_id)
+        if node is None:
+            await self.registry.remove_session(bot_id)
+            return False
+        async with self.session().delete(f"{node.url}{NODE_API_PREFIX}/sessions/{bot_id}") as response:
+            if response.status == 404:
+                # The node no longer runs it; its next heartbeat would drop the row anyway
+                await self.registry.remove_session(bot_id)
+                return False
+            if response.status != 200:
+                raise RuntimeError(f"Node {node.node_id} failed to stop {bot_id}: {await response.text()}")
+        return True
+
+    async def follow_logs(self, record: SessionRecord, tail: int = 100, follow: bool = False) -> AsyncIterator[str]:
+        if self._is_local(record.node_id):
+            async for line in self.local_node.follow_logs(record.bot_id, tail=tail, follow=follow):
+                yield line
+            return
+
+        node = await self.registry.get_node(record.node_id)
+        if node is None:
+            return
+        # Followed logs can stay open for the whole call
+        async with self.session().get(
+            f"{node.url}{NODE_API_PREFIX}/sessions/{record.bot_id}/logs",
+            params={"tail": str(tail), "follow": str(follow).lower()},
+            timeout=aiohttp.ClientTimeout(total=None),
+        ) as response:
+            async for raw in response.content:
+                yield raw.decode(errors="replace").rstrip("\n")
+
+    async def stats(self) -> Dict:
+        nodes = await self.registry.nodes()
+        cutoff = time.time() - self.node_ttl
+        live = {n.node_id for n in nodes if n.heartbeat_at >= cutoff}
+        return {
+            "nodes": [
+                {
+                    "node_id": n.node_id,
+                    "url": n.url,
+                    "live": n.node_id in live,
+                    "accepting": n.accepting,
+                    "headroom": n.headroom,
+                    "active_sessions": n.active_sessions,
+                    "heartbeat_age_s": round(time.time() - n.heartbeat_at, 1),
+                }
+                for n in nodes
+            ],
+            "accepting": any(n.accepting for n in nodes if n.node_id in live),
+            "headroom": sum(max(0, n.headroom) for n in nodes if n.node_id in live),
+        }
+
+
+def create_node_app(node: BotNode) -> FastAPI:
+    """Standalone node: the node API plus the node's lifecycle"""
+    app = FastAPI(title="Finley Bot Node", version="1.0.0")
+    app.include_router(create_node_router(node))
+    app.on_event("startup")(node.start)
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        await node.stop(detach=not STOP_BOTS_ON_SHUTDOWN)
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description="Finley bot node: runs bots for one or more managers")
+    parser.add_argument("--port", type=int, default=7870)
+    parser.add_argument("--node-id", type=str, default=os.getenv("PIPECAT_NODE_ID"),
+                        help="Stable id; a restarted node re-adopts the bots it left running (default: hostname)")
+    parser.add_argument("--advertise-url", type=str, default=os.getenv("PIPECAT_NODE_URL"),
+                        help="URL managers use to reach this node (default: http://<hostname>:<port>)")
+    parser.add_argument("--registry", type=str, default=os.getenv("PIPECAT_REGISTRY_URL"),
+                        help="Session registry URL (default: a SQLite file in the temp directory)")
+    args = parser.parse_args()
+
+    registry = open_registry(args.registry) if args.registry else open_registry()
+    node = BotNode(
+        registry,
+        node_id=args.node_id,
+        url=args.advertise_url or f"http://{socket.gethostname()}:{args.port}",
+        mode=os.getenv("PIPECAT_BOT_MODE", "process"),
+    )
+    uvicorn.run(create_node_app(node), host="0.0.0.0", port=args.port, log_level="info")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lines kept per process for /api/v1/bots/{bot_id}/logs
+LOG_BUFFER_LINES = int(os.getenv("PIPECAT_BOT_LOG_LINES", "500"))
+# Lines a log follower may fall behind by before it is disconnected
+LOG_FOLLOW_LAG_LINES = int(os.getenv("PIPECAT_BOT_LOG_FOLLOW_LAG", "1000"))
+FOLLOWER_DROPPED_LINE = "[log follow stopped: the reader fell behind, reconnect to resume]"
+
+
+@dataclass
+class ManagedProcess:
+    process: asyncio.subprocess.Process
+    name: str
+    logs: Deque[str] = field(default_factory=lambda: deque(maxlen=LOG_BUFFER_LINES))
+    started_at: float = field(default_factory=time.time)
+    # Returns True when a stdout line was a control message rather than log output
+    on_stdout_line: Optional[Callable[[str], bool]] = None
+    on_exit: List[Callable[["ManagedProcess"], None]] = field(default_factory=list)
+    _followers: List[asyncio.Queue] = field(default_factory=list)
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    def _append_log(self, line: str):
+        self.logs.append(line)
+        for queue in list(self._followers):
+            if queue.qsize() < LOG_FOLLOW_LAG_LINES:
+                queue.put_nowait(line)
+            else:
+                # The two slots kept free past the lag limit end the stream with a notice
+                self._followers.remove(queue)
+                queue.put_nowait(FOLLOWER_DROPPED_LINE)
+                queue.put_nowait(None)
+
+
+class BotSupervisor:
+    """Owns every bot child process: drains its output, reaps it and stops it without blocking"""
+
+    def __init__(self):
+        self.processes: Dict[int, ManagedProcess] = {}
+        # JSON event lines ({"event": name, ...}) on a child's stdout are routed here by name
+        self.event_handlers: Dict[str, Callable[[ManagedProcess, Dict], None]] = {}
+
+    async def spawn(
+        self,
+        args: List[str],
+        name: str,
+        on_stdout_line: Optional[Callable[[str], bool]] = None,
+    ) -> ManagedProcess:
+        """Start a child with piped stdio and begin draining and watching it"""
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=os.environ.copy()
+        )
+        managed = ManagedProcess(process=process, name=name, on_stdout_line=on_stdout_line)
+        self.processes[process.pid] = managed
+        asyncio.create_task(self._watch(managed))
+        return managed
+
+    async def _drain(self, managed: ManagedProcess, stream: asyncio.StreamReader, source: str):
+        """Read a pipe to EOF so a chatty child never blocks on a full buffer"""
+        while True:
+            raw = await stream.readline()
+            if not raw:
+                break
+            line = raw.decode(errors="replace").rstrip("\n")
+            if source == "stdout" and (self._dispatch_event(managed, line) or (
+                managed.on_stdout_line and managed.on_stdout_line(line)
+            )):
+                continue
+            managed._append_log(line)
+
+    def _dispatch_event(self, managed: ManagedProcess, line: str) -> bool:
+        """Hand a JSON event line to its registered handler; False if nobody claims it"""
+        if not line.startswith("{"):
+            return False
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return False
+        handler = self.event_handlers.get(event.get("event")) if isinstance(event, dict) else None
+        if handler is None:
+            return False
+        try:
+            handler(managed, event)
+        except Exception as e:
+            logger.error(f"❌ Handler for {event['event']} event from {managed.pid} failed: {e}")
+        return True
+
+    async def _watch(self, managed: ManagedProcess):
+        """Drain both pipes, then reap the process and notify listeners"""
+        await asyncio.gather(
+            self._drain(managed, managed.process.stdout, "stdout"),
+            self._drain(managed, managed.process.stderr, "stderr"),
+        )
+        returncode = await managed.process.wait()
+        self.processes.pop(managed.pid, None)
+        for queue in managed._followers:
+            queue.put_nowait(None)
+
+        logger.info(f"⚰️ Reaped {managed.name} {managed.pid} (exit code {returncode})")
+        for callback in managed.on_exit:
+            try:
+                callback(managed)
+            except Exception as e:
+                logger.error(f"❌ Exit callback for {managed.pid} failed: {e}")
+
+    async def terminate(self, managed: ManagedProcess, timeout: float = 5.0):
+        """SIGTERM, then SIGKILL if the process outlives the timeout"""
+        if not managed.alive:
+            return
+        try:
+            managed.process.terminate()
+            await asyncio.wait_for(managed.process.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ {managed.name} {managed.pid} ignored SIGTERM, killing")
+            managed.process.kill()
+            await managed.process.wait()
+        except ProcessLookupError:
+            pass
+
+    async def stop_all(self, timeout: float = 3.0):
+        """Stop every child in parallel"""
+        await asyncio.gather(
+            *(self.terminate(managed, timeout) for managed in list(self.processes.values())),
+            return_exceptions=True,
+        )
+
+    async def follow_logs(self, managed: ManagedProcess, tail: int = 100, follow: bool = True) -> AsyncIterator[str]:
+        """Yield the last `tail` buffered lines, then new lines until the process exits"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=LOG_FOLLOW_LAG_LINES + 2)
+        if follow and managed.alive:
+            managed._followers.append(queue)
+        try:
+            for line in list(managed.logs)[-tail:] if tail else []:
+                yield line
+            if not follow or not managed.alive:
+                return
+            while True:
+                line = await queue.get()
+                if line is None:
+                    return
+                yield line
+        finally:
+            if queue in managed._followers:
+                managed._followers.remove(queue)
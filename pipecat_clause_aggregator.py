@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import re
+from dataclasses import dataclass, fields, replace
+from typing import List, Optional, Tuple
+
+# Words whose trailing period doesn't end a sentence
+ABBREVIATIONS = {"mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "etc.", "e.g.", "i.e.", "approx.", "no."}
+
+SENTENCE_END = (".", "!", "?")
+
+
+@dataclass(frozen=True)
+class FlushPolicy:
+    """When buffered LLM text is handed to TTS
+
+    Sentence ends always flush. Within a sentence, text flushes after a clause mark or before
+    a conjunction once `min_words` words are buffered, and unconditionally at `max_words`.
+    The first chunk of each reply uses its own, smaller thresholds so speech starts sooner.
+    """
+    first_min_words: int = 3
+    first_max_words: int = 8
+    min_words: int = 5
+    max_words: int = 20
+    clause_marks: str = ",;:"
+    conjunctions: Tuple[str, ...] = ("and", "but", "so", "because", "or", "which", "then", "while")
+
+
+FLUSH_POLICIES = {
+    # Whole sentences only, like TTS sentence aggregation
+    "sentence": FlushPolicy(first_min_words=1, first_max_words=60, min_words=1, max_words=60,
+                            clause_marks="", conjunctions=()),
+    "clause": FlushPolicy(),
+    # Speak after a couple of words; more chunks, slightly choppier prosody
+    "eager": FlushPolicy(first_min_words=2, first_max_words=4, min_words=3, max_words=12),
+}
+
+
+def parse_flush_policy(spec: str) -> FlushPolicy:
+    """Preset name with optional overrides, e.g. "clause" or "clause:first_max_words=5,min_words=4" """
+    name, _, overrides = spec.partition(":")
+    if name not in FLUSH_POLICIES:
+        raise ValueError(f"Unknown flush policy '{name}', use one of {list(FLUSH_POLICIES)}")
+    policy = FLUSH_POLICIES[name]
+    if not overrides:
+        return policy
+
+    types = {f.name: f.type for f in fields(FlushPolicy)}
+    changes = {}
+    for item in overrides.split(","):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key not in types:
+            raise ValueError(f"Unknown flush policy setting '{key}'")
+        if key == "conjunctions":
+            changes[key] = tuple(w for w in value.split("|") if w)
+        elif key == "clause_marks":
+            changes[key] = value
+        else:
+            changes[key] = int(value)
+    return replace(policy, **changes)
+
+
+class ClauseChunker:
+    """Splits streamed LLM text into speakable chunks according to a FlushPolicy
+
+    A word only counts once whitespace follows it, so "1,234" or "$12.50" are never split
+    at their punctuation while the next token is still on its way.
+    """
+
+    def __init__(self, policy: FlushPolicy = FlushPolicy()):
+        self.policy = policy
+        self.reset()
+
+    def reset(self):
+        self._buffer = ""
+        self._first = True
+
+    def _cut(self) -> Optional[int]:
+        """Buffer index to flush up to, or None to keep waiting"""
+        policy = self.policy
+        min_words = policy.first_min_words if self._first else policy.min_words
+        max_words = policy.first_max_words if self._first else policy.max_words
+
+        words = list(re.finditer(r"\S+\s+", self._buffer))
+        for count, match in enumerate(words, 1):
+            word = match.group().rstrip()
+            if word.endswith(SENTENCE_END) and word.lower() not in ABBREVIATIONS:
+                return match.end()
+            if count < min_words:
+                continue
+            if word[-1] in policy.clause_marks:
+                return match.end()
+            if count < len(words) and words[count].group().strip().lower().strip(",.;:") in policy.conjunctions:
+                return match.end()
+            if count >= max_words:
+                return match.end()
+        return None
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; returns chunks ready for TTS"""
+        self._buffer += text
+        chunks = []
+        while True:
+            cut = self._cut()
+            if cut is None:
+                return chunks
+            chunks.append(self._buffer[:cut])
+            self._buffer = self._buffer[cut:]
+            self._first = False
+
+    def flush(self) -> Optional[str]:
+        """End of reply: whatever is left, then start over for the next reply"""
+        remainder = self._buffer
+        self.reset()
+        return remainder if remainder.strip() else None
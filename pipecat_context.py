@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English)"""
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class Turn:
+    role: str
+    content: str
+    tokens: int
+
+    def as_message(self) -> Dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+
+Summarizer = Callable[[str, List[Turn]], Awaitable[str]]
+
+
+async def extractive_summary(previous: str, turns: List[Turn], max_chars: int = 600) -> str:
+    """Fold evicted turns into the running summary by keeping each turn's first sentence"""
+    notes = []
+    for turn in turns:
+        first_sentence = re.split(r"(?<=[.!?])\s", turn.content.strip(), maxsplit=1)[0]
+        speaker = "User" if turn.role == "user" else "Finley"
+        notes.append(f"{speaker}: {first_sentence[:160]}")
+
+    summary = " ".join(filter(None, [previous, *notes]))
+    # Oldest material falls off the front once the summary is full
+    return summary[-max_chars:]
+
+
+class ConversationMemory:
+    """Single conversation store: one entry per turn, bounded by a token budget"""
+
+    def __init__(
+        self,
+        token_budget: int = 1200,
+        max_turns: int = 40,
+        summarizer: Summarizer = extractive_summary,
+    ):
+        self.token_budget = token_budget
+        self.summarizer = summarizer
+        self.turns: Deque[Turn] = deque(maxlen=max_turns)
+        self.summary = ""
+        self._history_tokens = 0
+        self._assistant_chunks: List[str] = []
+        self._evicted: List[Turn] = []
+        self._summary_task: Optional[asyncio.Task] = None
+
+    @property
+    def history_tokens(self) -> int:
+        return self._history_tokens
+
+    def _append(self, turn: Turn):
+        if len(self.turns) == self.turns.maxlen:
+            self._evict(self.turns[0])
+        self.turns.append(turn)
+        self._history_tokens += turn.tokens
+        while self._history_tokens > self.token_budget and len(self.turns) > 1:
+            self._evict(self.turns[0])
+        self._schedule_summary()
+
+    def _evict(self, turn: Turn):
+        self.turns.remove(turn)
+        self._history_tokens -= turn.tokens
+        self._evicted.append(turn)
+
+    def _schedule_summary(self):
+        """Summarize evicted turns off the hot path; prompts use the last finished summary"""
+        if not self._evicted or (self._summary_task and not self._summary_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        batch, self._evicted = self._evicted, []
+        self._summary_task = loop.create_task(self._summarize(batch))
+
+    async def _summarize(self, batch: List[Turn]):
+        try:
+            self.summary = await self.summarizer(self.summary, batch)
+        except Exception as e:
+            logger.warning(f"⚠️ Conversation summary failed, dropping {len(batch)} turns: {e}")
+        finally:
+            # This task is still running, so clear it or the reschedule below would wait on itself
+            self._summary_task = None
+        # Turns evicted while this batch was running
+        self._schedule_summary()
+
+    def add_user(self, text: str):
+        self._append(Turn("user", text, estimate_tokens(text)))
+
+    def append_assistant(self, chunk: str):
+        """Collect one streamed piece of the assistant's reply"""
+        self._assistant_chunks.append(chunk)
+
+    def end_assistant(self) -> Optional[str]:
+        """Commit the streamed reply as a single assistant turn"""
+        text = "".join(self._assistant_chunks).strip()
+        self._assistant_chunks = []
+        if not text:
+            return None
+        self._append(Turn("assistant", text, estimate_tokens(text)))
+        return text
+
+    def messages(self, system_prompt: str) -> List[Dict[str, str]]:
+        """System prompt, running summary and the turns that fit the budget"""
+        messages = [{"role": "system", "content": system_prompt}]
+        if self.summary:
+            messages.append({"role": "system", "content": f"Earlier in this call: {self.summary}"})
+        messages.extend(turn.as_message() for turn in self.turns)
+        return messages
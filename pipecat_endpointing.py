@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+import functools
+import logging
+import math
+import os
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+
+logger = logging.getLogger(__name__)
+
+# Private VADAnalyzer state that AdaptiveVADAnalyzer reads and writes, as of pipecat 0.0.68
+VAD_ANALYZER_FIELDS = ("_init_sample_rate", "_vad_frames", "_vad_state", "_vad_stopping_count", "_vad_stop_frames")
+
+
+class AdaptiveEndpointer:
+    """Learns one speaker's pauses and picks the end-of-speech silence for their next turn
+
+    Pauses the speaker makes inside a turn, and gaps after which they carried on talking
+    although the turn had already been ended (a cut-off), are kept in a rolling window.
+    The stop threshold is the `quantile` of those pauses plus `margin_secs`, between
+    `min_stop_secs` and `max_stop_secs`; until `min_pauses` pauses are known it stays at
+    `default_stop_secs`. Word gaps shorter than `min_pause_secs` are ignored.
+    """
+
+    def __init__(
+        self,
+        default_stop_secs: float = 0.8,
+        min_stop_secs: float = 0.35,
+        max_stop_secs: float = 1.2,
+        quantile: float = 0.9,
+        margin_secs: float = 0.1,
+        min_pause_secs: float = 0.1,
+        min_pauses: int = 5,
+        window: int = 40,
+        resume_secs: float = 0.8,
+    ):
+        self.default_stop_secs = default_stop_secs
+        self.min_stop_secs = min_stop_secs
+        self.max_stop_secs = max(max_stop_secs, min_stop_secs)
+        self.quantile = quantile
+        self.margin_secs = margin_secs
+        self.min_pause_secs = min_pause_secs
+        self.min_pauses = min_pauses
+        self.resume_secs = resume_secs  # Speech this soon after an endpoint continues the turn
+        self.pauses: Deque[float] = deque(maxlen=window)
+        self.stop_secs = default_stop_secs
+        self.turns = 0
+        self.cutoffs = 0
+        self.saved_secs = 0.0  # Against default_stop_secs, over all turns
+        self.last_turn: Optional[Tuple[float, float]] = None  # (stop used, saved) of the latest endpoint
+
+    def observe_pause(self, secs: float):
+        """The speaker paused for `secs` and carried on within the same turn"""
+        if secs >= self.min_pause_secs:
+            self.pauses.append(secs)
+            self._adapt()
+
+    def end_turn(self) -> Tuple[float, float]:
+        """The current threshold just ended a turn; returns (stop used, saved against the default)"""
+        saved = self.default_stop_secs - self.stop_secs
+        self.turns += 1
+        self.saved_secs += saved
+        self.last_turn = (self.stop_secs, saved)
+        return self.last_turn
+
+    def resumed(self, gap_secs: float):
+        """Speech came back `gap_secs` after the last speech, though the turn had been ended"""
+        self.cutoffs += 1
+        self.pauses.append(gap_secs)
+        self._adapt()
+
+    def _adapt(self):
+        if len(self.pauses) < self.min_pauses:
+            return
+        ordered = sorted(self.pauses)
+        pause = ordered[min(len(ordered) - 1, math.ceil(self.quantile * len(ordered)) - 1)]
+        self.stop_secs = min(self.max_stop_secs, max(self.min_stop_secs, pause + self.margin_secs))
+
+    def stats(self) -> dict:
+        return {
+            "stop_ms": round(self.stop_secs * 1000),
+            "turns": self.turns,
+            "cutoffs": self.cutoffs,
+            "saved_ms": round(self.saved_secs * 1000),
+        }
+
+
+class AdaptiveVADAnalyzer(VADAnalyzer):
+    """Wraps a session's VAD analyzer and tunes its stop threshold to the speaker
+
+    The wrapped analyzer only scores speech; the start/stop state machine is the base
+    class's, run on one VAD window per `analyze_audio` call. This watches its transitions:
+    STOPPING back to SPEAKING is a pause inside the turn, STOPPING to QUIET ends the turn,
+    and speech confirmed within `resume_secs` of an ended turn was a cut-off. The new
+    threshold takes effect whenever the state is not STOPPING, so a pause in progress is
+    always judged against the threshold it started under.
+    """
+
+    def __init__(self, analyzer: VADAnalyzer, endpointer: Optional[AdaptiveEndpointer] = None):
+        super().__init__(sample_rate=analyzer._init_sample_rate, params=analyzer.params)
+        self.analyzer = analyzer
+        self.endpointer = endpointer or AdaptiveEndpointer(default_stop_secs=analyzer.params.stop_secs)
+        self._windows = 0          # VAD windows scored so far
+        self._gap: Optional[int] = None  # Windows since the last speech of an ended turn
+        self._resumed_at: Optional[int] = None  # Gap when speech started again
+
+    @property
+    def window_secs(self) -> float:
+        return self._vad_frames / self.sample_rate
+
+    def set_sample_rate(self, sample_rate: int):
+        self.analyzer.set_sample_rate(sample_rate)
+        super().set_sample_rate(sample_rate)
+
+    def set_params(self, params: VADParams):
+        super().set_params(params)
+        self.endpointer.default_stop_secs = params.stop_secs
+        self._apply()
+
+    def num_frames_required(self) -> int:
+        return self.analyzer.num_frames_required()
+
+    def voice_confidence(self, buffer) -> float:
+        self._windows += 1
+        return self.analyzer.voice_confidence(buffer)
+
+    def analyze_audio(self, buffer) -> VADState:
+        before, stopping, windows = self._vad_state, self._vad_stopping_count, self._windows
+        state = super().analyze_audio(buffer)
+        if self._windows == windows:
+            return state  # Not a full window yet
+
+        if before == VADState.STOPPING and state == VADState.SPEAKING:
+            self.endpointer.observe_pause(stopping * self.window_secs)
+        elif before == VADState.STOPPING and state == VADState.QUIET:
+            self.endpointer.end_turn()
+            self._gap, self._resumed_at = stopping + 1, None
+        elif self._gap is not None:
+            if before == VADState.QUIET and state != VADState.QUIET:
+                self._resumed_at = self._gap
+            if state == VADState.SPEAKING:
+                gap = self._resumed_at * self.window_secs
+                if gap <= self.endpointer.stop_secs + self.endpointer.resume_secs:
+                    self.endpointer.resumed(gap)
+                self._gap = None
+            else:
+                self._gap += 1
+                if self._gap * self.window_secs > self.endpointer.max_stop_secs + self.endpointer.resume_secs:
+                    self._gap = None  # Too long ago to be the same turn
+
+        if state != VADState.STOPPING:
+            self._apply()
+        return state
+
+    def _apply(self):
+        if self.sample_rate:
+            self._vad_stop_frames = max(1, round(self.endpointer.stop_secs / self.window_secs))
+
+
+class _ProbeVADAnalyzer(VADAnalyzer):
+    def num_frames_required(self) -> int:
+        return 512
+
+    def voice_confidence(self, buffer) -> float:
+        return 0.0
+
+
+@functools.lru_cache(maxsize=None)
+def missing_vad_analyzer_fields() -> Tuple[str, ...]:
+    """The `VAD_ANALYZER_FIELDS` this pipecat's VADAnalyzer no longer sets up"""
+    probe = _ProbeVADAnalyzer(sample_rate=16000)
+    probe.set_sample_rate(16000)
+    return tuple(name for name in VAD_ANALYZER_FIELDS if not hasattr(probe, name))
+
+
+def adaptive_vad_from_env(analyzer: VADAnalyzer) -> VADAnalyzer:
+    """`analyzer` wrapped for adaptive endpointing with PIPECAT_ADAPTIVE_ENDPOINTING=true"""
+    if os.getenv("PIPECAT_ADAPTIVE_ENDPOINTING", "false").lower() != "true":
+        return analyzer
+    missing = missing_vad_analyzer_fields()
+    if missing:
+        logger.warning(f"Adaptive endpointing disabled: this pipecat's VADAnalyzer has no {', '.join(missing)}")
+        return analyzer
+    return AdaptiveVADAnalyzer(analyzer, AdaptiveEndpointer(
+        default_stop_secs=analyzer.params.stop_secs,
+        min_stop_secs=float(os.getenv("PIPECAT_VAD_MIN_STOP_MS", "350")) / 1000,
+        max_stop_secs=float(os.getenv("PIPECAT_VAD_MAX_STOP_MS", "1200")) / 1000,
+    ))
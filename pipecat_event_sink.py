@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOG_DIR_ENV = "PIPECAT_EVENT_LOG_DIR"
+
+
+class EventSink:
+    """Session events as gzipped JSON lines, written in batches by a background thread
+
+    `emit` only appends a tuple to a deque, which is atomic in CPython, so the event loop
+    never takes a lock, formats JSON or touches the disk. The writer thread wakes every
+    `flush_interval` seconds, serializes whatever is queued and appends it to the current
+    file as one gzip member; concatenated members read back as one gzip stream, and a
+    killed process loses only the batch it had not flushed. A file is rotated once it
+    holds `max_bytes` or is `max_age` seconds old.
+
+    Past `sample_above` queued events only every `sample_every`th event is kept (marked
+    "sampled": n), and at `max_queue` events are dropped, so a writer that falls behind
+    never holds up the caller. Drop and sample counts are written as "sink_overflow"
+    events and reported by `stats()`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "events",
+        max_queue: int = 8192,
+        sample_every: int = 10,
+        flush_interval: float = 1.0,
+        max_bytes: int = 16 * 1024 * 1024,
+        max_age: float = 3600.0,
+        compresslevel: int = 5,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = re.sub(r"[^\w.-]+", "-", prefix).strip("-") or "events"
+        self.max_queue = max_queue
+        self.sample_above = max_queue // 2
+        self.sample_every = max(1, sample_every)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compresslevel = compresslevel
+
+        self._queue: Deque[Tuple[float, str, str, Dict[str, Any], int]] = deque()
+        self._skipped = 0
+        self.emitted = 0
+        self.sampled = 0
+        self.dropped = 0
+        self._reported = (0, 0)
+
+        self.written = 0
+        self.batches = 0
+        self.files = 0
+        self.bytes_written = 0
+        self.path: Optional[str] = None
+        self._file = None
+        self._file_opened = 0.0
+
+        self._stop = threading.Event()
+        self._writer = threading.Thread(target=self._run, name="event-sink", daemon=True)
+        self._writer.start()
+
+    def emit(self, session: str, event: str, data: Dict[str, Any]):
+        """Queue one event; never blocks, never raises"""
+        queued = len(self._queue)
+        if queued >= self.sample_above:
+            if queued >= self.max_queue:
+                self.dropped += 1
+                return
+            self._skipped += 1
+            if self._skipped % self.sample_every:
+                self.sampled += 1
+                return
+            self._queue.append((time.time(), session, event, data, self.sample_every))
+        else:
+            self._queue.append((time.time(), session, event, data, 1))
+        self.emitted += 1
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+        self._flush()
+        self._close_file()
+
+    def _flush(self):
+        lines = []
+        queue = self._queue
+        while queue:
+            at, session, event, data, sampled = queue.popleft()
+            record = {"ts": round(at, 6), "session": session, "event": event, **data}
+            if sampled > 1:
+                record["sampled"] = sampled
+            lines.append(json.dumps(record, default=str, separators=(",", ":")))
+            if len(lines) % 256 == 0:
+                time.sleep(0)  # Hand the GIL back to the event loop between chunks
+
+        overflow = (self.dropped, self.sampled)
+        if overflow != self._reported:
+            lines.append(json.dumps({
+                "ts": round(time.time(), 6), "event": "sink_overflow",
+                "dropped": overflow[0] - self._reported[0], "sampled": overflow[1] - self._reported[1],
+            }))
+            self._reported = overflow
+        if not lines:
+            return
+
+        try:
+            self._rotate()
+            member = gzip.compress(("\n".join(lines) + "\n").encode(), compresslevel=self.compresslevel)
+            self._file.write(member)
+            self._file.flush()
+        except OSError as e:
+            logger.warning(f"⚠️ Event sink could not write {len(lines)} events: {e}")
+            return
+        self.written += len(lines)
+        self.batches += 1
+        self.bytes_written += len(member)
+
+    def _rotate(self):
+        if self._file and (
+            self._file.tell() >= self.max_bytes or time.monotonic() - self._file_opened >= self.max_age
+        ):
+            self._close_file()
+        if self._file is None:
+            self.files += 1
+            self.path = os.path.join(
+                self.directory,
+                f"{self.prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.files}.jsonl.gz",
+            )
+            self._file = open(self.path, "ab")
+            self._file_opened = time.monotonic()
+
+    def _close_file(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """Write what is queued and stop the writer"""
+        if self._writer.is_alive():
+            self._stop.set()
+            self._writer.join()
+
+    def stats(self) -> Dict:
+        return {
+            "emitted": self.emitted,
+            "queued": len(self._queue),
+            "sampled": self.sampled,
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "files": self.files,
+            "bytes_written": self.bytes_written,
+        }
+
+
+class SessionEvents:
+    """One session's handle on the process-wide sink"""
+
+    __slots__ = ("sink", "session")
+
+    def __init__(self, sink: EventSink, session: str):
+        self.sink = sink
+        self.session = session
+
+    def emit(self, event: str, **data):
+        self.sink.emit(self.session, event, data)
+
+
+_sink: Optional[EventSink] = None
+
+
+def event_sink_from_env() -> Optional[EventSink]:
+    """The process's sink writing to PIPECAT_EVENT_LOG_DIR, or None when that isn't set"""
+    global _sink
+    directory = os.getenv(EVENT_LOG_DIR_ENV)
+    if not directory:
+        return None
+    if _sink is None:
+        if directory.lower() == "true":
+            directory = os.path.join(tempfile.gettempdir(), "finley-events")
+        _sink = EventSink(
+            directory,
+            max_queue=int(os.getenv("PIPECAT_EVENT_LOG_QUEUE", "8192")),
+            flush_interval=float(os.getenv("PIPECAT_EVENT_LOG_FLUSH_MS", "1000")) / 1000,
+            max_bytes=int(float(os.getenv("PIPECAT_EVENT_LOG_MAX_MB", "16")) * 1024 * 1024),
+            max_age=float(os.getenv("PIPECAT_EVENT_LOG_MAX_AGE", "3600")),
+        )
+        # Sessions in this process (one, or many in a bot host) share it until exit
+        atexit.register(_sink.close)
+        logger.info(f"🗒️ Session events go to {directory}")
+    return _sink
+
+
+def session_events_from_env(session: str) -> Optional[SessionEvents]:
+    sink = event_sink_from_env()
+    return SessionEvents(sink, session) if sink else None
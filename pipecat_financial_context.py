@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Node backend that serves /api/plaid/financial-summary
+BACKEND_URL = os.getenv("FINLEY_BACKEND_URL", "http://localhost:3001")
+
+
+@dataclass
+class CachedSummary:
+    data: Dict
+    fetched_at: float
+    text: str  # Prompt-ready rendering, built once per fetch
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class FinancialContextCache:
+    """Per-access-token financial summaries, prefetched and refreshed off the voice turn path"""
+
+    def __init__(
+        self,
+        backend_url: str = BACKEND_URL,
+        ttl: float = 300,
+        refresh_ahead: float = 60,
+        max_entries: int = 1024,
+        session_provider: Optional[Callable[[], aiohttp.ClientSession]] = None,
+    ):
+        self.backend_url = backend_url.rstrip("/")
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead  # Refresh this long before an entry goes stale
+        self.max_entries = max(1, max_entries)
+        self._session_provider = session_provider
+        self._own_session: Optional[aiohttp.ClientSession] = None
+        # Least recently used first; a bot host serves many tokens over its lifetime
+        self._entries: "OrderedDict[str, CachedSummary]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.evictions = 0
+
+    def _session(self) -> aiohttp.ClientSession:
+        if self._session_provider:
+            return self._session_provider()
+        if self._own_session is None or self._own_session.closed:
+            self._own_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self._own_session
+
+    async def _fetch(self, access_token: str):
+        self.fetches += 1
+        try:
+            async with self._session().post(
+                f"{self.backend_url}/api/plaid/financial-summary",
+                json={"accessToken": access_token},
+            ) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"{response.status} - {await response.text()}")
+                data = await response.json()
+            self._store(access_token, CachedSummary(data, time.monotonic(), format_financial_context(data)))
+            logger.info("💰 Financial summary cached")
+        except Exception as e:
+            self.fetch_errors += 1
+            logger.warning(f"⚠️ Financial summary fetch failed: {e}")
+        finally:
+            self._inflight.pop(access_token, None)
+
+    def _store(self, access_token: str, entry: CachedSummary):
+        self._entries[access_token] = entry
+        self._entries.move_to_end(access_token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def refresh(self, access_token: str) -> asyncio.Task:
+        """Start a background fetch unless one is already running for this token"""
+        task = self._inflight.get(access_token)
+        if task is None:
+            task = asyncio.create_task(self._fetch(access_token))
+            self._inflight[access_token] = task
+        return task
+
+    def prefetch(self, access_token: Optional[str]):
+        """Warm the cache when a bot starts so the first turn finds data in memory"""
+        if access_token and access_token not in self._entries:
+            self.refresh(access_token)
+
+    def get(self, access_token: str) -> Optional[CachedSummary]:
+        """Memory-only lookup; schedules a refresh when the entry is near or past its TTL"""
+        entry = self._entries.get(access_token)
+        if entry is None:
+            self.misses += 1
+            self.refresh(access_token)
+            return None
+
+        self._entries.move_to_end(access_token)
+        age = entry.age()
+        if age >= self.ttl:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        if age >= self.ttl - self.refresh_ahead:
+            self.refresh(access_token)
+        return entry
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "fetches": self.fetches,
+            "fetch_errors": self.fetch_errors,
+            "evictions": self.evictions,
+        }
+
+    async def close(self):
+        for task in list(self._inflight.values()):
+            task.cancel()
+        if self._own_session and not self._own_session.closed:
+            await self._own_session.close()
+
+
+def format_financial_context(data: Dict) -> str:
+    """Compact, speakable summary of /api/plaid/financial-summary for the LLM prompt"""
+    summary = data.get("summary", {})
+    lines = []
+    if summary.get("totalBalance") is not None:
+        lines.append(f"- Total balance across accounts: ${summary['totalBalance']}")
+    if summary.get("monthlySpending") is not None:
+        lines.append(
+            f"- Spending in the last 30 days: ${summary['monthlySpending']} "
+            f"over {summary.get('transactionCount', 0)} transactions"
+        )
+
+    categories = []
+    for category in summary.get("topCategories", []):
+        subcategories = ", ".join(
+            f"{s['subcategory']} ${s['amount']}" for s in category.get("subcategories", [])
+        )
+        categories.append(
+            f"{category['category']} ${category['amount']}" + (f" ({subcategories})" if subcategories else "")
+        )
+    if categories:
+        lines.append(f"- Top categories: {'; '.join(categories)}")
+
+    merchants = [f"{m['merchant']} ${m['amount']}" for m in summary.get("topMerchants", [])]
+    if merchants:
+        lines.append(f"- Top merchants: {', '.join(merchants)}")
+
+    return "\n".join(lines)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+# Per-turn marks in pipeline order; each stage is measured from the previous mark
+TURN_MARKS = [
+    "user_stopped_speaking",  # VAD end of speech
+    "transcription",          # final TranscriptionFrame
+    "llm_first_token",        # first LLM TextFrame
+    "tts_started",            # TTSStartedFrame
+    "first_audio",            # first audio frame towards the transport
+]
+
+# stage name -> (from mark, to mark, provider role)
+TURN_STAGES = {
+    "stt": ("user_stopped_speaking", "transcription", "stt"),
+    "llm": ("transcription", "llm_first_token", "llm"),
+    "tts": ("llm_first_token", "tts_started", "tts"),
+    "audio_out": ("tts_started", "first_audio", "tts"),
+    "total": ("user_stopped_speaking", "first_audio", None),
+}
+
+# Stages the bot measures itself, before the first mark: stage name -> provider role
+BOT_STAGES = {
+    "endpointing": "vad",  # Silence the VAD waited for before reporting the end of speech
+}
+
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Outcome counters bots report as events: event name -> (metric, help text)
+OUTCOME_COUNTERS = {
+    "speculation": ("finley_llm_speculation_total", "Speculative LLM responses started on interim transcripts, by outcome"),
+    "tts_cache": ("finley_tts_cache_lookups_total", "TTS phrase cache lookups for reply openings, by outcome"),
+    "provider_failover": ("finley_provider_failovers_total", "Switches away from a failing or slow provider, by kind:provider"),
+    "llm_hedge": ("finley_llm_hedge_total", "Hedged LLM requests, by which request streamed first"),
+}
+
+
+class TurnLatencyTracker:
+    """Collects stage timestamps for one conversational turn at a time (bot side)"""
+
+    def __init__(
+        self,
+        providers: Dict[str, str],
+        report: Callable[[Dict], None],
+        endpointing: Optional[Callable[[], Optional[Tuple[float, Optional[float]]]]] = None,
+    ):
+        self.providers = providers
+        self.report = report
+        # (stop threshold, saving against the fixed one) of the endpoint that ended the user's speech;
+        # the saving is None when the threshold is the fixed one
+        self.endpointing = endpointing
+        self._marks: Dict[str, float] = {}
+        self._endpoint: Optional[Tuple[float, Optional[float]]] = None
+
+    def mark(self, name: str):
+        if name == "user_stopped_speaking":
+            # A new end of speech restarts the turn, even if the last one never got audio out
+            self._marks = {name: time.monotonic()}
+            self._endpoint = self.endpointing() if self.endpointing else None
+            return
+        if "user_stopped_speaking" not in self._marks or name in self._marks:
+            return
+
+        self._marks[name] = time.monotonic()
+        if name == "first_audio":
+            self._complete()
+
+    def _complete(self):
+        stages = {}
+        for stage, (start, end, _) in TURN_STAGES.items():
+            if start in self._marks and end in self._marks:
+                # STT can finalize before VAD reports the stop; that costs nothing
+                stages[stage] = max(0.0, self._marks[end] - self._marks[start])
+        self._marks = {}
+        record = {"stages": stages, "providers": self.providers}
+        if self._endpoint:
+            stop, saved = self._endpoint
+            stages["endpointing"] = stop
+            if saved is not None:
+                record["endpointing_saved_ms"] = round(saved * 1000, 1)
+        self.report(record)
+
+
+class _StageSeries:
+    def __init__(self, window: int):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.buckets = [0] * len(HISTOGRAM_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        for index, bound in enumerate(HISTOGRAM_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+class TurnLatencyMetrics:
+    """Per-stage, per-provider latency histograms fed by bot turn reports (manager side)"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.turns = 0
+        self._series: Dict[Tuple[str, str], _StageSeries] = {}
+        # event name -> outcome -> count, for OUTCOME_COUNTERS
+        self.outcomes: Dict[str, Dict[str, int]] = {}
+        # Endpointing delay saved against the fixed VAD threshold (negative where it waited longer)
+        self.endpointing_turns = 0
+        self.endpointing_saved = 0.0
+
+    def observe(self, report: Dict):
+        providers = report.get("providers", {})
+        for stage, seconds in report.get("stages", {}).items():
+            if stage in BOT_STAGES:
+                role = BOT_STAGES[stage]
+            elif stage in TURN_STAGES:
+                role = TURN_STAGES[stage][2]
+            else:
+                continue
+            provider = providers.get(role, "unknown") if role else "+".join(
+                providers.get(r, "unknown") for r in ("stt", "llm", "tts")
+            )
+            key = (stage, provider)
+            if key not in self._series:
+                self._series[key] = _StageSeries(self.window)
+            self._series[key].observe(float(seconds))
+        if "endpointing_saved_ms" in report:
+            self.endpointing_turns += 1
+            self.endpointing_saved += float(report["endpointing_saved_ms"]) / 1000
+        self.turns += 1
+
+    def observe_outcome(self, event: str, outcome: str):
+        counts = self.outcomes.setdefault(event, {})
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+    def endpointing_summary(self) -> Dict:
+        """Turns ended by adaptive endpointing and the delay it saved, in milliseconds"""
+        turns = self.endpointing_turns
+        return {
+            "turns": turns,
+            "saved_ms_total": round(self.endpointing_saved * 1000),
+            "saved_ms_per_turn": round(self.endpointing_saved * 1000 / turns, 1) if turns else None,
+        }
+
+    def summary(self) -> Dict:
+        """p50/p95/p99 in milliseconds for every stage and provider seen so far"""
+        result: Dict[str, Dict] = {}
+        for (stage, provider), series in sorted(self._series.items()):
+            result.setdefault(stage, {})[provider] = {
+                f"p{int(q * 100)}_ms": round(series.quantile(q) * 1000, 1) for q in QUANTILES
+            }
+        return result
+
+    def render_prometheus(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """Prometheus text exposition of the stage histograms and windowed quantiles"""
+        lines: List[str] = [
+            "# HELP finley_turn_stage_latency_seconds Voice turn latency per pipeline stage",
+            "# TYPE finley_turn_stage_latency_seconds histogram",
+        ]
+        for (stage, provider), series in sorted(self._series.items()):
+            labels = f'stage="{stage}",provider="{provider}"'
+            for bound, count in zip(HISTOGRAM_BUCKETS, series.buckets):
+                lines.append(f'finley_turn_stage_latency_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'finley_turn_stage_latency_seconds_bucket{{{labels},le="+Inf"}} {series.count}')
+            lines.append(f"finley_turn_stage_latency_seconds_sum{{{labels}}} {series.total:.6f}")
+            lines.append(f"finley_turn_stage_latency_seconds_count{{{labels}}} {series.count}")
+
+        lines += [
+            f"# HELP finley_turn_stage_latency_quantile_seconds Stage latency quantiles over the last {self.window} turns",
+            "# TYPE finley_turn_stage_latency_quantile_seconds gauge",
+        ]
+        for (stage, provider), series in sorted(self._series.items()):
+            for q in QUANTILES:
+                lines.append(
+                    f'finley_turn_stage_latency_quantile_seconds{{stage="{stage}",provider="{provider}",'
+                    f'quantile="{q}"}} {series.quantile(q):.6f}'
+                )
+
+        lines += [
+            "# HELP finley_turns_total Voice turns reported by bots",
+            "# TYPE finley_turns_total counter",
+            f"finley_turns_total {self.turns}",
+            "# HELP finley_endpointing_saved_seconds End-of-speech delay saved by adaptive endpointing per turn",
+            "# TYPE finley_endpointing_saved_seconds summary",
+            f"finley_endpointing_saved_seconds_sum {self.endpointing_saved:.6f}",
+            f"finley_endpointing_saved_seconds_count {self.endpointing_turns}",
+        ]
+        for event, counts in sorted(self.outcomes.items()):
+            metric, help_text = OUTCOME_COUNTERS[event]
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [f'{metric}{{outcome="{outcome}"}} {count}' for outcome, count in sorted(counts.items())]
+        for name, value in (gauges or {}).items():
+            lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
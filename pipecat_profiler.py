@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from pipecat.frames.frames import CancelFrame, EndFrame, Frame, StartFrame, SystemFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR_ENV = "PIPECAT_FRAME_PROFILE_DIR"
+
+
+class _FrameStats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class FrameProfiler:
+    """Per-stage frame timing, queue depths and event-loop lag for one pipeline session
+
+    `instrument` replaces each stage's `process_frame` with a timing wrapper, so a session
+    that is not profiled runs the stages untouched. Time is wall time spent in
+    `process_frame`, awaits included (an LLM stage holds its context frame while it
+    streams). System frames are handed downstream inline, so time spent in later stages
+    during that call is subtracted: each stage is charged its own time only.
+
+    The trace is Chrome trace-event JSON, gzipped, which Perfetto (ui.perfetto.dev) and
+    chrome://tracing show as a timeline and speedscope as a flame graph. A frame gets its
+    own event only if it took at least `min_event_us`; every frame counts in the summary
+    under `otherData`. Loop lag and input queue depths are counter tracks, sampled every
+    `sample_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_interval: float = 0.05,
+        min_event_us: float = 200.0,
+        max_events: int = 200_000,
+    ):
+        self.path = path
+        self.sample_interval = sample_interval
+        self.min_event_us = min_event_us
+        self.max_events = max_events
+        self.stages: List[FrameProcessor] = []
+        self.events: List[dict] = []
+        self.dropped_events = 0
+        self.stats: Dict[Tuple[int, str], _FrameStats] = {}
+        self.max_queue: Dict[int, int] = {}
+        self.lag: Deque[float] = deque(maxlen=10000)
+        self._origin = time.perf_counter()
+        self._stacks: Dict[Optional[asyncio.Task], List[float]] = {}  # Inline child time per task
+        self._sampler: Optional[asyncio.Task] = None
+        self._finished = False
+
+    def instrument(self, stages: List[FrameProcessor]) -> List[FrameProcessor]:
+        """Wrap every stage (in place) and return the list for the Pipeline"""
+        for index, stage in enumerate(stages):
+            self.stages.append(stage)
+            self.events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": index, "args": {"name": stage.name}})
+            stage.process_frame = self._timed(index, stage.process_frame, first=index == 0, last=index == len(stages) - 1)
+        return stages
+
+    def _timed(self, index: int, process_frame, first: bool, last: bool):
+        stacks = self._stacks
+
+        async def timed(frame: Frame, direction: FrameDirection):
+            if first and isinstance(frame, StartFrame):
+                self.start()
+            elif last and isinstance(frame, (EndFrame, CancelFrame)):
+                # Before the frame reaches the task's sink, which lets the runner return
+                await self.finish()
+            task = asyncio.current_task()
+            stack = stacks.setdefault(task, [])
+            stack.append(0.0)
+            started = time.perf_counter()
+            try:
+                await process_frame(frame, direction)
+            finally:
+                elapsed = time.perf_counter() - started
+                own = elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                else:
+                    del stacks[task]
+                self._record(index, frame, started, own)
+
+        return timed
+
+    def _record(self, index: int, frame: Frame, started: float, own: float):
+        name = type(frame).__name__
+        stats = self.stats.get((index, name))
+        if stats is None:
+            stats = self.stats[(index, name)] = _FrameStats()
+        stats.count += 1
+        stats.total += own
+        if own > stats.max:
+            stats.max = own
+        if own * 1e6 >= self.min_event_us:
+            self._event({
+                "name": name,
+                "cat": "system" if isinstance(frame, SystemFrame) else "data",
+                "ph": "X",
+                "pid": 1,
+                "tid": index,
+                "ts": round((started - self._origin) * 1e6, 1),
+                "dur": round(own * 1e6, 1),
+            })
+
+    def _event(self, event: dict):
+        if len(self.events) < self.max_events:
+            self.events.append(event)
+        else:
+            self.dropped_events += 1
+
+    def start(self):
+        if self._sampler is None:
+            self._sampler = asyncio.get_running_loop().create_task(self._sample())
+
+    async def _sample(self):
+        expected = time.perf_counter() + self.sample_interval
+        depths: Dict[str, int] = {}
+        while True:
+            await asyncio.sleep(self.sample_interval)
+            now = time.perf_counter()
+            # A starved loop wakes this task late
+            lag = max(0.0, now - expected)
+            expected = now + self.sample_interval
+            self.lag.append(lag)
+            ts = round((now - self._origin) * 1e6, 1)
+            self._event({"name": "loop lag ms", "ph": "C", "pid": 1, "ts": ts, "args": {"lag": round(lag * 1000, 2)}})
+
+            sample = {}
+            for index, stage in enumerate(self.stages):
+                # pipecat keeps each processor's input queue private
+                queue = getattr(stage, "_FrameProcessor__input_queue", None)
+                depth = queue.qsize() if queue is not None else 0
+                sample[stage.name] = depth
+                if depth > self.max_queue.get(index, 0):
+                    self.max_queue[index] = depth
+            if sample != depths:
+                depths = sample
+                self._event({"name": "input queue", "ph": "C", "pid": 1, "ts": ts, "args": sample})
+
+    def summary(self) -> Dict:
+        """Per stage and frame type: count, frames/s, total and max ms; loop lag quantiles"""
+        duration = max(time.perf_counter() - self._origin, 1e-9)
+        stages: Dict[str, Dict] = {}
+        for (index, name), stats in sorted(self.stats.items(), key=lambda item: (item[0][0], -item[1].total)):
+            stage = stages.setdefault(self.stages[index].name, {"max_queue": self.max_queue.get(index, 0), "frames": {}})
+            stage["frames"][name] = {
+                "count": stats.count,
+                "per_sec": round(stats.count / duration, 2),
+                "total_ms": round(stats.total * 1000, 2),
+                "max_ms": round(stats.max * 1000, 2),
+            }
+        lag = sorted(self.lag)
+        loop_lag = {}
+        if lag:
+            for q in (0.5, 0.99):
+                loop_lag[f"p{int(q * 100)}"] = round(lag[min(len(lag) - 1, int(q * len(lag)))] * 1000, 2)
+            loop_lag["max"] = round(lag[-1] * 1000, 2)
+        return {
+            "duration_s": round(duration, 2),
+            "stages": stages,
+            "loop_lag_ms": loop_lag,
+            "dropped_events": self.dropped_events,
+        }
+
+    async def finish(self):
+        """Stop sampling and write the trace; later calls do nothing"""
+        if self._finished:
+            return
+        self._finished = True
+        if self._sampler:
+            self._sampler.cancel()
+        summary = self.summary()
+        trace = {"traceEvents": self.events, "displayTimeUnit": "ms", "otherData": summary}
+        await asyncio.to_thread(self._write, trace)
+        busiest = sorted(
+            ((sum(f["total_ms"] for f in stage["frames"].values()), name) for name, stage in summary["stages"].items()),
+            reverse=True,
+        )[:3]
+        logger.info(
+            f"🔬 Frame profile written to {self.path}; busiest stages: "
+            + ", ".join(f"{name} {ms:.0f}ms" for ms, name in busiest)
+            + f"; loop lag {summary['loop_lag_ms']}"
+        )
+
+    def _write(self, trace: dict):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump(trace, f, separators=(",", ":"))
+
+
+def frame_profiler_from_env(session: str) -> Optional[FrameProfiler]:
+    """A profiler writing to PIPECAT_FRAME_PROFILE_DIR, or None when that isn't set"""
+    directory = os.getenv(PROFILE_DIR_ENV)
+    if not directory:
+        return None
+    if directory.lower() == "true":
+        directory = os.path.join(tempfile.gettempdir(), "finley-frame-profiles")
+    label = re.sub(r"[^\w.-]+", "-", session).strip("-") or "session"
+    path = os.path.join(directory, f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.trace.json.gz")
+    return FrameProfiler(
+        path,
+        sample_interval=float(os.getenv("PIPECAT_FRAME_PROFILE_SAMPLE_MS", "50")) / 1000,
+        min_event_us=float(os.getenv("PIPECAT_FRAME_PROFILE_MIN_US", "200")),
+    )
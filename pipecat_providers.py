@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+import functools
+import importlib
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Service kinds every session needs, in the order a session builds them
+KINDS = ("vad", "transport", "stt", "llm", "tts")
+
+KIND_ICONS = {"vad": "🎙️", "transport": "📡", "stt": "🎤", "llm": "🧠", "tts": "🔊"}
+
+
+class StartupProfile:
+    """Import and init time per component; the first measurement of each is kept"""
+
+    def __init__(self):
+        self.timings: Dict[Tuple[str, str], float] = {}
+
+    @contextmanager
+    def measure(self, component: str, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.setdefault((component, phase), time.perf_counter() - started)
+
+    def report(self) -> str:
+        lines = [f"{'component':<24} {'phase':<8} {'ms':>9}"]
+        for (component, phase), seconds in self.timings.items():
+            lines.append(f"{component:<24} {phase:<8} {seconds * 1000:>9.1f}")
+        total = sum(self.timings.values())
+        lines.append(f"{'total':<24} {'':<8} {total * 1000:>9.1f}")
+        return "\n".join(lines)
+
+
+startup_profile = StartupProfile()
+
+
+@dataclass(frozen=True)
+class Provider:
+    kind: str
+    name: str
+    label: str
+    module: str  # Imported the first time the provider is used
+    requires: Tuple[str, ...]  # Environment variables that must be set
+    factory: Callable[..., Any]  # (module, resources, **options) -> service
+    interim_transcripts: bool = False  # STT streams interim results (needed for speculation)
+
+    @property
+    def available(self) -> bool:
+        return all(os.getenv(var) for var in self.requires)
+
+
+# kind -> name -> provider, in default preference order
+PROVIDERS: Dict[str, Dict[str, Provider]] = {kind: {} for kind in KINDS}
+
+
+def register_provider(kind: str, name: str, label: str, module: str, requires: Iterable[str] = (), **flags):
+    """Decorator adding a service factory under a name; PIPECAT_<KIND>_PROVIDER selects it"""
+    def decorator(factory: Callable[..., Any]):
+        PROVIDERS[kind][name] = Provider(kind, name, label, module, tuple(requires), factory, **flags)
+        return factory
+    return decorator
+
+
+def select_provider(kind: str) -> Provider:
+    """The provider named by PIPECAT_<KIND>_PROVIDER, else the first one whose keys are set"""
+    providers = PROVIDERS[kind]
+    name = os.getenv(f"PIPECAT_{kind.upper()}_PROVIDER")
+    if name:
+        if name not in providers:
+            raise ValueError(f"Unknown {kind} provider '{name}', use one of {list(providers)}")
+        provider = providers[name]
+        if not provider.available:
+            raise ValueError(f"{kind} provider '{name}' needs {list(provider.requires)}")
+        return provider
+    for provider in providers.values():
+        if provider.available:
+            return provider
+    needs = " or ".join("+".join(p.requires) for p in providers.values())
+    raise ValueError(f"No {kind} provider configured, set {needs}")
+
+
+def route_providers(kind: str) -> List[Provider]:
+    """The selected provider, then with PIPECAT_PROVIDER_FAILOVER=true every other one of its kind whose keys are set"""
+    selected = select_provider(kind)
+    if os.getenv("PIPECAT_PROVIDER_FAILOVER", "false").lower() != "true":
+        return [selected]
+    return [selected] + [p for p in PROVIDERS[kind].values() if p is not selected and p.available]
+
+
+def load_module(provider: Provider) -> ModuleType:
+    with startup_profile.measure(f"{provider.kind}:{provider.name}", "import"):
+        return importlib.import_module(provider.module)
+
+
+def build_service(provider: Provider, resources=None, **options) -> Any:
+    module = load_module(provider)
+    with startup_profile.measure(f"{provider.kind}:{provider.name}", "init"):
+        return provider.factory(module, resources, **options)
+
+
+def create_service(kind: str, resources=None, **options) -> Tuple[Provider, Any]:
+    """Import the selected provider for `kind` on first use and build one service from it"""
+    provider = select_provider(kind)
+    return provider, build_service(provider, resources, **options)
+
+
+def create_services(kind: str, resources=None, **options) -> List[Tuple[Provider, Any]]:
+    """One service per provider in `route_providers(kind)` order, selected provider first"""
+    return [(provider, build_service(provider, resources, **options)) for provider in route_providers(kind)]
+
+
+def preload(kinds: Iterable[str] = KINDS):
+    """Import the selected and failover providers now, e.g. while a pooled worker warms up"""
+    for kind in kinds:
+        for provider in route_providers(kind):
+            load_module(provider)
+
+
+@register_provider("vad", "silero", "Silero", "pipecat.audio.vad.silero")
+def silero_vad(module, resources, **_):
+    return module.SileroVADAnalyzer()
+
+
+@register_provider("transport", "daily", "Daily", "pipecat.transports.services.daily")
+def daily_transport(module, resources, room_url: str, token: str, bot_name: str, vad_analyzer, **_):
+    # Daily.co WebRTC for real-time audio
+    return module.DailyTransport(
+        room_url,
+        token,
+        bot_name,
+        module.DailyParams(
+            audio_out_enabled=True,
+            audio_in_enabled=True,
+            video_out_enabled=False,  # Audio-only for now
+            vad_enabled=True,
+            vad_analyzer=vad_analyzer,
+            vad_audio_passthrough=True,
+        ),
+    )
+
+
+@register_provider("transport", "websocket", "WebSocket relay", "pipecat_ws_transport")
+def websocket_transport(module, resources, room_url: str, vad_analyzer, **_):
+    # PCM over the node's WebSocket relay; chosen per session by a relay: room URL (see pipecat_ws_relay.py)
+    return module.RelayTransport(module.relay_socket_path(room_url), vad_analyzer)
+
+
+@register_provider("stt", "deepgram", "Deepgram", "pipecat.services.deepgram",
+                   requires=["DEEPGRAM_API_KEY"], interim_transcripts=True)
+def deepgram_stt(module, resources, **_):
+    return module.DeepgramSTTService(
+        api_key=os.getenv("DEEPGRAM_API_KEY"),
+        model="nova-2-general",
+        language="en",
+    )
+
+
+@register_provider("stt", "whisper", "OpenAI Whisper", "pipecat.services.openai", requires=["OPENAI_API_KEY"])
+def whisper_stt(module, resources, **_):
+    stt = module.OpenAISTTService(api_key=os.getenv("OPENAI_API_KEY"), model="whisper-1")
+    if resources:
+        stt._client = resources.openai_client(os.getenv("OPENAI_API_KEY"))
+    return stt
+
+
+GEMINI_BASE_URL = os.getenv("GOOGLE_AI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+
+# LLM provider -> (API key variable, base URL, model) of its OpenAI-compatible chat endpoint;
+# a base URL of None lets the OpenAI client read OPENAI_BASE_URL
+CHAT_ENDPOINTS: Dict[str, Tuple[str, Optional[str], str]] = {
+    "openai": ("OPENAI_API_KEY", None, "gpt-4o-mini"),  # Fast model for real-time conversation
+    "gemini": ("GOOGLE_AI_API_KEY", GEMINI_BASE_URL, "gemini-2.0-flash-exp"),  # Through its OpenAI-compatible endpoint
+}
+
+
+def chat_client(name: str, resources=None) -> Tuple[Any, str]:
+    """(AsyncOpenAI client, model) for an LLM provider's chat endpoint"""
+    key_var, base_url, model = CHAT_ENDPOINTS[name]
+    if resources:
+        # Share one pooled HTTP client across every session in this host
+        return resources.openai_client(os.getenv(key_var), base_url), model
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=os.getenv(key_var), base_url=base_url), model
+
+
+@functools.lru_cache(maxsize=None)
+def _chat_llm_class(service_class: type) -> type:
+    """`service_class` using the chat client passed as `client` instead of building its own"""
+    if not callable(getattr(service_class, "create_client", None)):
+        raise TypeError(f"{service_class.__name__} has no create_client to hand a chat client to")
+
+    class ChatLLMService(service_class):
+        def __init__(self, *, client=None, **kwargs):
+            self._chat_client = client
+            super().__init__(**kwargs)
+
+        def create_client(self, *args, **kwargs):
+            if self._chat_client is not None:
+                return self._chat_client
+            return super().create_client(*args, **kwargs)
+
+    return ChatLLMService
+
+
+def _chat_llm(module, resources, name: str, client=None):
+    key_var, base_url, model = CHAT_ENDPOINTS[name]
+    if client is None and resources:
+        client = chat_client(name, resources)[0]
+    service_class = _chat_llm_class(module.OpenAILLMService)
+    return service_class(api_key=os.getenv(key_var), base_url=base_url, model=model, client=client)
+
+
+@register_provider("llm", "openai", "OpenAI", "pipecat.services.openai", requires=["OPENAI_API_KEY"])
+def openai_llm(module, resources, client=None, **_):
+    return _chat_llm(module, resources, "openai", client)
+
+
+@register_provider("llm", "gemini", "Google AI", "pipecat.services.openai", requires=["GOOGLE_AI_API_KEY"])
+def gemini_llm(module, resources, client=None, **_):
+    return _chat_llm(module, resources, "gemini", client)
+
+
+def _passthrough_text_aggregator():
+    from pipecat.utils.text.base_text_aggregator import BaseTextAggregator
+
+    class PassthroughTextAggregator(BaseTextAggregator):
+        @property
+        def text(self) -> str:
+            return ""
+
+        async def aggregate(self, text: str) -> Optional[str]:
+            return text or None
+
+        async def handle_interruption(self):
+            pass
+
+        async def reset(self):
+            pass
+
+    return PassthroughTextAggregator()
+
+
+@register_provider("tts", "cartesia", "Cartesia", "pipecat.services.cartesia", requires=["CARTESIA_API_KEY"])
+def cartesia_tts(module, resources, voice_id: str, model_id: str, sample_rate: int, aggregate_sentences: bool = True, **options):
+    if not aggregate_sentences:
+        # Cartesia always aggregates into sentences; this aggregator hands on every chunk as it comes
+        options["text_aggregator"] = _passthrough_text_aggregator()
+    return module.CartesiaTTSService(
+        api_key=os.getenv("CARTESIA_API_KEY"),
+        voice_id=voice_id,
+        model=model_id,
+        sample_rate=sample_rate,
+        **options,
+    )
+
+
+@register_provider("tts", "openai", "OpenAI TTS", "pipecat.services.openai", requires=["OPENAI_API_KEY"])
+def openai_tts(module, resources, sample_rate: int, **options):
+    # Cartesia voice and model ids don't apply; OpenAI TTS always speaks at 24kHz
+    options.pop("voice_id", None)
+    options.pop("model_id", None)
+    tts = module.OpenAITTSService(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        voice="nova",
+        model="gpt-4o-mini-tts",
+        sample_rate=sample_rate,
+        **options,
+    )
+    if resources:
+        tts._client = resources.openai_client(os.getenv("OPENAI_API_KEY"))
+    return tts
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Events reported to the manager (see OUTCOME_COUNTERS)
+FAILOVER_EVENT = "provider_failover"  # outcome: "<kind>:<provider switched away from>"
+HEDGE_EVENT = "llm_hedge"             # outcome: which request of a hedged pair answered first
+
+# Hedge outcomes
+PRIMARY = "primary"  # The first provider answered before the hedge did
+HEDGE = "hedge"      # The hedged request to the next provider answered first
+
+Report = Callable[[str, str], None]  # (event, outcome)
+
+
+class ProviderHealth:
+    """Rolling latency and error samples for one provider, with a cooldown after repeated errors
+
+    Samples older than `max_age` are ignored, so a provider that was slow or failing
+    gets tried again once nothing recent speaks against it.
+    """
+
+    def __init__(self, window: int, max_age: float, min_samples: int, error_threshold: float, cooldown: float):
+        self.max_age = max_age
+        self.min_samples = min_samples
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.samples: Deque[Tuple[float, Optional[float]]] = deque(maxlen=window)  # (at, latency or None on error)
+        self.cooldown_until = 0.0
+        self.errors = 0
+        self.successes = 0
+
+    def _recent(self) -> List[Optional[float]]:
+        horizon = time.monotonic() - self.max_age
+        return [latency for at, latency in self.samples if at >= horizon]
+
+    def observe(self, latency: float):
+        self.successes += 1
+        self.samples.append((time.monotonic(), latency))
+
+    def fail(self):
+        self.errors += 1
+        self.samples.append((time.monotonic(), None))
+        if self.error_rate >= self.error_threshold:
+            # Start clean after the cooldown: the next request decides whether it is back
+            self.cooldown_until = time.monotonic() + self.cooldown
+            self.samples.clear()
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def error_rate(self) -> float:
+        recent = self._recent()
+        if len(recent) < self.min_samples:
+            return 0.0
+        return sum(1 for latency in recent if latency is None) / len(recent)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Median recent latency in seconds, once there are enough samples"""
+        recent = sorted(latency for latency in self._recent() if latency is not None)
+        if len(recent) < self.min_samples:
+            return None
+        return recent[len(recent) // 2]
+
+    def stats(self) -> Dict:
+        latency = self.latency
+        return {
+            "available": self.available,
+            "error_rate": round(self.error_rate, 3),
+            "p50_ms": round(latency * 1000, 1) if latency is not None else None,
+            "successes": self.successes,
+            "errors": self.errors,
+        }
+
+
+class HealthBoard:
+    """Provider health shared by every session in the process, per (kind, provider)"""
+
+    def __init__(
+        self,
+        window: int = 20,
+        max_age: float = 120.0,
+        min_samples: int = 3,
+        error_threshold: float = 0.5,
+        cooldown: float = 30.0,
+        slow_factor: float = 2.0,
+        slow_after: Optional[Dict[str, float]] = None,
+    ):
+        self.window = window
+        self.max_age = max_age
+        self.min_samples = min_samples
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.slow_factor = slow_factor
+        self.slow_after = slow_after or {}  # kind -> seconds past which an untried provider is worth a try
+        self._providers: Dict[Tuple[str, str], ProviderHealth] = {}
+
+    def get(self, kind: str, name: str) -> ProviderHealth:
+        key = (kind, name)
+        if key not in self._providers:
+            self._providers[key] = ProviderHealth(
+                self.window, self.max_age, self.min_samples, self.error_threshold, self.cooldown
+            )
+        return self._providers[key]
+
+    def rank(self, kind: str, names: Sequence[str]) -> List[str]:
+        """`names` reordered for the next request: available ones first, in preference order,
+        except that a provider `slow_factor` times faster than the leader takes its place, and
+        one without samples does once the leader is slower than `slow_after`"""
+        ordered = sorted(names, key=lambda name: not self.get(kind, name).available)
+        best = ordered[0]
+        for name in ordered[1:]:
+            if self._faster(kind, name, best):
+                best = name
+        return [best] + [name for name in ordered if name != best]
+
+    def _faster(self, kind: str, name: str, than: str) -> bool:
+        candidate, leader = self.get(kind, name), self.get(kind, than)
+        if not candidate.available:
+            return False
+        if not leader.available:
+            return True
+        if candidate.latency is None:
+            return leader.latency is not None and kind in self.slow_after and leader.latency > self.slow_after[kind]
+        # Swings within slow_factor don't flip providers back and forth
+        return leader.latency is not None and candidate.latency * self.slow_factor < leader.latency
+
+    def stats(self) -> Dict[str, Dict[str, Dict]]:
+        result: Dict[str, Dict[str, Dict]] = {}
+        for (kind, name), health in sorted(self._providers.items()):
+            result.setdefault(kind, {})[name] = health.stats()
+        return result
+
+
+def health_board_from_env() -> HealthBoard:
+    return HealthBoard(
+        window=int(os.getenv("PIPECAT_PROVIDER_HEALTH_WINDOW", "20")),
+        max_age=float(os.getenv("PIPECAT_PROVIDER_HEALTH_MAX_AGE", "120")),
+        error_threshold=float(os.getenv("PIPECAT_PROVIDER_ERROR_THRESHOLD", "0.5")),
+        cooldown=float(os.getenv("PIPECAT_PROVIDER_COOLDOWN", "30")),
+        slow_factor=float(os.getenv("PIPECAT_PROVIDER_SLOW_FACTOR", "2")),
+        slow_after={
+            kind: float(os.getenv(f"PIPECAT_{kind.upper()}_SLOW_MS", default)) / 1000
+            for kind, default in (("stt", "1000"), ("llm", "1500"), ("tts", "1000"))
+        },
+    )
+
+
+# Shared by every session in this process
+provider_health = health_board_from_env()
+
+
+@dataclass
+class ChatRoute:
+    """One OpenAI-compatible chat endpoint an LLM request can go to"""
+    name: str
+    client: Any  # AsyncOpenAI or anything with .chat.completions.create(**params)
+    model: str
+
+
+class _ChatAttempt:
+    """One streamed request to one route, up to and including its first chunk"""
+
+    def __init__(self, route: ChatRoute, params: Dict):
+        self.route = route
+        self.started = time.monotonic()
+        self.stream = None
+        self.first = asyncio.ensure_future(self._open(params))
+
+    async def _open(self, params: Dict):
+        self.stream = await self.route.client.chat.completions.create(**{**params, "model": self.route.model})
+        try:
+            return await self.stream.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    async def close(self):
+        self.first.cancel()
+        await asyncio.gather(self.first, return_exceptions=True)
+        close = getattr(self.stream, "close", None)
+        if close:
+            with suppress(Exception):
+                await close()
+
+
+class RoutedChatClient:
+    """Drop-in for the AsyncOpenAI client of an OpenAILLMService that routes each request
+
+    Routes are tried in health order. A route that errors, or streams nothing within
+    `first_token_timeout`, is failed over to the next one. With `hedge_after` set, a second
+    request goes to the next route when the first has produced no chunk by then; whichever
+    streams first is kept and the other is closed. Errors after the first chunk are not
+    retried, since that text may already be spoken.
+    """
+
+    def __init__(
+        self,
+        routes: List[ChatRoute],
+        board: HealthBoard = provider_health,
+        hedge_after: Optional[float] = None,
+        first_token_timeout: Optional[float] = 5.0,
+        report: Optional[Report] = None,
+    ):
+        self.routes = {route.name: route for route in routes}
+        self.board = board
+        self.hedge_after = hedge_after
+        self.first_token_timeout = first_token_timeout
+        self.report = report
+        self._closing: Set[asyncio.Future] = set()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _report(self, event: str, outcome: str):
+        if self.report:
+            self.report(event, outcome)
+
+    def _close_later(self, attempt: _ChatAttempt):
+        closing = asyncio.ensure_future(attempt.close())
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+
+    def _failed(self, attempt: _ChatAttempt, error: BaseException, more: bool):
+        self.board.get("llm", attempt.route.name).fail()
+        logger.warning(f"⚠️ LLM {attempt.route.name} failed before its first token: {error!r}")
+        if more:
+            self._report(FAILOVER_EVENT, f"llm:{attempt.route.name}")
+
+    async def create(self, **params):
+        queue = [self.routes[name] for name in self.board.rank("llm", list(self.routes))]
+        pending = [_ChatAttempt(queue.pop(0), params)]
+        hedged: Optional[_ChatAttempt] = None  # The attempt that was too slow, once a hedge is out
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                deadlines = []
+                if self.first_token_timeout:
+                    deadlines += [attempt.started + self.first_token_timeout for attempt in pending]
+                if self.hedge_after and queue and hedged is None:
+                    deadlines.append(pending[0].started + self.hedge_after)
+                timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, _ = await asyncio.wait(
+                    [attempt.first for attempt in pending], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    expired = [a for a in pending if self.first_token_timeout and a.elapsed >= self.first_token_timeout]
+                    for attempt in expired:
+                        pending.remove(attempt)
+                        error = asyncio.TimeoutError(f"no tokens from {attempt.route.name} within {self.first_token_timeout}s")
+                        self._failed(attempt, error, bool(queue or pending))
+                        self._close_later(attempt)
+                    if not expired:
+                        hedged = pending[0]
+                        logger.info(f"⏱️ No tokens from {hedged.route.name} after {self.hedge_after}s, hedging to {queue[0].name}")
+                        pending.append(_ChatAttempt(queue.pop(0), params))
+                else:
+                    for attempt in [a for a in pending if a.first in done]:
+                        pending.remove(attempt)
+                        error = attempt.first.exception()
+                        if error is None:
+                            return self._won(attempt, pending, hedged)
+                        self._failed(attempt, error, bool(queue or pending))
+
+                if not pending and queue:
+                    pending.append(_ChatAttempt(queue.pop(0), params))
+        except BaseException:
+            await asyncio.gather(*[attempt.close() for attempt in pending])
+            raise
+        raise error
+
+    def _won(self, winner: _ChatAttempt, losers: List[_ChatAttempt], hedged: Optional[_ChatAttempt]):
+        self.board.get("llm", winner.route.name).observe(winner.elapsed)
+        for loser in losers:
+            # Only a lower bound, but enough to rank a provider that keeps losing as slow
+            self.board.get("llm", loser.route.name).observe(loser.elapsed)
+            self._close_later(loser)
+        if hedged:
+            self._report(HEDGE_EVENT, PRIMARY if winner is hedged else HEDGE)
+        return self._relay(winner)
+
+    async def _relay(self, attempt: _ChatAttempt):
+        try:
+            first = attempt.first.result()
+            if first is None:
+                return
+            yield first
+            async for chunk in attempt.stream:
+                yield chunk
+        except Exception:
+            self.board.get("llm", attempt.route.name).fail()
+            raise
+        finally:
+            await attempt.close()
+
+
+class ServiceRouter:
+    """Chooses which of a session's STT or TTS services gets the work, and times its answers
+
+    A turn opens (e.g. the user starts speaking), the active service is asked for
+    something (the user stops), and its answer (a final transcript) is timed against the
+    request. No answer within `timeout` counts as an error. After every sample the
+    providers are re-ranked on the shared board and the session switches when the
+    active one is no longer first. A service that reports an error is also benched for
+    this session for the board's cooldown, so the next turn already goes elsewhere.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        names: Sequence[str],
+        board: HealthBoard = provider_health,
+        timeout: float = 3.0,
+        early_answers: bool = False,
+        report: Optional[Report] = None,
+        on_switch: Optional[Callable[[str], None]] = None,
+    ):
+        self.kind = kind
+        self.names = list(names)
+        self.board = board
+        self.timeout = timeout
+        self.early_answers = early_answers  # An answer before the request completes the turn at zero latency
+        self.report = report
+        self.on_switch = on_switch
+        self.active = board.rank(kind, self.names)[0]
+        self._benched: Dict[str, float] = {}  # name -> monotonic time it may be used again
+        self._open = False
+        self._asked_at: Optional[float] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _close_turn(self):
+        self._open = False
+        self._asked_at = None
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def open(self):
+        self._close_turn()
+        self._open = True
+
+    def request(self):
+        if not self._open or self._asked_at is not None:
+            return
+        self._asked_at = time.monotonic()
+        self._timer = asyncio.get_running_loop().call_later(self.timeout, self._timed_out, self.active)
+
+    def answer(self, name: str):
+        if name != self.active or not self._open:
+            return
+        if self._asked_at is not None:
+            self.board.get(self.kind, name).observe(time.monotonic() - self._asked_at)
+        elif self.early_answers:
+            self.board.get(self.kind, name).observe(0.0)
+        else:
+            return
+        self._close_turn()
+        self._reselect()
+
+    def cancel(self):
+        """The turn was interrupted; nothing is owed for it"""
+        self._close_turn()
+
+    def failed(self, name: str, error: str, bench: bool = True):
+        logger.warning(f"⚠️ {self.kind} {name} error: {error}")
+        self.board.get(self.kind, name).fail()
+        if bench:
+            self._benched[name] = time.monotonic() + self.board.cooldown
+        if name == self.active:
+            self._close_turn()
+        self._reselect()
+
+    def _timed_out(self, name: str):
+        self._timer = None
+        if name == self.active:
+            # Silence can be a cough with nothing to transcribe; leave it to the error rate
+            self.failed(name, f"no answer within {self.timeout}s", bench=False)
+
+    def _reselect(self):
+        now = time.monotonic()
+        usable = [name for name in self.names if self._benched.get(name, 0.0) <= now] or self.names
+        best = self.board.rank(self.kind, usable)[0]
+        if best == self.active:
+            return
+        logger.warning(f"🔀 Switching {self.kind} from {self.active} to {best}")
+        if self.report:
+            self.report(FAILOVER_EVENT, f"{self.kind}:{self.active}")
+        self.active = best
+        if self.on_switch:
+            self.on_switch(best)
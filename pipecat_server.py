@@ -3,32 +3,92 @@
 import asyncio
 import os
 import argparse
+import json
 import logging
-from typing import Optional
-
-from pipecat.frames.frames import (
-    Frame,
-    AudioRawFrame,
-    TranscriptionFrame,
-    TextFrame,
-    LLMMessagesFrame,
-    TTSStartedFrame,
-    TTSStoppedFrame
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Type
+
+from pipecat_providers import (
+    PROVIDERS,
+    KIND_ICONS,
+    Provider,
+    build_service,
+    chat_client,
+    create_service,
+    create_services,
+    preload,
+    route_providers,
+    select_provider,
+    startup_profile,
 )
-from pipecat.pipeline.pipeline import Pipeline
-from pipecat.pipeline.runner import PipelineRunner
-from pipecat.pipeline.task import PipelineParams, PipelineTask
-from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
-from pipecat.services.openai import OpenAILLMService
-from pipecat.services.cartesia import CartesiaTTSService  
-from pipecat.services.deepgram import DeepgramSTTService
-from pipecat.transports.services.daily import DailyParams, DailyTransport
-from pipecat.vad.silero import SileroVADAnalyzer
-from pipecat.processors.aggregators.vision_image_frame import VisionImageFrameAggregator
-from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+# Provider services are imported on demand by pipecat_providers; only the pipeline core loads here
+with startup_profile.measure("pipecat core", "import"):
+    from pipecat.frames.frames import (
+        Frame,
+        AudioRawFrame,
+        TranscriptionFrame,
+        TextFrame,
+        LLMMessagesFrame,
+        TTSStartedFrame,
+        TTSStoppedFrame,
+        TTSAudioRawFrame,
+        UserStoppedSpeakingFrame,
+        LLMFullResponseEndFrame,
+        StartInterruptionFrame,
+        FunctionCallInProgressFrame,
+        FunctionCallResultFrame,
+        InterimTranscriptionFrame,
+        SystemFrame,
+        LLMFullResponseStartFrame,
+        ErrorFrame,
+        UserStartedSpeakingFrame,
+        TTSSpeakFrame,
+        InputAudioRawFrame,
+        EndFrame,
+        CancelFrame,
+        StartFrame,
+        BotStartedSpeakingFrame,
+        BotStoppedSpeakingFrame,
+        MetricsFrame,
+    )
+    from pipecat.metrics.metrics import (
+        LLMUsageMetricsData,
+        ProcessingMetricsData,
+        TTFBMetricsData,
+        TTSUsageMetricsData,
+    )
+    from pipecat.pipeline.parallel_pipeline import ParallelPipeline
+    from pipecat.pipeline.pipeline import Pipeline
+    from pipecat.pipeline.runner import PipelineRunner
+    from pipecat.pipeline.task import PipelineParams, PipelineTask
+    from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext, OpenAILLMContextFrame
+    from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
 from dotenv import load_dotenv
 
+with startup_profile.measure("finley modules", "import"):
+    from pipecat_audio import AudioConditioner, conditioner_from_env
+    from pipecat_bot_host import BotHost, SharedBotResources
+    from pipecat_clause_aggregator import ClauseChunker, FlushPolicy, parse_flush_policy
+    from pipecat_context import ConversationMemory
+    from pipecat_endpointing import AdaptiveVADAnalyzer, adaptive_vad_from_env
+    from pipecat_event_sink import EVENT_LOG_DIR_ENV, SessionEvents, session_events_from_env
+    from pipecat_financial_context import FinancialContextCache
+    from pipecat_metrics import TurnLatencyTracker
+    from pipecat_profiler import PROFILE_DIR_ENV, frame_profiler_from_env
+    from pipecat_routing import ChatRoute, RoutedChatClient, ServiceRouter
+    from pipecat_session_recording import RECORD_DIR_ENV, SessionRecorder, session_recorder_from_env
+    from pipecat_spending_index import SPENDING_TOOLS, SpendingIndex, SpendingTools, fetch_transactions
+    from pipecat_speculation import CANCEL, COMMIT, RESTART, START, SpeculationController
+    from pipecat_tts_cache import PhraseAudioCache, Synthesizer, cartesia_synthesizer, phrase_key, split_sentences
+    from pipecat_worker_pool import BotJob, announce_worker_ready, emit_event, read_worker_job
+    from pipecat_ws_relay import is_relay_room
+
+if TYPE_CHECKING:
+    from pipecat.audio.vad.silero import SileroVADAnalyzer
+
 # Load environment variables
 load_dotenv()
 
@@ -39,55 +99,161 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Financial summaries shared by every session in this process, keyed by access token
+financial_cache = FinancialContextCache(
+    ttl=float(os.getenv("FINLEY_FINANCIAL_CONTEXT_TTL", "300")),
+    max_entries=int(os.getenv("FINLEY_FINANCIAL_CONTEXT_MAX_ENTRIES", "1024")),
+)
+
+# Synthesized phrases: LRU per process, disk tier shared by every bot on the host
+tts_cache = PhraseAudioCache(
+    memory_bytes=int(os.getenv("PIPECAT_TTS_CACHE_MEMORY_MB", "32")) * 1024 * 1024,
+    disk_bytes=int(os.getenv("PIPECAT_TTS_CACHE_DISK_MB", "256")) * 1024 * 1024,
+)
+
+@dataclass
+class SpeculationFrame(SystemFrame):
+    """Tells SpeculationGate to hold (hold=True) or release (hold=False) the LLM output"""
+    hold: bool
+
 class FinancialAssistantProcessor(FrameProcessor):
     """Custom processor to handle financial context and conversation logic"""
     
-    def __init__(self, access_token: Optional[str] = None):
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        memory: Optional[ConversationMemory] = None,
+        financial_context: Optional[FinancialContextCache] = None,
+        tools: Optional[List[Dict]] = None,
+        speculation: Optional[SpeculationController] = None,
+        events: Optional[SessionEvents] = None,
+    ):
         super().__init__()
         self.access_token = access_token
-        self.conversation_context = []
+        # Transcripts and tool calls go to the session event sink, off the event loop
+        self.events = events
+        self.financial_context = financial_context
+        self.tools = tools
+        # Set to start responses on stable interim transcripts (needs a SpeculationGate after the LLM)
+        self.speculation = speculation
+        # Shared with AssistantTurnAggregator, which adds Finley's replies
+        self.memory = memory or ConversationMemory()
+        # Context of the current turn; tool calls and results are appended to it
+        self._turn_context: Optional[OpenAILLMContext] = None
+        self._pending_tool_calls: Set[str] = set()
         
     async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        # Interim transcripts only feed speculation; the LLM and TTS never need them
+        if isinstance(frame, InterimTranscriptionFrame):
+            if self.speculation:
+                await self._handle_interim(frame.text)
+            return
+        
         # Handle transcription frames from user
         if isinstance(frame, TranscriptionFrame):
             user_text = frame.text
-            logger.info(f"👤 User said: {user_text}")
+            logger.debug("👤 User said: %s", user_text)
+            if self.events:
+                self.events.emit("transcript", role="user", text=user_text)
+            
+            decision = self.speculation.on_final(user_text) if self.speculation else None
             
             # Add to conversation context
-            self.conversation_context.append({
-                "role": "user",
-                "content": user_text
-            })
+            self.memory.add_user(user_text)
+            
+            if decision == COMMIT:
+                # The response to this exact question is already running
+                await self.push_frame(SpeculationFrame(hold=False))
+                return
+            if decision == RESTART:
+                await self.push_frame(StartInterruptionFrame())
             
             # Create enhanced prompt with financial context
             enhanced_prompt = await self._create_enhanced_prompt(user_text)
             
+            # History within the token budget, with the current question enhanced
+            messages = self.memory.messages(self._get_system_prompt())
+            messages[-1] = {"role": "user", "content": enhanced_prompt}
+            
             # Send enhanced prompt downstream
-            await self.push_frame(
-                LLMMessagesFrame([
-                    {"role": "system", "content": self._get_system_prompt()},
-                    *self.conversation_context[-10:],  # Keep last 10 exchanges
-                    {"role": "user", "content": enhanced_prompt}
-                ]),
-                direction
-            )
+            await self._generate(messages)
+            return
+        
+        # The user started talking again; the transport's interruption also stops the LLM
+        if isinstance(frame, StartInterruptionFrame) and self.speculation:
+            self.speculation.cancel()
+        
+        # The LLM also sends function call frames upstream, so they arrive here
+        if direction == FrameDirection.UPSTREAM and isinstance(frame, FunctionCallInProgressFrame):
+            self._add_tool_call(frame)
+            return
+        if direction == FrameDirection.UPSTREAM and isinstance(frame, FunctionCallResultFrame):
+            await self._add_tool_result(frame)
             return
-            
-        # Handle LLM response frames
-        if isinstance(frame, TextFrame):
-            response_text = frame.text
-            logger.info(f"🤖 Finley responds: {response_text}")
-            
-            # Add to conversation context
-            self.conversation_context.append({
-                "role": "assistant", 
-                "content": response_text
-            })
         
         # Pass frame downstream
         await self.push_frame(frame, direction)
     
+    async def _generate(self, messages: List[Dict]):
+        if self.tools:
+            self._turn_context = OpenAILLMContext(messages, self.tools)
+            self._pending_tool_calls.clear()
+            await self.push_frame(OpenAILLMContextFrame(self._turn_context))
+        else:
+            await self.push_frame(LLMMessagesFrame(messages))
+    
+    async def _handle_interim(self, text: str):
+        decision = self.speculation.on_interim(text)
+        if decision == CANCEL:
+            await self.push_frame(StartInterruptionFrame())
+        elif decision == START:
+            logger.debug("🔮 Speculating on: %s", text)
+            if self.events:
+                self.events.emit("speculation", text=text)
+            # Same prompt the final transcript would produce, without committing the user turn
+            messages = self.memory.messages(self._get_system_prompt())
+            messages.append({"role": "user", "content": await self._create_enhanced_prompt(text)})
+            await self.push_frame(SpeculationFrame(hold=True))
+            await self._generate(messages)
+    
+    def _add_tool_call(self, frame: FunctionCallInProgressFrame):
+        if not self._turn_context:
+            return
+        self._pending_tool_calls.add(frame.tool_call_id)
+        self._turn_context.add_message({
+            "role": "assistant",
+            "tool_calls": [{
+                "id": frame.tool_call_id,
+                "type": "function",
+                "function": {"name": frame.function_name, "arguments": json.dumps(frame.arguments)},
+            }],
+        })
+        
+    async def _add_tool_result(self, frame: FunctionCallResultFrame):
+        """Answer the question from tool results once every call of the turn has returned"""
+        if not self._turn_context or frame.tool_call_id not in self._pending_tool_calls:
+            return
+        self._pending_tool_calls.discard(frame.tool_call_id)
+        self._turn_context.add_message({
+            "role": "tool",
+            "tool_call_id": frame.tool_call_id,
+            "content": json.dumps(frame.result),
+        })
+        logger.debug("🧮 %s(%s) -> %s", frame.function_name, frame.arguments, frame.result)
+        if self.events:
+            self.events.emit("tool_call", name=frame.function_name, arguments=frame.arguments, result=frame.result)
+        if not self._pending_tool_calls:
+            await self.push_frame(OpenAILLMContextFrame(self._turn_context), FrameDirection.DOWNSTREAM)
+    
     def _get_system_prompt(self) -> str:
+        prompt = self._base_system_prompt()
+        if self.tools:
+            prompt += "\n\nFor exact amounts spent, top merchants or monthly trends, call the spending tools instead of estimating from the context."
+        return prompt
+    
+    def _base_system_prompt(self) -> str:
         return """You are Finley, a warm and friendly financial AI assistant. 
 
 Key guidelines:
@@ -106,100 +272,620 @@ Remember: You're having a real-time voice conversation, so be concise and engagi
         if not self.access_token:
             return user_text
             
-        # In a real implementation, you'd fetch financial data here
-        # For now, we'll just add context about account connectivity
+        # Memory-only read; the summary was prefetched when the bot started
+        cached = self.financial_context.get(self.access_token) if self.financial_context else None
+        if cached and cached.text:
+            return f"""User question: {user_text}
+
+Financial Context (last 30 days):
+{cached.text}"""
+        
+        # Summary not loaded yet, fall back to general context about account connectivity
         enhanced = f"""User question: {user_text}
 
 Context: User has connected their bank account, so you can reference general financial guidance and suggest they explore their spending patterns, account balances, or financial goals."""
         
         return enhanced
 
-async def create_financial_assistant_bot(room_url: str, token: str, access_token: Optional[str] = None):
-    """Create and run the Pipecat financial assistant bot"""
+class AssistantTurnAggregator(FrameProcessor):
+    """Assembles streamed LLM text into one assistant turn per reply"""
     
-    # Transport setup - Daily.co WebRTC for real-time audio/video
-    transport = DailyTransport(
-        room_url,
-        token,
-        "Finley Financial Assistant",
-        DailyParams(
-            audio_out_enabled=True,
-            audio_in_enabled=True,
-            video_out_enabled=False,  # Audio-only for now
-            vad_enabled=True,
-            vad_analyzer=SileroVADAnalyzer(),
-            vad_audio_passthrough=True,
-        ),
+    def __init__(self, memory: ConversationMemory, events: Optional[SessionEvents] = None):
+        super().__init__()
+        self.memory = memory
+        self.events = events
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        if isinstance(frame, TextFrame):
+            self.memory.append_assistant(frame.text)
+        elif isinstance(frame, (LLMFullResponseEndFrame, StartInterruptionFrame)):
+            # An interrupted reply is kept up to where it was cut off
+            reply = self.memory.end_assistant()
+            if reply:
+                logger.debug("🤖 Finley responds: %s", reply)
+                if self.events:
+                    self.events.emit(
+                        "transcript", role="assistant", text=reply,
+                        interrupted=isinstance(frame, StartInterruptionFrame),
+                    )
+        
+        await self.push_frame(frame, direction)
+
+class TTSPhraseCache(FrameProcessor):
+    """Replays cached audio for a reply's opening sentences instead of sending them to TTS
+    
+    Only the opening run of cached sentences is replayed: once a sentence goes to the TTS
+    service, the rest of the reply has to come from it too or the two audio streams would
+    interleave. Sentences that keep coming back are synthesized for the cache in the background.
+    """
+    
+    def __init__(
+        self,
+        cache: PhraseAudioCache,
+        voice_id: str,
+        model_id: str,
+        sample_rate: int,
+        synthesize: Optional[Synthesizer] = None,
+        report=None,
+    ):
+        super().__init__()
+        self.cache = cache
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.sample_rate = sample_rate
+        self.synthesize = synthesize
+        self.report = report
+        self._reset()
+        
+    def _reset(self):
+        self._text = ""           # Reply text not yet split into sentences
+        self._replaying = True    # Still inside the reply's cached opening
+        self._replay_started = False
+        
+    def _key(self, sentence: str) -> str:
+        return phrase_key(sentence, self.voice_id, self.model_id, self.sample_rate)
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        if direction == FrameDirection.DOWNSTREAM and isinstance(frame, TextFrame) and not isinstance(
+            frame, (TranscriptionFrame, InterimTranscriptionFrame)
+        ):
+            await self._handle_text(frame)
+            return
+        
+        if isinstance(frame, LLMFullResponseEndFrame):
+            # The reply's last sentence may lack closing punctuation
+            last, self._text = self._text, ""
+            await self._handle_sentences([last] if last.strip() else [])
+            await self._end_replay()
+            self._reset()
+        elif isinstance(frame, (LLMFullResponseStartFrame, StartInterruptionFrame)):
+            self._reset()
+        
+        await self.push_frame(frame, direction)
+        
+    async def _handle_text(self, frame: TextFrame):
+        self._text += frame.text
+        sentences, self._text = split_sentences(self._text)
+        if not self._replaying:
+            # Streaming straight to TTS; sentences are only counted for cache admission
+            await self.push_frame(frame)
+        await self._handle_sentences(sentences)
+        if self._replaying and self._text.strip() and not self.cache.might_start(self._text):
+            # No cached phrase starts like this; don't hold text back from TTS
+            await self._end_replay()
+            self._replaying = False
+            await self.push_frame(TextFrame(self._text))
+        
+    async def _handle_sentences(self, sentences: List[str]):
+        for index, sentence in enumerate(sentences):
+            key = self._key(sentence)
+            if self._replaying:
+                audio, outcome = self.cache.lookup(key)
+                if self.report:
+                    self.report(outcome)
+                if audio is not None:
+                    await self._replay(audio)
+                    continue
+                # First uncached sentence: TTS speaks it and everything after it, in order
+                await self._end_replay()
+                self._replaying = False
+                for text in sentences[index:]:
+                    await self.push_frame(TextFrame(text + " "))
+                if self._text:
+                    await self.push_frame(TextFrame(self._text))
+            elif self.cache.contains(key):
+                continue
+            if self.synthesize and self.cache.should_fill(key):
+                self.cache.schedule_fill(key, sentence, self.synthesize)
+            
+    async def _replay(self, audio):
+        if not self._replay_started:
+            self._replay_started = True
+            await self.push_frame(TTSStartedFrame())
+        # 100ms frames, like a streaming TTS would deliver them
+        chunk = self.sample_rate * 2 // 10
+        for offset in range(0, len(audio), chunk):
+            await self.push_frame(TTSAudioRawFrame(audio[offset:offset + chunk], self.sample_rate, 1))
+            
+    async def _end_replay(self):
+        if self._replay_started:
+            self._replay_started = False
+            await self.push_frame(TTSStoppedFrame())
+
+class ClauseAggregator(FrameProcessor):
+    """Hands LLM text to TTS in clause-sized chunks so speech starts before the sentence ends"""
+    
+    def __init__(self, policy: FlushPolicy):
+        super().__init__()
+        self.chunker = ClauseChunker(policy)
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        if direction == FrameDirection.DOWNSTREAM and isinstance(frame, TextFrame) and not isinstance(
+            frame, (TranscriptionFrame, InterimTranscriptionFrame)
+        ):
+            for chunk in self.chunker.feed(frame.text):
+                await self.push_frame(TextFrame(chunk))
+            return
+        
+        if isinstance(frame, LLMFullResponseEndFrame):
+            remainder = self.chunker.flush()
+            if remainder:
+                await self.push_frame(TextFrame(remainder))
+        elif isinstance(frame, StartInterruptionFrame):
+            self.chunker.reset()
+        
+        await self.push_frame(frame, direction)
+
+class SpeculationGate(FrameProcessor):
+    """Holds LLM output produced for a speculative turn until the final transcript confirms it"""
+    
+    def __init__(self):
+        super().__init__()
+        self._holding = False
+        self._held: List[Tuple[Frame, FrameDirection]] = []
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        if isinstance(frame, SpeculationFrame):
+            self._holding = frame.hold
+            held, self._held = self._held, []
+            if not frame.hold:
+                for held_frame, held_direction in held:
+                    await self.push_frame(held_frame, held_direction)
+            return
+        
+        if isinstance(frame, StartInterruptionFrame):
+            # Cancelled speculation: its output is never spoken
+            self._holding = False
+            self._held = []
+        elif self._holding and direction == FrameDirection.DOWNSTREAM and not isinstance(frame, SystemFrame):
+            self._held.append((frame, direction))
+            return
+        
+        await self.push_frame(frame, direction)
+
+class TTSAudioConditioning(FrameProcessor):
+    """Trims dead air, evens out loudness and resamples TTS audio on its way to the transport"""
+    
+    def __init__(self, conditioner: AudioConditioner):
+        super().__init__()
+        self.conditioner = conditioner
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        if direction != FrameDirection.DOWNSTREAM:
+            await self.push_frame(frame, direction)
+            return
+        
+        if isinstance(frame, TTSAudioRawFrame) and frame.num_channels == 1:
+            await self._push_audio(frame, self.conditioner.process(frame.audio, frame.sample_rate))
+            return
+        if isinstance(frame, TTSStartedFrame):
+            self.conditioner.start_utterance()
+        elif isinstance(frame, TTSStoppedFrame):
+            await self._push_audio(None, self.conditioner.end_utterance())
+        elif isinstance(frame, StartInterruptionFrame):
+            self.conditioner.reset()
+        
+        await self.push_frame(frame, direction)
+        
+    async def _push_audio(self, frame: Optional[TTSAudioRawFrame], chunks):
+        for audio, sample_rate in chunks:
+            if frame is not None and audio is frame.audio and sample_rate == frame.sample_rate:
+                await self.push_frame(frame)  # Unchanged: no copy
+            else:
+                await self.push_frame(TTSAudioRawFrame(audio, sample_rate, 1))
+
+class LatencyTap(FrameProcessor):
+    """Pass-through processor that timestamps turn milestones as frames go by"""
+    
+    def __init__(self, tracker: TurnLatencyTracker, marks: List[Tuple[Type[Frame], str]]):
+        super().__init__()
+        self.tracker = tracker
+        self.marks = marks
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        if direction == FrameDirection.DOWNSTREAM:
+            for frame_type, mark in self.marks:
+                if isinstance(frame, frame_type):
+                    self.tracker.mark(mark)
+                    break
+        
+        await self.push_frame(frame, direction)
+
+class SessionRecorderTap(FrameProcessor):
+    """Pass-through processor that records inbound audio and its timing for offline replay"""
+    
+    def __init__(self, recorder: SessionRecorder):
+        super().__init__()
+        self.recorder = recorder
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        if isinstance(frame, InputAudioRawFrame):
+            self.recorder.write(frame.audio, frame.sample_rate, frame.num_channels)
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            self.recorder.close()
+            logger.info(f"📼 Recorded {self.recorder.frames} audio frames to {self.recorder.path}")
+        
+        await self.push_frame(frame, direction)
+
+# Pipecat metrics -> session event names
+METRIC_EVENTS = {
+    TTFBMetricsData: "ttfb",
+    ProcessingMetricsData: "processing",
+    LLMUsageMetricsData: "llm_usage",
+    TTSUsageMetricsData: "tts_usage",
+}
+
+class SessionEventTap(LatencyTap):
+    """LatencyTap that also reports turn boundaries and usage metrics to the event sink
+    
+    Takes the place of the last LatencyTap, right before the output transport, so a session
+    with an event sink runs no extra stage: user speech and metrics frames pass it going
+    downstream, and the transport's bot speaking frames going upstream.
+    """
+    
+    def __init__(self, events: SessionEvents, tracker: TurnLatencyTracker, marks: List[Tuple[Type[Frame], str]]):
+        super().__init__(tracker, marks)
+        self.events = events
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        if not isinstance(frame, AudioRawFrame):
+            self._report(frame, direction)
+        await super().process_frame(frame, direction)
+        
+    def _report(self, frame: Frame, direction: FrameDirection):
+        if isinstance(frame, MetricsFrame):
+            for data in frame.data:
+                event = METRIC_EVENTS.get(type(data))
+                if event:
+                    self.events.emit(event, **data.model_dump(exclude_none=True))
+        elif isinstance(frame, UserStartedSpeakingFrame):
+            self.events.emit("user_started_speaking")
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            self.events.emit("user_stopped_speaking")
+        elif isinstance(frame, BotStartedSpeakingFrame) and direction == FrameDirection.UPSTREAM:
+            self.events.emit("bot_started_speaking")
+        elif isinstance(frame, BotStoppedSpeakingFrame) and direction == FrameDirection.UPSTREAM:
+            self.events.emit("bot_stopped_speaking")
+        elif isinstance(frame, StartInterruptionFrame):
+            self.events.emit("interruption")
+        elif isinstance(frame, StartFrame):
+            self.events.emit("session_started")
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            self.events.emit("session_ended", cancelled=isinstance(frame, CancelFrame))
+
+@dataclass(frozen=True)
+class FailoverFrames:
+    """Which frames drive failover between the services of one kind"""
+    gated: Tuple[Type[Frame], ...]  # Only the active service receives these
+    opens: Type[Frame]              # Starts a turn
+    requests: Type[Frame]           # Starts the clock on the active service
+    responses: Type[Frame]          # Its answer
+
+STT_FAILOVER = FailoverFrames(
+    gated=(AudioRawFrame, UserStartedSpeakingFrame, UserStoppedSpeakingFrame),
+    opens=UserStartedSpeakingFrame,
+    requests=UserStoppedSpeakingFrame,
+    responses=TranscriptionFrame,
+)
+
+TTS_FAILOVER = FailoverFrames(
+    gated=(TextFrame, TTSSpeakFrame),
+    opens=LLMFullResponseStartFrame,
+    requests=TextFrame,
+    responses=TTSAudioRawFrame,
+)
+
+class RouteGate(FrameProcessor):
+    """Sits in front of one failover service; feeds it work only while it is the active one"""
+    
+    def __init__(self, router: ServiceRouter, route: str, frames: FailoverFrames):
+        super().__init__()
+        self.router = router
+        self.route = route
+        self.frames = frames
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        if direction == FrameDirection.UPSTREAM:
+            if isinstance(frame, ErrorFrame):
+                self.router.failed(self.route, frame.error)
+            await self.push_frame(frame, direction)
+            return
+        
+        active = self.router.active == self.route
+        if active:
+            if isinstance(frame, StartInterruptionFrame):
+                self.router.cancel()
+            elif isinstance(frame, self.frames.opens):
+                self.router.open()
+            elif isinstance(frame, self.frames.requests):
+                self.router.request()
+        elif isinstance(frame, self.frames.gated):
+            return
+        
+        await self.push_frame(frame, direction)
+
+class RouteMonitor(FrameProcessor):
+    """Sits behind one failover service and reports its answers to the router"""
+    
+    def __init__(self, router: ServiceRouter, route: str, frames: FailoverFrames):
+        super().__init__()
+        self.router = router
+        self.route = route
+        self.frames = frames
+        
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        
+        if direction == FrameDirection.DOWNSTREAM and isinstance(frame, self.frames.responses):
+            self.router.answer(self.route)
+        
+        await self.push_frame(frame, direction)
+
+class FailoverBranches(ParallelPipeline):
+    """ParallelPipeline whose duplicate filter only remembers recent frames
+    
+    Failover branches live as long as the call and pass every audio frame, so the
+    unbounded set of seen frame ids would grow for the whole session.
+    """
+    
+    def __init__(self, *branches, remember: int = 4096):
+        super().__init__(*branches)
+        self._recent_ids = deque(maxlen=remember)
+        
+    async def _parallel_push_frame(self, frame: Frame, direction: FrameDirection):
+        if frame.id in self._seen_ids:
+            return
+        if len(self._recent_ids) == self._recent_ids.maxlen:
+            self._seen_ids.discard(self._recent_ids[0])
+        self._recent_ids.append(frame.id)
+        self._seen_ids.add(frame.id)
+        await self.push_frame(frame, direction)
+
+def failover_service(
+    kind: str,
+    services: List[Tuple[Provider, Any]],
+    frames: FailoverFrames,
+    early_answers: bool = False,
+    on_switch=None,
+) -> FrameProcessor:
+    """The service itself when there is only one provider, else a branch per provider behind a router"""
+    if len(services) == 1:
+        return services[0][1]
+    router = ServiceRouter(
+        kind,
+        [provider.name for provider, _ in services],
+        timeout=float(os.getenv("PIPECAT_PROVIDER_TIMEOUT", "3")),
+        early_answers=early_answers,
+        report=lambda event, outcome: emit_event(event, outcome=outcome),
+        on_switch=on_switch,
     )
+    logger.info(f"{KIND_ICONS[kind]} Failover order: {', '.join(p.label for p, _ in services)}, starting on {router.active}")
+    return FailoverBranches(*[
+        [RouteGate(router, provider.name, frames), service, RouteMonitor(router, provider.name, frames)]
+        for provider, service in services
+    ])
+
+def build_spending_tools(
+    user_id: Optional[str], resources: Optional[SharedBotResources] = None
+) -> Optional[SpendingTools]:
+    """Spending tools over the user's stored transactions, or None for a session without a user id
+
+    An access token alone is not enough: transactions are stored per Finley user, and the
+    backend falls back to its test user (or rejects the call) when no id is given.
+    """
+    if not user_id:
+        return None
 
-    # Speech-to-Text with Deepgram (or fallback to OpenAI Whisper)
-    stt = None
-    if os.getenv("DEEPGRAM_API_KEY"):
-        logger.info("🎤 Using Deepgram for speech-to-text")
-        stt = DeepgramSTTService(
-            api_key=os.getenv("DEEPGRAM_API_KEY"),
-            model="nova-2-general",
-            language="en",
+    async def load_spending_index() -> SpendingIndex:
+        transactions = await fetch_transactions(
+            user_id, session=resources.http_session if resources else None
         )
-    elif os.getenv("OPENAI_API_KEY"):
-        logger.info("🎤 Using OpenAI Whisper for speech-to-text") 
-        from pipecat.services.openai import OpenAISTTService
-        stt = OpenAISTTService(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="whisper-1"
+        # Building is CPU-bound; keep other sessions in this process responsive
+        return await asyncio.get_running_loop().run_in_executor(
+            None, SpendingIndex.from_transactions, transactions
         )
-    else:
-        raise ValueError("Either DEEPGRAM_API_KEY or OPENAI_API_KEY required for STT")
 
-    # Language Model - OpenAI or compatible
-    if not os.getenv("OPENAI_API_KEY") and not os.getenv("GOOGLE_AI_API_KEY"):
-        raise ValueError("OPENAI_API_KEY or GOOGLE_AI_API_KEY required for LLM")
-        
-    if os.getenv("OPENAI_API_KEY"):
-        logger.info("🧠 Using OpenAI for language model")
-        llm = OpenAILLMService(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="gpt-4o-mini",  # Fast model for real-time conversation
-        )
+    return SpendingTools(load_spending_index)
+
+def build_financial_assistant_task(
+    room_url: str,
+    token: str,
+    access_token: Optional[str] = None,
+    vad_analyzer: Optional["SileroVADAnalyzer"] = None,
+    resources: Optional[SharedBotResources] = None,
+    user_id: Optional[str] = None,
+    flush_policy: Optional[FlushPolicy] = None,
+):
+    """Build the transport and pipeline task for one bot session without running it"""
+    
+    if resources:
+        vad_analyzer = resources.vad_analyzer()
+
+    # Each service comes from the provider PIPECAT_<KIND>_PROVIDER names, or the first one
+    # whose API keys are set; only the chosen providers are ever imported
+    if vad_analyzer is None:
+        _, vad_analyzer = create_service("vad")
+    # End-of-speech silence tuned to how this user pauses, within PIPECAT_VAD_*_STOP_MS
+    vad_analyzer = adaptive_vad_from_env(vad_analyzer)
+    # Sessions started with transport=websocket stream PCM through the node instead of a Daily room
+    transport_options = dict(
+        room_url=room_url, token=token, bot_name="Finley Financial Assistant", vad_analyzer=vad_analyzer
+    )
+    if is_relay_room(room_url):
+        transport = build_service(PROVIDERS["transport"]["websocket"], **transport_options)
     else:
-        # Use Google AI as fallback (would need to implement custom service)
-        logger.info("🧠 Using Google AI for language model")  
-        from pipecat.services.openai import OpenAILLMService
-        llm = OpenAILLMService(
-            api_key=os.getenv("GOOGLE_AI_API_KEY"),
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-            model="gemini-2.0-flash-exp",
+        _, transport = create_service("transport", **transport_options)
+
+    # Other providers with keys set stand by for failover; latency metrics follow the active one
+    served_by: Dict[str, str] = {}
+    endpointer = vad_analyzer.endpointer if isinstance(vad_analyzer, AdaptiveVADAnalyzer) else None
+    served_by["vad"] = "adaptive" if endpointer else "fixed"
+    stt_services = create_services("stt", resources)
+    stt_provider = stt_services[0][0]
+    served_by["stt"] = stt_provider.name
+    logger.info(f"{KIND_ICONS['stt']} Using {stt_provider.label} for speech-to-text")
+    stt = failover_service(
+        "stt", stt_services, STT_FAILOVER,
+        early_answers=True,  # Finals can land before VAD reports the stop
+        on_switch=lambda name: served_by.__setitem__("stt", name),
+    )
+
+    llm_providers = route_providers("llm")
+    routed_client = None
+    if len(llm_providers) > 1:
+        # Requests fail over (and optionally hedge) to the next chat endpoint by health;
+        # the next endpoint replaces the client's own retries
+        llm_routes = []
+        for provider in llm_providers:
+            client, model = chat_client(provider.name, resources)
+            llm_routes.append(ChatRoute(provider.name, client.with_options(max_retries=0), model))
+        hedge_ms = float(os.getenv("PIPECAT_LLM_HEDGE_MS", "0"))
+        routed_client = RoutedChatClient(
+            llm_routes,
+            hedge_after=hedge_ms / 1000 if hedge_ms > 0 else None,
+            first_token_timeout=float(os.getenv("PIPECAT_LLM_FIRST_TOKEN_TIMEOUT", "5")),
+            report=lambda event, outcome: emit_event(event, outcome=outcome),
         )
+        logger.info(f"{KIND_ICONS['llm']} LLM routes: {', '.join(p.label for p in llm_providers)}"
+                    + (f", hedging after {hedge_ms:.0f}ms" if hedge_ms > 0 else ""))
+    llm_provider, llm = create_service("llm", resources, client=routed_client)
+    served_by["llm"] = llm_provider.name
+    logger.info(f"{KIND_ICONS['llm']} Using {llm_provider.label} for language model")
 
-    # Text-to-Speech with Cartesia (high-quality, low-latency)
-    if not os.getenv("CARTESIA_API_KEY"):
-        raise ValueError("CARTESIA_API_KEY required for TTS")
-        
-    logger.info("🔊 Using Cartesia for text-to-speech")
-    tts = CartesiaTTSService(
-        api_key=os.getenv("CARTESIA_API_KEY"),
-        voice_id="a0e99841-438c-4a64-b679-ae501e7d6091",  # Professional female voice
-        model_id="sonic-multilingual",
-        sample_rate=24000,
+    tts_voice = {
+        "voice_id": "a0e99841-438c-4a64-b679-ae501e7d6091",  # Professional female voice
+        "model_id": "sonic-multilingual",
+        "sample_rate": 24000,
+    }
+    # ClauseAggregator decides when text is spoken, so TTS must not re-aggregate sentences
+    tts_services = create_services("tts", resources, aggregate_sentences=False, **tts_voice)
+    tts_provider = tts_services[0][0]
+    served_by["tts"] = tts_provider.name
+    logger.info(f"{KIND_ICONS['tts']} Using {tts_provider.label} for text-to-speech")
+    tts = failover_service(
+        "tts", tts_services, TTS_FAILOVER, on_switch=lambda name: served_by.__setitem__("tts", name)
     )
+    flush_policy = flush_policy or parse_flush_policy(os.getenv("PIPECAT_TTS_FLUSH_POLICY", "clause"))
+    
+    # Repeated phrases replay from the cache instead of a Cartesia round trip
+    phrase_cache = None
+    if os.getenv("PIPECAT_TTS_CACHE", "true").lower() == "true" and tts_provider.name == "cartesia":
+        phrase_cache = TTSPhraseCache(
+            tts_cache,
+            synthesize=cartesia_synthesizer(
+                os.getenv("CARTESIA_API_KEY"),
+                session_provider=(lambda: resources.http_session) if resources else None,
+                **tts_voice,
+            ),
+            report=lambda outcome: emit_event("tts_cache", outcome=outcome),
+            **tts_voice,
+        )
+
+    # Silence trimming, loudness and resampling between TTS and the transport
+    conditioner = conditioner_from_env()
+
+    # One token-budgeted conversation store for user and assistant turns
+    memory = ConversationMemory(token_budget=int(os.getenv("PIPECAT_CONTEXT_TOKEN_BUDGET", "1200")))
+
+    # Opt-in: start the LLM on stable interim transcripts (only for STT providers that stream them)
+    speculation = None
+    if os.getenv("PIPECAT_SPECULATIVE_LLM", "false").lower() == "true" and stt_provider.interim_transcripts:
+        speculation = SpeculationController(
+            stable_interims=int(os.getenv("PIPECAT_SPECULATION_STABLE_INTERIMS", "2")),
+            report=lambda outcome: emit_event("speculation", outcome=outcome),
+        )
+        logger.info("🔮 Speculative LLM generation enabled")
+
+    # Spending questions are answered by function calls over a per-session transaction index
+    spending_tools = build_spending_tools(user_id, resources)
+    if spending_tools:
+        spending_tools.register(llm)
 
-    # Context management
-    context = OpenAILLMContext()
-    context_aggregator = llm.create_context_aggregator(context)
+    # Opt-in transcripts, turn boundaries and usage as batched gzip JSONL, written off the event loop
+    events = session_events_from_env(room_url.rstrip("/").rsplit("/", 1)[-1])
 
     # Custom financial assistant processor
-    financial_processor = FinancialAssistantProcessor(access_token)
+    financial_processor = FinancialAssistantProcessor(
+        access_token, memory, financial_cache, SPENDING_TOOLS if spending_tools else None, speculation, events
+    )
+
+    def report_turn(record: Dict):
+        emit_event("turn_metrics", **record)
+        if events:
+            events.emit("turn_metrics", **record)
+
+    # Per-turn stage timestamps, reported to the manager's /metrics endpoint
+    latency = TurnLatencyTracker(
+        served_by,
+        report_turn,
+        endpointing=(lambda: endpointer.last_turn) if endpointer else (lambda: (vad_analyzer.params.stop_secs, None)),
+    )
+
+    # Opt-in recording of inbound audio for replay by benchmarks/replay_load.py
+    recorder = session_recorder_from_env(room_url.rstrip("/").rsplit("/", 1)[-1])
+
+    output_marks = [(TTSStartedFrame, "tts_started"), (TTSAudioRawFrame, "first_audio")]
 
     # Create the pipeline - order is crucial for proper data flow
-    pipeline = Pipeline([
+    stages = [
         transport.input(),           # Receive audio from user
+        *([SessionRecorderTap(recorder)] if recorder else []),  # Record it with arrival times
+        LatencyTap(latency, [(UserStoppedSpeakingFrame, "user_stopped_speaking")]),
         stt,                        # Convert speech to text
+        LatencyTap(latency, [(TranscriptionFrame, "transcription")]),
         financial_processor,        # Process with financial context
         llm,                        # Generate AI response
+        SpeculationGate(),          # Hold speculative responses until the final transcript
+        LatencyTap(latency, [(TextFrame, "llm_first_token")]),
+        AssistantTurnAggregator(memory, events),  # Store each reply as one turn
+        *([phrase_cache] if phrase_cache else []),  # Replay cached phrases
+        ClauseAggregator(flush_policy),  # Clause-sized chunks for TTS
         tts,                        # Convert response to speech
+        *([TTSAudioConditioning(conditioner)] if conditioner else []),  # Trim dead air, even loudness
+        # Also reports turn boundaries and usage to the event sink, when there is one
+        SessionEventTap(events, latency, output_marks) if events else LatencyTap(latency, output_marks),
         transport.output(),         # Send audio to user
-        context_aggregator.assistant()  # Store context
-    ])
+    ]
+
+    # Opt-in per-stage frame timing and loop lag trace; unprofiled sessions run the stages as they are
+    profiler = frame_profiler_from_env(room_url.rstrip("/").rsplit("/", 1)[-1])
+    pipeline = Pipeline(profiler.instrument(stages) if profiler else stages)
 
     # Pipeline configuration
     task = PipelineTask(
@@ -211,44 +897,127 @@ async def create_financial_assistant_bot(room_url: str, token: str, access_token
         ),
     )
 
+    return transport, task, spending_tools
+
+async def create_financial_assistant_bot(
+    room_url: str,
+    token: str,
+    access_token: Optional[str] = None,
+    vad_analyzer: Optional["SileroVADAnalyzer"] = None,
+    resources: Optional[SharedBotResources] = None,
+    user_id: Optional[str] = None,
+    flush_policy: Optional[FlushPolicy] = None,
+):
+    """Create and run the Pipecat financial assistant bot"""
+    
+    # Start loading financial data while the transport connects
+    financial_cache.prefetch(access_token)
+    
+    transport, task, spending_tools = build_financial_assistant_task(
+        room_url, token, access_token, vad_analyzer, resources, user_id, flush_policy
+    )
+    if spending_tools:
+        spending_tools.start()
+
     # Initialize transport
     await transport.start(task)
 
-    # Run the pipeline
-    runner = PipelineRunner()
+    # Run the pipeline; a multi-session host owns signal handling itself
+    runner = PipelineRunner(handle_sigint=resources is None)
     await runner.run(task)
 
+async def run_worker():
+    """Warm up, then wait for the manager's worker pool to hand over a session"""
+    # Import the selected providers and load the VAD model before taking a session
+    preload()
+    _, vad_analyzer = create_service("vad")
+    announce_worker_ready()
+
+    job = await read_worker_job()
+    logger.info(f"🤝 Worker received room: {job.room_url}")
+    await create_financial_assistant_bot(
+        job.room_url, job.token, job.access_token, vad_analyzer, user_id=job.user_id
+    )
+
+async def run_host():
+    """Serve many bot sessions from this process, sharing models and HTTP clients"""
+    preload()
+    resources = SharedBotResources(create_service("vad")[1])
+
+    async def run_session(job: BotJob):
+        await create_financial_assistant_bot(
+            job.room_url, job.token, job.access_token, resources=resources, user_id=job.user_id
+        )
+
+    try:
+        await BotHost(run_session).run()
+    finally:
+        await resources.close()
+
+async def profile_startup():
+    """Report import and init time per component for one session, without joining the room"""
+    preload()
+    _, vad_analyzer = create_service("vad")
+    with startup_profile.measure("session", "build"):
+        build_financial_assistant_task("https://profile.daily.co/startup", "profile-token", vad_analyzer=vad_analyzer)
+    print(startup_profile.report())
+
 async def main():
     parser = argparse.ArgumentParser(description="Finley Financial Assistant Voice AI Bot")
-    parser.add_argument("-u", "--url", type=str, required=True, help="Daily.co room URL")
-    parser.add_argument("-t", "--token", type=str, required=True, help="Daily.co access token")
+    parser.add_argument("-u", "--url", type=str, help="Daily.co room URL")
+    parser.add_argument("-t", "--token", type=str, help="Daily.co access token")
     parser.add_argument("-a", "--access-token", type=str, help="Plaid access token for financial data")
+    parser.add_argument("--user-id", type=str, help="Finley user id whose stored transactions back the spending tools")
+    parser.add_argument("--flush-policy", type=str, help="When LLM text goes to TTS: sentence, clause or eager, with optional overrides like clause:first_max_words=5 (default: PIPECAT_TTS_FLUSH_POLICY or clause)")
+    parser.add_argument("--worker", action="store_true", help="Run as a pre-warmed pool worker that receives its room over stdin")
+    parser.add_argument("--host", action="store_true", help="Run many sessions in this process, receiving them over stdin")
+    parser.add_argument("--profile-startup", action="store_true", help="Print import and init time per component for one session, then exit")
+    parser.add_argument("--record-sessions", type=str, metavar="DIR", help="Record each session's inbound audio with its timing to DIR for replay (default: PIPECAT_RECORD_SESSIONS_DIR)")
+    parser.add_argument("--event-log", type=str, metavar="DIR", help="Write transcripts, turn boundaries and usage metrics as rotated gzip JSONL to DIR (default: PIPECAT_EVENT_LOG_DIR)")
+    parser.add_argument("--profile-frames", type=str, metavar="DIR", help="Write a per-stage frame timing and event-loop lag trace for each session to DIR (default: PIPECAT_FRAME_PROFILE_DIR)")
     
     args = parser.parse_args()
+    if not (args.worker or args.host or args.profile_startup) and not (args.url and args.token):
+        parser.error("--url and --token are required unless running with --worker, --host or --profile-startup")
+    try:
+        flush_policy = parse_flush_policy(args.flush_policy) if args.flush_policy else None
+    except ValueError as e:
+        parser.error(str(e))
+    if args.profile_frames:
+        os.environ[PROFILE_DIR_ENV] = args.profile_frames
+    if args.record_sessions:
+        os.environ[RECORD_DIR_ENV] = args.record_sessions
+    if args.event_log:
+        os.environ[EVENT_LOG_DIR_ENV] = args.event_log
 
-    # Validate required environment variables
-    required_vars = ["CARTESIA_API_KEY"]
-    stt_vars = ["DEEPGRAM_API_KEY", "OPENAI_API_KEY"]
-    llm_vars = ["OPENAI_API_KEY", "GOOGLE_AI_API_KEY"]
-    
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
-    if missing_vars:
-        logger.error(f"❌ Missing required environment variables: {missing_vars}")
-        return
-        
-    if not any(os.getenv(var) for var in stt_vars):
-        logger.error(f"❌ At least one STT service required: {stt_vars}")
-        return
-        
-    if not any(os.getenv(var) for var in llm_vars):
-        logger.error(f"❌ At least one LLM service required: {llm_vars}")
-        return
+    # Every service kind needs a provider whose environment variables are set
+    for kind in PROVIDERS:
+        try:
+            select_provider(kind)
+        except ValueError as e:
+            logger.error(f"❌ {e}")
+            return
 
-    logger.info("🚀 Starting Finley Financial Assistant Bot")
-    logger.info(f"🏠 Room: {args.url}")
-    
     try:
-        await create_financial_assistant_bot(args.url, args.token, args.access_token)
+        if args.profile_startup:
+            await profile_startup()
+            return
+
+        if args.worker:
+            logger.info("🔥 Starting Finley bot worker")
+            await run_worker()
+            return
+
+        if args.host:
+            logger.info("🏠 Starting Finley multi-session bot host")
+            await run_host()
+            return
+
+        logger.info("🚀 Starting Finley Financial Assistant Bot")
+        logger.info(f"🏠 Room: {args.url}")
+        await create_financial_assistant_bot(
+            args.url, args.token, args.access_token, user_id=args.user_id, flush_policy=flush_policy
+        )
     except KeyboardInterrupt:
         logger.info("👋 Shutting down bot")
     except Exception as e:
@@ -1,19 +1,27 @@
 #!/usr/bin/env python3
 
 import asyncio
-import subprocess
 import sys
 import os
+import time
 import logging
-from typing import Dict, Optional
+from collections import deque
+from typing import Deque, Dict, Optional
 from dataclasses import dataclass
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.responses import RedirectResponse, JSONResponse, PlainTextResponse, StreamingResponse
 import aiohttp
 from dotenv import load_dotenv
 
+from pipecat_admission import AdmissionRejected
+from pipecat_bot_node import NODE_API_PREFIX, STOP_BOTS_ON_SHUTDOWN, BotCluster, BotNode, create_node_router
+from pipecat_metrics import TurnLatencyMetrics
+from pipecat_session_registry import DEFAULT_REGISTRY_URL, open_registry
+from pipecat_worker_pool import BotJob
+from pipecat_ws_relay import relay_room_url
+
 # Load environment variables
 load_dotenv()
 
@@ -36,33 +44,46 @@ app.add_middleware(
 )
 
 @dataclass
-class BotProcess:
-    process: subprocess.Popen
+class RoomCredentials:
     room_url: str
-    access_token: Optional[str] = None
-
-# Store running bot processes
-bot_processes: Dict[int, BotProcess] = {}
+    user_token: str
+    bot_token: str
+    expires_at: Optional[float] = None  # Unix time after which Daily deletes the room
 
 class DailyRoomManager:
     """Manages Daily.co room creation and tokens"""
     
     def __init__(self):
         self.api_key = os.getenv("DAILY_API_KEY")
+        self.api_url = os.getenv("DAILY_API_URL", "https://api.daily.co/v1").rstrip("/")
+        self._session: Optional[aiohttp.ClientSession] = None
         if not self.api_key:
             logger.warning("⚠️ DAILY_API_KEY not set - room creation will fail")
     
-    async def create_room(self, room_name: Optional[str] = None) -> Dict:
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Long-lived keep-alive session so calls reuse TCP+TLS connections"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=15),
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+    
+    async def create_room(self, room_name: Optional[str] = None, expires_at: Optional[float] = None) -> Dict:
         """Create a Daily.co room"""
         if not self.api_key:
             raise HTTPException(status_code=500, detail="Daily.co API key not configured")
         
-        url = "https://api.daily.co/v1/rooms"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         room_config = {
             "properties": {
                 "max_participants": 2,  # User + Bot
@@ -77,29 +98,24 @@ class DailyRoomManager:
         
         if room_name:
             room_config["name"] = room_name
+        if expires_at:
+            room_config["properties"]["exp"] = int(expires_at)  # Daily deletes the room after this
             
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=room_config) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(f"🏠 Created room: {data['name']}")
-                    return data
-                else:
-                    error_text = await response.text()
-                    logger.error(f"❌ Room creation failed: {response.status} - {error_text}")
-                    raise HTTPException(status_code=response.status, detail=f"Room creation failed: {error_text}")
+        async with self.session.post(f"{self.api_url}/rooms", json=room_config) as response:
+            if response.status == 200:
+                data = await response.json()
+                logger.info(f"🏠 Created room: {data['name']}")
+                return data
+            else:
+                error_text = await response.text()
+                logger.error(f"❌ Room creation failed: {response.status} - {error_text}")
+                raise HTTPException(status_code=response.status, detail=f"Room creation failed: {error_text}")
     
-    async def create_token(self, room_url: str, user_name: str = "user") -> str:
+    async def create_token(self, room_url: str, user_name: str = "user", expires_at: Optional[float] = None) -> str:
         """Create a Daily.co access token for a room"""
         if not self.api_key:
             raise HTTPException(status_code=500, detail="Daily.co API key not configured")
         
-        url = "https://api.daily.co/v1/meeting-tokens"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         token_config = {
             "properties": {
                 "room_name": room_url.split("/")[-1],  # Extract room name from URL
@@ -107,41 +123,203 @@ class DailyRoomManager:
                 "is_owner": False,
             }
         }
+        if expires_at:
+            token_config["properties"]["exp"] = int(expires_at)
+        
+        async with self.session.post(f"{self.api_url}/meeting-tokens", json=token_config) as response:
+            if response.status == 200:
+                data = await response.json()
+                logger.info(f"🎫 Created token for room")
+                return data["token"]
+            else:
+                error_text = await response.text()
+                logger.error(f"❌ Token creation failed: {response.status} - {error_text}")
+                raise HTTPException(status_code=response.status, detail=f"Token creation failed: {error_text}")
+    
+    async def create_credentials(self, room_name: Optional[str] = None, expires_at: Optional[float] = None) -> RoomCredentials:
+        """Create a room, then its user and bot tokens concurrently"""
+        room_data = await self.create_room(room_name, expires_at)
+        room_url = room_data["url"]
+        
+        user_token, bot_token = await asyncio.gather(
+            self.create_token(room_url, "user", expires_at),
+            self.create_token(room_url, "finley_bot", expires_at),
+        )
+        return RoomCredentials(room_url, user_token, bot_token, expires_at)
+
+class DailyRoomCache:
+    """Background-filled stock of ready rooms with user and bot tokens"""
+    
+    def __init__(self, manager: DailyRoomManager, size: int = 0, room_ttl: float = 3600, min_remaining: float = 600):
+        self.manager = manager
+        self.size = max(0, size)
+        self.room_ttl = room_ttl
+        self.min_remaining = min_remaining  # Never hand out a room that expires sooner than this
+        self._rooms: Deque[RoomCredentials] = deque()
+        self._fill_event = asyncio.Event()
+        self._fill_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.fill_errors = 0
+    
+    def _evict_expiring(self):
+        cutoff = time.time() + self.min_remaining
+        while self._rooms and self._rooms[0].expires_at <= cutoff:
+            self._rooms.popleft()
+            self.evicted += 1
+    
+    async def _fill_loop(self):
+        while True:
+            self._evict_expiring()
+            if len(self._rooms) < self.size:
+                try:
+                    credentials = await self.manager.create_credentials(expires_at=time.time() + self.room_ttl)
+                    self._rooms.append(credentials)
+                    continue
+                except Exception as e:
+                    self.fill_errors += 1
+                    logger.warning(f"⚠️ Room cache refill failed: {e}")
+            self._fill_event.clear()
+            try:
+                await asyncio.wait_for(self._fill_event.wait(), timeout=30)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def start(self):
+        if self.size and self._fill_task is None:
+            self._fill_task = asyncio.create_task(self._fill_loop())
+            logger.info(f"🏨 Daily room cache started (size={self.size}, ttl={self.room_ttl:.0f}s)")
+    
+    async def stop(self):
+        if self._fill_task:
+            self._fill_task.cancel()
+            try:
+                await self._fill_task
+            except asyncio.CancelledError:
+                pass
+            self._fill_task = None
+    
+    async def acquire(self, room_name: Optional[str] = None) -> RoomCredentials:
+        """Take a cached room, or provision one directly when the cache is empty or a name is requested"""
+        if room_name is None:
+            self._evict_expiring()
+            if self._rooms:
+                self.hits += 1
+                self._fill_event.set()
+                return self._rooms.popleft()
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=token_config) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(f"🎫 Created token for room")
-                    return data["token"]
-                else:
-                    error_text = await response.text()
-                    logger.error(f"❌ Token creation failed: {response.status} - {error_text}")
-                    raise HTTPException(status_code=response.status, detail=f"Token creation failed: {error_text}")
+        if self.size:
+            self.misses += 1
+        self._fill_event.set()
+        return await self.manager.create_credentials(room_name)
+    
+    def stats(self) -> Dict:
+        return {
+            "size": self.size,
+            "ready": len(self._rooms),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "fill_errors": self.fill_errors,
+        }
 
 # Initialize Daily.co room manager
 daily_manager = DailyRoomManager()
 
+# Pre-provisioned rooms (0 disables the cache and provisions on every request)
+room_cache = DailyRoomCache(
+    daily_manager,
+    size=int(os.getenv("DAILY_ROOM_CACHE_SIZE", "0")),
+    room_ttl=float(os.getenv("DAILY_ROOM_TTL", "3600")),
+)
+
+# "process" runs one bot process per session, "host" packs sessions into one host per core
+BOT_MODE = os.getenv("PIPECAT_BOT_MODE", "process")
+
+# Nodes and their sessions, shared by every manager worker and replica
+registry = open_registry(os.getenv("PIPECAT_REGISTRY_URL", DEFAULT_REGISTRY_URL))
+
+def server_worker_count() -> int:
+    """Worker processes the ASGI server runs this app in, from the command line every worker inherits"""
+    args = sys.argv[1:]
+    for i, arg in enumerate(args):
+        if arg.startswith("--workers="):
+            return int(arg.split("=", 1)[1])
+        if arg in ("--workers", "-w") and i + 1 < len(args):
+            return int(args[i + 1])
+    return int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+# Bots run on nodes; by default a single-worker manager is also one, reachable at PIPECAT_NODE_URL.
+# Several workers would each run a node under the same id and URL, each seeing only its own
+# bots, so they run without one; start nodes with `python pipecat_bot_node.py`.
+MANAGER_WORKERS = server_worker_count()
+EMBEDDED_NODE = os.getenv("PIPECAT_EMBEDDED_NODE", "true" if MANAGER_WORKERS == 1 else "false").lower() == "true"
+if MANAGER_WORKERS > 1:
+    if EMBEDDED_NODE:
+        raise RuntimeError(
+            f"PIPECAT_EMBEDDED_NODE=true needs a single manager worker, not {MANAGER_WORKERS}; "
+            "run bots with pipecat_bot_node.py instead"
+        )
+    logger.info(f"🧩 {MANAGER_WORKERS} manager workers, bots run on separate nodes only")
+local_node = BotNode(
+    registry,
+    node_id=os.getenv("PIPECAT_NODE_ID"),
+    url=os.getenv("PIPECAT_NODE_URL", "http://127.0.0.1:7860"),
+    mode=BOT_MODE,
+) if EMBEDDED_NODE else None
+if local_node:
+    app.include_router(create_node_router(local_node))
+
+# Places sessions on nodes and finds them again by bot id
+cluster = BotCluster(
+    registry,
+    local_node,
+    node_ttl=float(os.getenv("PIPECAT_NODE_TTL", "10")),
+)
+
+# Turn latencies come from the embedded node's bots; standalone nodes serve their own /node/v1/metrics
+turn_metrics = local_node.turn_metrics if local_node else TurnLatencyMetrics()
+
+async def place_session(room_url: str, token: str, access_token: Optional[str] = None, user_id: Optional[str] = None) -> Dict:
+    """Start a bot on the least-loaded node, or fail fast with 429 and Retry-After"""
+    try:
+        started = await cluster.start_session(BotJob(room_url, token, access_token, user_id))
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Voice server at capacity: {e.reason}",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    return started
+
+@app.on_event("startup")
+async def startup_event():
+    """Start the room cache and the embedded node, then pick up the sessions already running"""
+    await room_cache.start()
+    if local_node:
+        await local_node.start()
+    await cluster.start()
+
 @app.get("/")
 async def redirect_to_room():
     """Create a room and redirect browser to Daily.co for quick testing"""
     try:
-        # Create room and tokens
-        room_data = await daily_manager.create_room()
-        room_url = room_data["url"]
-        
-        user_token = await daily_manager.create_token(room_url, "user")
-        bot_token = await daily_manager.create_token(room_url, "finley_bot")
+        # Take a ready room or create room and tokens
+        credentials = await room_cache.acquire()
         
         # Start bot process
-        await start_bot_process(room_url, bot_token)
+        await place_session(credentials.room_url, credentials.bot_token)
         
         # Redirect user to Daily.co room
-        daily_room_url = f"{room_url}?t={user_token}"
+        daily_room_url = f"{credentials.room_url}?t={credentials.user_token}"
         logger.info(f"🔗 Redirecting to: {daily_room_url}")
         
         return RedirectResponse(url=daily_room_url)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Room setup failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -149,24 +327,43 @@ async def redirect_to_room():
 @app.post("/api/v1/bots/start")
 async def start_bot_session(
     room_name: Optional[str] = None,
-    access_token: Optional[str] = None
+    access_token: Optional[str] = None,
+    user_id: Optional[str] = None,
+    transport: str = "daily",
 ):
-    """Start a new voice AI bot session (RTVI-compatible endpoint)"""
+    """Start a new voice AI bot session (RTVI-compatible endpoint)
+
+    transport=websocket skips Daily: the bot streams PCM over `ws_url`, relayed by the
+    node running it (see pipecat_ws_relay.py for the framing).
+    """
+    if transport not in ("daily", "websocket"):
+        raise HTTPException(status_code=400, detail="transport must be daily or websocket")
     try:
-        # Create room and tokens
-        room_data = await daily_manager.create_room(room_name)
-        room_url = room_data["url"]
-        
-        user_token = await daily_manager.create_token(room_url, "user")
-        bot_token = await daily_manager.create_token(room_url, "finley_bot")
+        if transport == "websocket":
+            started = await place_session(relay_room_url(), "", access_token, user_id)
+            node_url = started["node_url"].replace("http", "ws", 1)
+            return {
+                "transport": "websocket",
+                "ws_url": f"{node_url}{NODE_API_PREFIX}/sessions/{started['bot_id']}/audio",
+                "bot_id": started["bot_id"],
+                "config": {
+                    "audio_in_enabled": True,
+                    "audio_out_enabled": True,
+                    "video_out_enabled": False,
+                },
+            }
+
+        # Take a ready room (named rooms are always created on demand)
+        credentials = await room_cache.acquire(room_name)
         
-        # Start bot process
-        bot_pid = await start_bot_process(room_url, bot_token, access_token)
+        # Over capacity, the chosen node queues the start until a slot frees up or its deadline passes
+        started = await place_session(credentials.room_url, credentials.bot_token, access_token, user_id)
         
         return {
-            "room_url": room_url,
-            "token": user_token,
-            "bot_id": bot_pid,
+            "transport": "daily",
+            "room_url": credentials.room_url,
+            "token": credentials.user_token,
+            "bot_id": started["bot_id"],
             "config": {
                 "audio_in_enabled": True,
                 "audio_out_enabled": True,
@@ -174,26 +371,19 @@ async def start_bot_session(
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Bot session start failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/v1/bots/stop")
-async def stop_bot_session(bot_id: int):
-    """Stop a running bot session"""
+async def stop_bot_session(bot_id: str):
+    """Stop a running bot session on whichever node runs it"""
     try:
-        if bot_id not in bot_processes:
+        if not await cluster.stop_session(bot_id):
             raise HTTPException(status_code=404, detail="Bot session not found")
         
-        bot_process = bot_processes[bot_id]
-        bot_process.process.terminate()
-        
-        try:
-            bot_process.process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            bot_process.process.kill()
-        
-        del bot_processes[bot_id]
         logger.info(f"🛑 Stopped bot session {bot_id}")
         
         return {"status": "stopped", "bot_id": bot_id}
@@ -207,6 +397,7 @@ async def stop_bot_session(bot_id: int):
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
+    node = local_node.stats() if local_node else {}
     return {
         "status": "healthy",
         "timestamp": str(asyncio.get_event_loop().time()),
@@ -217,68 +408,86 @@ async def health_check():
             "deepgram_configured": bool(os.getenv("DEEPGRAM_API_KEY")),
             "google_ai_configured": bool(os.getenv("GOOGLE_AI_API_KEY")),
         },
-        "active_bots": len(bot_processes)
+        "active_bots": len(await registry.sessions()),
+        "bot_mode": BOT_MODE,
+        "cluster": await cluster.stats(),
+        "worker_pool": node.get("worker_pool"),
+        "bot_hosts": node.get("bot_hosts"),
+        "room_cache": room_cache.stats(),
+        "turn_latency": turn_metrics.summary(),
+        "llm_speculation": turn_metrics.outcomes.get("speculation", {}),
+        "tts_cache": turn_metrics.outcomes.get("tts_cache", {}),
+        "provider_failover": turn_metrics.outcomes.get("provider_failover", {}),
+        "llm_hedge": turn_metrics.outcomes.get("llm_hedge", {}),
+        "endpointing": turn_metrics.endpointing_summary(),
+        "capacity": node.get("capacity")
     }
 
+@app.get("/api/health/capacity")
+async def capacity_check():
+    """Load balancer probe: 503 while no node can take another session"""
+    capacity = await cluster.stats()
+    return JSONResponse(capacity, status_code=200 if capacity["accepting"] else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus-style turn latency histograms per stage and provider"""
+    gauges = {
+        "finley_active_bots": len(await registry.sessions()),
+        "finley_live_nodes": len(await cluster.live_nodes()),
+        "finley_capacity_headroom_sessions": (await cluster.stats())["headroom"],
+    }
+    if local_node:
+        capacity = local_node.admission.stats()
+        gauges.update({
+            "finley_worker_pool_ready": local_node.worker_pool.stats()["ready"],
+            "finley_admission_queued": capacity["queued"],
+            "finley_admission_rejected": sum(capacity["rejected_total"].values()),
+            "finley_host_cpu_utilization": capacity["host_cpu"],
+        })
+    return turn_metrics.render_prometheus(gauges)
+
 @app.get("/api/v1/bots")
 async def list_bot_sessions():
-    """List all active bot sessions"""
+    """List all active bot sessions across every node"""
     sessions = []
-    for pid, bot_process in bot_processes.items():
+    for record in await registry.sessions():
         sessions.append({
-            "bot_id": pid,
-            "room_url": bot_process.room_url,
-            "has_access_token": bool(bot_process.access_token),
-            "status": "running" if bot_process.process.poll() is None else "stopped"
+            "bot_id": record.bot_id,
+            "node_id": record.node_id,
+            "room_url": record.room_url,
+            "has_access_token": record.has_access_token,
+            "status": "running"
         })
     
     return {"sessions": sessions}
 
-async def start_bot_process(room_url: str, token: str, access_token: Optional[str] = None) -> int:
-    """Start a new Pipecat bot process"""
-    
-    # Command to run the bot
-    cmd = [
-        sys.executable, 
-        "pipecat_server.py",
-        "--url", room_url,
-        "--token", token
-    ]
-    
-    if access_token:
-        cmd.extend(["--access-token", access_token])
-    
-    # Start the process
-    process = subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        env=os.environ.copy()
-    )
+@app.get("/api/v1/bots/{bot_id}/logs")
+async def stream_bot_logs(bot_id: str, tail: int = 100, follow: bool = False):
+    """Stream a bot's recent output, optionally following it until the bot exits"""
+    record = await registry.get_session(bot_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Bot session not found")
     
-    # Store process info
-    bot_processes[process.pid] = BotProcess(
-        process=process,
-        room_url=room_url,
-        access_token=access_token
-    )
+    async def lines():
+        async for line in cluster.follow_logs(record, tail=tail, follow=follow):
+            yield line + "\n"
     
-    logger.info(f"🚀 Started bot process {process.pid} for room {room_url}")
-    return process.pid
+    return StreamingResponse(lines(), media_type="text/plain")
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Clean up bot processes on shutdown"""
-    logger.info("🛑 Shutting down server, stopping all bots...")
+    """Clean up on shutdown; the embedded node's bots are left for the next process to adopt"""
+    logger.info("🛑 Shutting down server...")
     
-    for pid, bot_process in bot_processes.items():
-        try:
-            bot_process.process.terminate()
-            bot_process.process.wait(timeout=3)
-        except:
-            bot_process.process.kill()
+    await room_cache.stop()
+    if local_node:
+        if STOP_BOTS_ON_SHUTDOWN:
+            logger.info("🛑 Stopping all bots on the embedded node...")
+        await local_node.stop(detach=not STOP_BOTS_ON_SHUTDOWN)
     
-    bot_processes.clear()
+    await cluster.close()
+    await daily_manager.close()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import mmap
+import os
+import re
+import struct
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+# File: header, then one record per inbound audio frame
+#   header  magic, format version, recording start (unix seconds)
+#   record  microseconds since the previous frame, PCM bytes, sample rate, channels; then the PCM
+MAGIC = b"FNLYSES\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHd")
+RECORD = struct.Struct("<IIIB")
+
+RECORD_DIR_ENV = "PIPECAT_RECORD_SESSIONS_DIR"
+
+
+@dataclass
+class RecordedFrame:
+    at: float  # Seconds after the first frame
+    sample_rate: int
+    num_channels: int
+    audio: memoryview  # Into the mapped file; valid until the recording is closed
+
+
+class SessionRecorder:
+    """Appends a session's inbound audio frames and their arrival times to one file"""
+
+    def __init__(self, path: str, buffer_bytes: int = 64 * 1024):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.frames = 0
+        self._file = open(path, "wb", buffering=buffer_bytes)
+        self._file.write(HEADER.pack(MAGIC, VERSION, time.time()))
+        self._last: Optional[float] = None
+
+    def write(self, audio: bytes, sample_rate: int, num_channels: int = 1, at: Optional[float] = None):
+        """Record one frame; `at` is a time.monotonic() reading, now by default"""
+        if self._file.closed:
+            return
+        at = time.monotonic() if at is None else at
+        delta_us = 0 if self._last is None else max(0, round((at - self._last) * 1e6))
+        self._last = at
+        self._file.write(RECORD.pack(min(delta_us, 0xFFFFFFFF), len(audio), sample_rate, num_channels))
+        self._file.write(audio)
+        self.frames += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class SessionRecording:
+    """A recorded session, memory-mapped; frames are views into the file, not copies"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.started = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} session recording")
+        self._view = memoryview(self._map)
+
+        # (at, offset, size, sample rate, channels) per frame, from one pass over the record headers
+        self._index: List[tuple] = []
+        offset, at = HEADER.size, 0.0
+        while offset + RECORD.size <= len(self._map):
+            delta_us, size, sample_rate, num_channels = RECORD.unpack_from(self._map, offset)
+            offset += RECORD.size
+            if offset + size > len(self._map):
+                break  # Cut off mid-frame, e.g. the bot was killed
+            at += delta_us / 1e6
+            self._index.append((at, offset, size, sample_rate, num_channels))
+            offset += size
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def duration(self) -> float:
+        return self._index[-1][0] if self._index else 0.0
+
+    def __iter__(self) -> Iterator[RecordedFrame]:
+        for at, offset, size, sample_rate, num_channels in self._index:
+            yield RecordedFrame(at, sample_rate, num_channels, self._view[offset:offset + size])
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+
+def session_recorder_from_env(session: str) -> Optional[SessionRecorder]:
+    """A recorder writing to PIPECAT_RECORD_SESSIONS_DIR, or None when that isn't set"""
+    directory = os.getenv(RECORD_DIR_ENV)
+    if not directory:
+        return None
+    label = re.sub(r"[^\w.-]+", "-", session).strip("-") or "session"
+    return SessionRecorder(os.path.join(directory, f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.fses"))
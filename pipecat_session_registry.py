@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_URL = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'finley-sessions.db')}"
+
+
+@dataclass
+class NodeRecord:
+    """A bot node and the capacity it last reported"""
+    node_id: str
+    url: str  # Base URL of the node API
+    headroom: int = 0
+    active_sessions: int = 0
+    accepting: bool = True
+    heartbeat_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class SessionRecord:
+    """A running bot session; access tokens are never stored here"""
+    bot_id: str
+    node_id: str
+    room_url: str
+    pid: int
+    user_id: Optional[str] = None
+    has_access_token: bool = False
+    started_at: float = field(default_factory=time.time)
+
+
+class SessionRegistry(ABC):
+    """Nodes and the sessions they run, shared by every manager worker and replica
+
+    Each node is the only writer of its own rows: it adds and removes its sessions as they
+    start and end, and re-syncs the full set with every heartbeat. Managers read, place
+    sessions and drop nodes whose heartbeat went stale. Every call is a coroutine, and
+    backends keep their I/O off the event loop that serves the API and the heartbeats.
+    """
+
+    @abstractmethod
+    async def sync_node(self, node: NodeRecord, sessions: Optional[List[SessionRecord]] = None):
+        """Upsert a node's capacity and, when given, replace its session rows with `sessions`"""
+
+    @abstractmethod
+    async def reserve(self, node_id: str):
+        """Count a just-placed session against a node until its next heartbeat"""
+
+    @abstractmethod
+    async def remove_node(self, node_id: str):
+        """Forget a node and every session it ran"""
+
+    @abstractmethod
+    async def get_node(self, node_id: str) -> Optional[NodeRecord]:
+        ...
+
+    @abstractmethod
+    async def nodes(self) -> List[NodeRecord]:
+        ...
+
+    @abstractmethod
+    async def add_session(self, session: SessionRecord):
+        ...
+
+    @abstractmethod
+    async def remove_session(self, bot_id: str):
+        ...
+
+    @abstractmethod
+    async def get_session(self, bot_id: str) -> Optional[SessionRecord]:
+        ...
+
+    @abstractmethod
+    async def sessions(self, node_id: Optional[str] = None) -> List[SessionRecord]:
+        ...
+
+    def close(self):
+        pass
+
+
+class SQLiteSessionRegistry(SessionRegistry):
+    """Registry in one SQLite file in WAL mode, shared by every process on the host"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS nodes (
+            node_id TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            headroom INTEGER NOT NULL,
+            active_sessions INTEGER NOT NULL,
+            accepting INTEGER NOT NULL,
+            heartbeat_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sessions (
+            bot_id TEXT PRIMARY KEY,
+            node_id TEXT NOT NULL,
+            room_url TEXT NOT NULL,
+            pid INTEGER NOT NULL,
+            user_id TEXT,
+            has_access_token INTEGER NOT NULL,
+            started_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS sessions_by_node ON sessions (node_id);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Autocommit; multi-statement writes open their own transaction
+        self._db = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        # Every statement runs on this one thread: a write waiting out the 5s busy timeout
+        # holds up other registry calls, never the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-registry")
+        # Readers never block the writer, and a commit doesn't wait for fsync of the WAL
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+
+    @classmethod
+    def from_url(cls, url: str) -> "SQLiteSessionRegistry":
+        # sqlite:///relative.db or sqlite:////absolute/path.db
+        return cls(url[len("sqlite:///"):])
+
+    def _write_sync(self, statements):
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                self._db.execute(sql, params)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    async def _write(self, statements):
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._write_sync, statements)
+
+    async def _read(self, sql: str, params=()) -> List[sqlite3.Row]:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, lambda: self._db.execute(sql, params).fetchall()
+        )
+
+    @staticmethod
+    def _node(row: sqlite3.Row) -> NodeRecord:
+        return NodeRecord(**{**dict(row), "accepting": bool(row["accepting"])})
+
+    @staticmethod
+    def _session(row: sqlite3.Row) -> SessionRecord:
+        return SessionRecord(**{**dict(row), "has_access_token": bool(row["has_access_token"])})
+
+    @staticmethod
+    def _insert_session(session: SessionRecord):
+        return (
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (session.bot_id, session.node_id, session.room_url, session.pid,
+             session.user_id, int(session.has_access_token), session.started_at),
+        )
+
+    async def sync_node(self, node: NodeRecord, sessions: Optional[List[SessionRecord]] = None):
+        statements = [(
+            "INSERT OR REPLACE INTO nodes VALUES (?, ?, ?, ?, ?, ?)",
+            (node.node_id, node.url, node.headroom, node.active_sessions,
+             int(node.accepting), node.heartbeat_at),
+        )]
+        if sessions is not None:
+            statements.append(("DELETE FROM sessions WHERE node_id = ?", (node.node_id,)))
+            statements += [self._insert_session(s) for s in sessions]
+        await self._write(statements)
+
+    async def reserve(self, node_id: str):
+        await self._write([(
+            "UPDATE nodes SET headroom = headroom - 1, active_sessions = active_sessions + 1 "
+            "WHERE node_id = ?",
+            (node_id,),
+        )])
+
+    async def remove_node(self, node_id: str):
+        await self._write([
+            ("DELETE FROM sessions WHERE node_id = ?", (node_id,)),
+            ("DELETE FROM nodes WHERE node_id = ?", (node_id,)),
+        ])
+
+    async def get_node(self, node_id: str) -> Optional[NodeRecord]:
+        rows = await self._read("SELECT * FROM nodes WHERE node_id = ?", (node_id,))
+        return self._node(rows[0]) if rows else None
+
+    async def nodes(self) -> List[NodeRecord]:
+        return [self._node(row) for row in await self._read("SELECT * FROM nodes ORDER BY node_id")]
+
+    async def add_session(self, session: SessionRecord):
+        await self._write([self._insert_session(session)])
+
+    async def remove_session(self, bot_id: str):
+        await self._write([("DELETE FROM sessions WHERE bot_id = ?", (bot_id,))])
+
+    async def get_session(self, bot_id: str) -> Optional[SessionRecord]:
+        rows = await self._read("SELECT * FROM sessions WHERE bot_id = ?", (bot_id,))
+        return self._session(rows[0]) if rows else None
+
+    async def sessions(self, node_id: Optional[str] = None) -> List[SessionRecord]:
+        if node_id is None:
+            rows = await self._read("SELECT * FROM sessions ORDER BY started_at")
+        else:
+            rows = await self._read("SELECT * FROM sessions WHERE node_id = ? ORDER BY started_at", (node_id,))
+        return [self._session(row) for row in rows]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._db.close()
+
+
+# URL scheme -> factory; a shared store registers itself here
+REGISTRY_BACKENDS: Dict[str, Callable[[str], SessionRegistry]] = {
+    "sqlite": SQLiteSessionRegistry.from_url,
+}
+
+
+def open_registry(url: str = DEFAULT_REGISTRY_URL) -> SessionRegistry:
+    scheme = url.split("://", 1)[0]
+    if scheme not in REGISTRY_BACKENDS:
+        raise ValueError(f"Unsupported session registry '{scheme}', use one of {list(REGISTRY_BACKENDS)}")
+    logger.info(f"🗂️ Session registry: {url}")
+    return REGISTRY_BACKENDS[scheme](url)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import re
+from typing import Callable, Dict, Optional
+
+# Decisions returned to the pipeline
+NONE = "none"        # Nothing to do
+START = "start"      # Start generating on the interim text
+CANCEL = "cancel"    # Drop the running speculative response
+COMMIT = "commit"    # Final transcript matches; release the speculative response
+RESTART = "restart"  # Final transcript differs; drop the speculation and generate normally
+
+# Outcomes reported per speculation
+HIT = "hit"        # Committed on the final transcript
+MISS = "miss"      # Final transcript differed, response regenerated
+WASTED = "wasted"  # Cancelled before any final transcript (the user kept talking)
+
+
+def normalize_transcript(text: str) -> str:
+    """Case, punctuation and spacing differences between interim and final text don't count"""
+    return " ".join(re.sub(r"[^\w\s']", " ", text.lower()).split())
+
+
+class SpeculationController:
+    """Decides when to start an LLM response on interim transcripts and whether to keep it
+
+    An interim transcript is stable once the same normalized text arrived in
+    `stable_interims` consecutive interim results and has at least `min_words` words.
+    """
+
+    def __init__(
+        self,
+        stable_interims: int = 2,
+        min_words: int = 3,
+        report: Optional[Callable[[str], None]] = None,
+    ):
+        self.stable_interims = stable_interims
+        self.min_words = min_words
+        self.report = report
+        self.speculative_text: Optional[str] = None
+        self._last_interim = ""
+        self._repeats = 0
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+
+    @property
+    def active(self) -> bool:
+        return self.speculative_text is not None
+
+    def _outcome(self, outcome: str):
+        if outcome == HIT:
+            self.hits += 1
+        elif outcome == MISS:
+            self.misses += 1
+        else:
+            self.wasted += 1
+        if self.report:
+            self.report(outcome)
+
+    def on_interim(self, text: str) -> str:
+        normalized = normalize_transcript(text)
+        if normalized == self._last_interim:
+            self._repeats += 1
+        else:
+            self._last_interim, self._repeats = normalized, 1
+
+        if self.active and normalized != self.speculative_text:
+            # The user said more (or STT revised itself); this response answers the wrong question
+            self.speculative_text = None
+            self._outcome(WASTED)
+            return CANCEL
+
+        if (
+            self.active
+            or self._repeats < self.stable_interims
+            or len(normalized.split()) < self.min_words
+        ):
+            return NONE
+
+        self.speculative_text = normalized
+        self.started += 1
+        return START
+
+    def on_final(self, text: str) -> str:
+        self._last_interim, self._repeats = "", 0
+        if not self.active:
+            return NONE
+
+        matched = normalize_transcript(text) == self.speculative_text
+        self.speculative_text = None
+        self._outcome(HIT if matched else MISS)
+        return COMMIT if matched else RESTART
+
+    def cancel(self):
+        """The turn was interrupted while a speculative response was running"""
+        self._last_interim, self._repeats = "", 0
+        if self.active:
+            self.speculative_text = None
+            self._outcome(WASTED)
+
+    def stats(self) -> Dict:
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "wasted": self.wasted,
+            "hit_rate": round(self.hits / self.started, 3) if self.started else None,
+        }
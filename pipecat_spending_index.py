@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+
+import asyncio
+import datetime
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+from pipecat_financial_context import BACKEND_URL
+
+logger = logging.getLogger(__name__)
+
+# Mirrors CATEGORY_STRUCTURE in backend/categorization.js
+CATEGORY_STRUCTURE = {
+    "Foundations": ["Housing", "Transportation", "Groceries", "Healthcare", "Utilities", "Insurance", "Debt Payments"],
+    "Delights": ["Fast Food", "Restaurants", "Entertainment", "Sporting Events", "Hobbies", "Travel", "Shopping"],
+    "Nest Egg": ["Emergency Fund", "Retirement", "Investments", "Savings Goals", "Education Fund"],
+    "Wild Cards": ["Home Repair", "Car Repair", "Medical Emergency", "Gifts", "Professional Services", "Miscellaneous", "ATM/Fees"],
+}
+
+UNCATEGORIZED = "Uncategorized"
+CATEGORIES = [*CATEGORY_STRUCTURE, UNCATEGORIZED]
+SUBCATEGORIES = [sub for subs in CATEGORY_STRUCTURE.values() for sub in subs] + [UNCATEGORIZED]
+SUBCATEGORY_PARENT = np.array(
+    [CATEGORIES.index(cat) for cat, subs in CATEGORY_STRUCTURE.items() for _ in subs] + [len(CATEGORIES) - 1],
+    dtype=np.int16,
+)
+
+# Spellings stored in Convex ("wildcards", "nest_egg", ...) -> canonical name
+_CATEGORY_LOOKUP = {name.lower().replace(" ", "").replace("_", ""): i for i, name in enumerate(CATEGORIES)}
+_SUBCATEGORY_LOOKUP = {name.lower(): i for i, name in enumerate(SUBCATEGORIES)}
+
+PERIODS = ["this_month", "last_month", "last_30_days", "last_90_days", "this_year", "all_time"]
+
+DAY_MS = 86_400_000
+
+
+def _category_code(name: Optional[str]) -> int:
+    key = (name or "").lower().replace(" ", "").replace("_", "")
+    return _CATEGORY_LOOKUP.get(key, len(CATEGORIES) - 1)
+
+
+def _subcategory_code(name: Optional[str], category: int) -> int:
+    code = _SUBCATEGORY_LOOKUP.get((name or "").lower(), len(SUBCATEGORIES) - 1)
+    # A subcategory filed under the wrong parent is not trusted
+    return code if SUBCATEGORY_PARENT[code] == category else len(SUBCATEGORIES) - 1
+
+
+def _month_of(days: np.ndarray) -> np.ndarray:
+    """Months since 1970-01 for each day number"""
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int32)
+
+
+def _month_label(month: int) -> str:
+    return str(np.datetime64(int(month), "M"))
+
+
+class SpendingIndex:
+    """Columnar, date-sorted view of one user's spending with per-month rollups
+
+    Only outflows are indexed (Plaid reports money leaving an account as a positive amount).
+    Whole-month questions are answered from the rollup matrices; rolling windows scan the
+    date-sorted slice they cover.
+    """
+
+    def __init__(
+        self,
+        amounts: np.ndarray,
+        days: np.ndarray,
+        categories: np.ndarray,
+        subcategories: np.ndarray,
+        merchants: np.ndarray,
+        merchant_names: List[str],
+    ):
+        order = np.argsort(days, kind="stable")
+        self.amounts = amounts[order].astype(np.float64)
+        self.days = days[order].astype(np.int32)
+        self.categories = categories[order].astype(np.int16)
+        self.subcategories = subcategories[order].astype(np.int16)
+        self.merchants = merchants[order].astype(np.int32)
+        self.merchant_names = merchant_names
+        self._merchant_lookup = {name.lower(): i for i, name in enumerate(merchant_names)}
+
+        months = _month_of(self.days)
+        self.first_month = int(months[0]) if len(months) else 0
+        self.month_count = int(months[-1]) - self.first_month + 1 if len(months) else 0
+        self._month_offsets = months - self.first_month
+
+        # kind -> ((code, month) summed amounts, (code, month) transaction counts)
+        self.rollups = {
+            "category": self._rollup(self.categories, len(CATEGORIES)),
+            "subcategory": self._rollup(self.subcategories, len(SUBCATEGORIES)),
+            "merchant": self._rollup(self.merchants, len(merchant_names)),
+        }
+        self.category_month = self.rollups["category"][0]
+        self.merchant_month = self.rollups["merchant"][0]
+        self.month_totals = self.category_month.sum(axis=0)
+        self.month_counts = self.rollups["category"][1].sum(axis=0)
+
+    def _rollup(self, codes: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        flat = codes.astype(np.int64) * self.month_count + self._month_offsets
+        shape = (size, self.month_count)
+        sums = np.bincount(flat, weights=self.amounts, minlength=size * self.month_count)
+        counts = np.bincount(flat, minlength=size * self.month_count)
+        return sums.reshape(shape), counts.reshape(shape)
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Dict]) -> "SpendingIndex":
+        """Build from Convex transaction records as returned by /api/transactions/list-all"""
+        amounts, days, categories, subcategories, merchants = [], [], [], [], []
+        merchant_names: List[str] = []
+        merchant_codes: Dict[str, int] = {}
+
+        for tx in transactions:
+            amount = tx.get("amount") or 0
+            if amount <= 0:
+                continue
+            raw = tx.get("rawPlaid")
+            try:
+                raw = json.loads(raw) if isinstance(raw, str) else (raw or {})
+            except ValueError:
+                raw = {}
+            date = tx.get("date")
+            if isinstance(date, str):
+                date = datetime.datetime.fromisoformat(date[:10]).replace(tzinfo=datetime.timezone.utc).timestamp() * 1000
+            if date is None:
+                continue
+
+            category = _category_code(tx.get("category") or raw.get("customCategory"))
+            merchant = tx.get("merchant") or tx.get("merchantName") or "Unknown"
+            if merchant not in merchant_codes:
+                merchant_codes[merchant] = len(merchant_names)
+                merchant_names.append(merchant)
+
+            amounts.append(amount)
+            days.append(int(date) // DAY_MS)
+            categories.append(category)
+            subcategories.append(_subcategory_code(tx.get("customSubcategory") or raw.get("customSubcategory"), category))
+            merchants.append(merchant_codes[merchant])
+
+        return cls(
+            np.array(amounts, dtype=np.float64),
+            np.array(days, dtype=np.int32),
+            np.array(categories, dtype=np.int16),
+            np.array(subcategories, dtype=np.int16),
+            np.array(merchants, dtype=np.int32),
+            merchant_names,
+        )
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def resolve(self, name: str) -> Tuple[str, int]:
+        """Map a spoken label to ("category" | "subcategory" | "merchant", code)"""
+        key = name.strip().lower()
+        if key.replace(" ", "").replace("_", "") in _CATEGORY_LOOKUP:
+            return "category", _CATEGORY_LOOKUP[key.replace(" ", "").replace("_", "")]
+        if key in _SUBCATEGORY_LOOKUP:
+            return "subcategory", _SUBCATEGORY_LOOKUP[key]
+        if key in self._merchant_lookup:
+            return "merchant", self._merchant_lookup[key]
+        # Partial merchant names ("starbucks" for "STARBUCKS #1234"), biggest spend wins
+        matches = [i for n, i in self._merchant_lookup.items() if key in n]
+        if matches:
+            return "merchant", max(matches, key=lambda i: self.merchant_month[i].sum())
+        raise KeyError(f"No category, subcategory or merchant called '{name}'")
+
+    def period_bounds(self, period: str, today: Optional[datetime.date] = None) -> Tuple[int, int, bool]:
+        """(first day, day after the last, whole months) for a named period or "YYYY-MM" """
+        today = today or datetime.datetime.now(datetime.timezone.utc).date()
+        day = (today - datetime.date(1970, 1, 1)).days
+        month_start = today.replace(day=1)
+
+        def days_of(d: datetime.date) -> int:
+            return (d - datetime.date(1970, 1, 1)).days
+
+        if period == "this_month":
+            return days_of(month_start), day + 1, True
+        if period == "last_month":
+            previous = (month_start - datetime.timedelta(days=1)).replace(day=1)
+            return days_of(previous), days_of(month_start), True
+        if period == "last_30_days":
+            return day - 29, day + 1, False
+        if period == "last_90_days":
+            return day - 89, day + 1, False
+        if period == "this_year":
+            return days_of(today.replace(month=1, day=1)), day + 1, True
+        if period == "all_time":
+            return -(2**31), 2**31 - 1, True
+        try:
+            start = datetime.date.fromisoformat(f"{period}-01")
+        except ValueError:
+            raise ValueError(f"Unknown period '{period}', use one of {PERIODS} or YYYY-MM")
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+        return days_of(start), days_of(end), True
+
+    def _month_slice(self, start_day: int, end_day: int) -> slice:
+        first = int(_month_of(np.array([max(start_day, -(2**31) + 1)]))[0]) - self.first_month
+        last = int(_month_of(np.array([min(end_day, 2**31 - 2) - 1]))[0]) - self.first_month
+        return slice(max(0, first), max(0, min(self.month_count, last + 1)))
+
+    def _row_slice(self, start_day: int, end_day: int) -> slice:
+        return slice(
+            int(np.searchsorted(self.days, start_day, side="left")),
+            int(np.searchsorted(self.days, end_day, side="left")),
+        )
+
+    def _codes(self, kind: str) -> np.ndarray:
+        return {"category": self.categories, "subcategory": self.subcategories, "merchant": self.merchants}[kind]
+
+    def total(self, name: Optional[str] = None, period: str = "this_month", today: Optional[datetime.date] = None) -> Dict:
+        """Total spend and transaction count, optionally for one category, subcategory or merchant"""
+        start, end, whole_months = self.period_bounds(period, today)
+        kind, code = self.resolve(name) if name else (None, None)
+
+        if whole_months:
+            months = self._month_slice(start, end)
+            if kind is None:
+                total, count = self.month_totals[months].sum(), self.month_counts[months].sum()
+            else:
+                sums, counts = self.rollups[kind]
+                total, count = sums[code, months].sum(), counts[code, months].sum()
+        else:
+            rows = self._row_slice(start, end)
+            amounts = self.amounts[rows]
+            if kind is not None:
+                amounts = amounts[self._codes(kind)[rows] == code]
+            total, count = amounts.sum(), len(amounts)
+
+        return {
+            "label": self._label(kind, code) if kind else "all spending",
+            "period": period,
+            "total": round(float(total), 2),
+            "transactions": int(count),
+        }
+
+    def top_merchants(self, period: str = "this_month", category: Optional[str] = None, limit: int = 5,
+                      today: Optional[datetime.date] = None) -> Dict:
+        start, end, whole_months = self.period_bounds(period, today)
+        if whole_months and not category:
+            totals = self.merchant_month[:, self._month_slice(start, end)].sum(axis=1)
+        else:
+            rows = self._row_slice(start, end)
+            merchants, amounts = self.merchants[rows], self.amounts[rows]
+            if category:
+                kind, code = self.resolve(category)
+                mask = self._codes(kind)[rows] == code
+                merchants, amounts = merchants[mask], amounts[mask]
+            totals = np.bincount(merchants, weights=amounts, minlength=len(self.merchant_names))
+
+        limit = max(1, min(limit, len(totals))) if len(totals) else 0
+        top = np.argpartition(-totals, limit - 1)[:limit] if limit else np.array([], dtype=np.int64)
+        top = top[np.argsort(-totals[top])]
+        return {
+            "period": period,
+            "merchants": [
+                {"merchant": self.merchant_names[i], "total": round(float(totals[i]), 2)}
+                for i in top if totals[i] > 0
+            ],
+        }
+
+    def category_breakdown(self, period: str = "this_month", today: Optional[datetime.date] = None) -> Dict:
+        start, end, whole_months = self.period_bounds(period, today)
+        if whole_months:
+            totals = self.category_month[:, self._month_slice(start, end)].sum(axis=1)
+        else:
+            rows = self._row_slice(start, end)
+            totals = np.bincount(self.categories[rows], weights=self.amounts[rows], minlength=len(CATEGORIES))
+        return {
+            "period": period,
+            "categories": {name: round(float(t), 2) for name, t in zip(CATEGORIES, totals) if t > 0},
+        }
+
+    def monthly_trend(self, name: Optional[str] = None, months: int = 6, today: Optional[datetime.date] = None) -> Dict:
+        """Per-month totals for the last `months` calendar months, current month included"""
+        today = today or datetime.datetime.now(datetime.timezone.utc).date()
+        current = (today.year - 1970) * 12 + today.month - 1
+        kind, code = self.resolve(name) if name else (None, None)
+        if kind is None:
+            series = self.month_totals
+        else:
+            series = self.rollups[kind][0][code]
+
+        trend = []
+        for month in range(current - max(1, months) + 1, current + 1):
+            offset = month - self.first_month
+            value = series[offset] if 0 <= offset < self.month_count else 0.0
+            trend.append({"month": _month_label(month), "total": round(float(value), 2)})
+        return {"label": self._label(kind, code) if kind else "all spending", "months": trend}
+
+    def _label(self, kind: str, code: int) -> str:
+        if kind == "category":
+            return CATEGORIES[code]
+        if kind == "subcategory":
+            return SUBCATEGORIES[code]
+        return self.merchant_names[code]
+
+
+async def fetch_transactions(
+    user_id: str,
+    backend_url: str = BACKEND_URL,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> List[Dict]:
+    """All stored transactions for a user from the Node backend"""
+    if not user_id:
+        # The backend answers an empty id with its test user's data, or a 400
+        raise ValueError("fetch_transactions needs a user id")
+    own_session = session is None
+    session = session or aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+    try:
+        async with session.post(
+            f"{backend_url.rstrip('/')}/api/transactions/list-all",
+            json={"userId": user_id},
+        ) as response:
+            if response.status != 200:
+                raise RuntimeError(f"{response.status} - {await response.text()}")
+            return (await response.json()).get("transactions", [])
+    finally:
+        if own_session:
+            await session.close()
+
+
+_PERIOD_PARAM = {
+    "type": "string",
+    "description": f"One of {', '.join(PERIODS)}, or a calendar month as YYYY-MM",
+}
+
+SPENDING_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_spending_total",
+            "description": "Exact amount the user spent in a period, overall or for one budget category "
+                           "(Foundations, Delights, Nest Egg, Wild Cards), subcategory (e.g. Fast Food, "
+                           "Groceries) or merchant",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "description": "Category, subcategory or merchant; omit for all spending"},
+                    "period": _PERIOD_PARAM,
+                },
+                "required": ["period"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_top_merchants",
+            "description": "Merchants the user spent the most at in a period, optionally within one category",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "period": _PERIOD_PARAM,
+                    "category": {"type": "string", "description": "Optional category or subcategory filter"},
+                    "limit": {"type": "integer", "description": "How many merchants, default 5"},
+                },
+                "required": ["period"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_category_breakdown",
+            "description": "Spending per budget category (Foundations, Delights, Nest Egg, Wild Cards) in a period",
+            "parameters": {"type": "object", "properties": {"period": _PERIOD_PARAM}, "required": ["period"]},
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_monthly_trend",
+            "description": "Month-by-month spending for recent months, overall or for one category, subcategory or merchant",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "description": "Category, subcategory or merchant; omit for all spending"},
+                    "months": {"type": "integer", "description": "Number of months including this one, default 6"},
+                },
+            },
+        },
+    },
+]
+
+
+class SpendingTools:
+    """LLM function-call handlers over a SpendingIndex that loads once per session"""
+
+    def __init__(self, loader: Callable[[], Awaitable[SpendingIndex]], load_timeout: float = 10.0):
+        self._loader = loader
+        self.load_timeout = load_timeout
+        self._task: Optional[asyncio.Task] = None
+        self.calls = 0
+
+    def start(self):
+        """Begin loading the index in the background (idempotent)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._load())
+
+    async def _load(self) -> SpendingIndex:
+        started = asyncio.get_running_loop().time()
+        index = await self._loader()
+        logger.info(
+            f"📇 Spending index built: {len(index)} transactions, {index.month_count} months "
+            f"in {(asyncio.get_running_loop().time() - started) * 1000:.0f}ms"
+        )
+        return index
+
+    async def index(self) -> SpendingIndex:
+        self.start()
+        return await asyncio.wait_for(asyncio.shield(self._task), timeout=self.load_timeout)
+
+    def answer(self, index: SpendingIndex, function_name: str, arguments: Dict[str, Any]) -> Dict:
+        if function_name == "get_spending_total":
+            return index.total(arguments.get("name"), arguments.get("period", "this_month"))
+        if function_name == "get_top_merchants":
+            return index.top_merchants(
+                arguments.get("period", "this_month"), arguments.get("category"), int(arguments.get("limit", 5))
+            )
+        if function_name == "get_category_breakdown":
+            return index.category_breakdown(arguments.get("period", "this_month"))
+        if function_name == "get_monthly_trend":
+            return index.monthly_trend(arguments.get("name"), int(arguments.get("months", 6)))
+        raise KeyError(f"Unknown spending tool '{function_name}'")
+
+    async def handle(self, params):
+        """Pipecat function-call handler (FunctionCallParams)"""
+        self.calls += 1
+        try:
+            result = self.answer(await self.index(), params.function_name, dict(params.arguments or {}))
+        except asyncio.TimeoutError:
+            result = {"error": "Transactions are still loading, try again in a moment"}
+        except (KeyError, ValueError) as e:
+            result = {"error": str(e).strip("'\"")}
+        except Exception as e:
+            logger.warning(f"⚠️ Spending tool {params.function_name} failed: {e}")
+            result = {"error": "Spending data is unavailable right now"}
+        await params.result_callback(result)
+
+    def register(self, llm):
+        for tool in SPENDING_TOOLS:
+            llm.register_function(tool["function"]["name"], self.handle)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+
+import asyncio
+import bisect
+import hashlib
+import logging
+import mmap
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Text -> raw 16-bit mono PCM at the cache's sample rate
+Synthesizer = Callable[[str], Awaitable[bytes]]
+
+CACHE_DIR = os.getenv("PIPECAT_TTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "finley-tts-cache"))
+
+CARTESIA_API_URL = "https://api.cartesia.ai"
+CARTESIA_VERSION = "2024-06-10"
+
+
+def normalize_phrase(text: str) -> str:
+    """Spacing and case don't change the audio Cartesia produces for a phrase"""
+    return " ".join(text.split()).lower()
+
+
+def phrase_key(text: str, voice_id: str, model_id: str, sample_rate: int) -> str:
+    raw = "\x1f".join([normalize_phrase(text), voice_id, model_id, str(sample_rate)])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def split_sentences(text: str):
+    """(complete sentences, remainder) using the same end-of-sentence rule as TTS aggregation"""
+    parts = re.split(r"(?<=[.!?])\s+", text)
+    if re.search(r"[.!?]\s*$", text):
+        return [p for p in parts if p.strip()], ""
+    return [p for p in parts[:-1] if p.strip()], parts[-1]
+
+
+class PhraseAudioCache:
+    """Two-tier cache of synthesized phrases: a per-process LRU over a host-wide disk directory
+
+    Disk entries are one PCM file per phrase, written atomically and read through mmap, so
+    every bot process on the host shares them through the page cache. A phrase is only
+    synthesized for the cache once it has been spoken `admit_after` times.
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int = 32 * 1024 * 1024,
+        disk_dir: Optional[str] = CACHE_DIR,
+        disk_bytes: int = 256 * 1024 * 1024,
+        admit_after: int = 2,
+        max_tracked: int = 10000,
+    ):
+        self.memory_bytes = memory_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self.admit_after = admit_after
+        self.max_tracked = max_tracked
+        self._memory: "OrderedDict[str, Union[bytes, mmap.mmap]]" = OrderedDict()
+        self._memory_used = 0
+        self._seen: "OrderedDict[str, int]" = OrderedDict()
+        self._filling: Set[str] = set()
+        self._fill_tasks: Set[asyncio.Task] = set()
+        self._disk_used: Optional[int] = None
+        # Sorted normalized texts of cached phrases, for prefix checks on streaming text; rebuilt
+        # from the disk tier (or, without one, the memory tier) so evicted phrases leave it
+        self._texts: List[str] = []
+        self._memory_texts: Dict[str, str] = {}
+        self._texts_loaded_at = 0.0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.fills = 0
+        self.fill_errors = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _path(self, key: str, suffix: str = ".pcm") -> str:
+        return os.path.join(self.disk_dir, f"{key}{suffix}")
+
+    def _add_text(self, text: str):
+        text = normalize_phrase(text)
+        index = bisect.bisect_left(self._texts, text)
+        if index == len(self._texts) or self._texts[index] != text:
+            self._texts.insert(index, text)
+
+    def _load_texts(self):
+        """Pick up phrases other bot processes on the host added to, or evicted from, the disk tier"""
+        self._texts_loaded_at = time.monotonic()
+        if not self.disk_dir:
+            self._texts = sorted(set(self._memory_texts.values()))
+            return
+        texts = set()
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".txt"):
+                try:
+                    with open(entry.path) as f:
+                        texts.add(normalize_phrase(f.read()))
+                except FileNotFoundError:
+                    pass
+        self._texts = sorted(texts)
+
+    def might_start(self, text: str, refresh_interval: float = 60.0) -> bool:
+        """Whether some cached phrase begins with this (possibly partial) text"""
+        if time.monotonic() - self._texts_loaded_at > refresh_interval:
+            self._load_texts()
+        text = normalize_phrase(text)
+        index = bisect.bisect_left(self._texts, text)
+        return index < len(self._texts) and self._texts[index].startswith(text)
+
+    def _remember(self, key: str, audio: Union[bytes, mmap.mmap]):
+        if len(audio) > self.memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_used -= len(self._memory.pop(key))
+        self._memory[key] = audio
+        self._memory_used += len(audio)
+        evicted_text = False
+        while self._memory_used > self.memory_bytes:
+            # Mapped entries are unmapped once no replay still holds them
+            evicted_key, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+            evicted_text = self._memory_texts.pop(evicted_key, None) is not None or evicted_text
+        if evicted_text:
+            self._load_texts()
+
+    def _read_disk(self, key: str) -> Optional[mmap.mmap]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # Recently used files survive disk eviction longest
+            os.utime(self._path(key))
+            return mapped
+        except (FileNotFoundError, ValueError):
+            # ValueError: empty file, e.g. a write that never completed
+            return None
+
+    def lookup(self, key: str) -> Tuple[Optional[Union[bytes, mmap.mmap]], str]:
+        """(audio or None, "memory_hit" | "disk_hit" | "miss")"""
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return audio, "memory_hit"
+
+        audio = self._read_disk(key)
+        if audio is not None:
+            self.disk_hits += 1
+            self._remember(key, audio)
+            return audio, "disk_hit"
+
+        self.misses += 1
+        return None, "miss"
+
+    def contains(self, key: str) -> bool:
+        """Presence check that doesn't count as a lookup"""
+        return key in self._memory or bool(self.disk_dir and os.path.exists(self._path(key)))
+
+    def put(self, key: str, audio: bytes, text: Optional[str] = None):
+        self._remember(key, audio)
+        if not self.disk_dir:
+            if text and key in self._memory:
+                self._memory_texts[key] = normalize_phrase(text)
+                self._add_text(text)
+            return
+        if text:
+            self._add_text(text)
+        for suffix, data in ((".txt", (text or "").encode()), (".pcm", audio)):
+            tmp = f"{self._path(key, suffix)}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key, suffix))
+        if self._disk_used is not None:
+            self._disk_used += len(audio)
+        self._enforce_disk_limit()
+
+    def _enforce_disk_limit(self):
+        """Drop least recently used files once the directory is over its budget"""
+        if self._disk_used is not None and self._disk_used <= self.disk_bytes:
+            return
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".pcm"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Evicted by another bot process
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        self._disk_used = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._disk_used <= self.disk_bytes:
+                break
+            for stale in (path, path[:-len(".pcm")] + ".txt"):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+            self._disk_used -= size
+
+    def should_fill(self, key: str) -> bool:
+        """Count one more use of an uncached phrase; True once it is worth synthesizing"""
+        if key in self._filling:
+            return False
+        count = self._seen.pop(key, 0) + 1
+        self._seen[key] = count
+        if len(self._seen) > self.max_tracked:
+            self._seen.popitem(last=False)
+        return count >= self.admit_after
+
+    def schedule_fill(self, key: str, text: str, synthesize: Synthesizer):
+        """Synthesize a phrase in the background and store it in both tiers"""
+        self._filling.add(key)
+        task = asyncio.create_task(self._fill(key, text, synthesize))
+        self._fill_tasks.add(task)
+        task.add_done_callback(self._fill_tasks.discard)
+
+    async def _fill(self, key: str, text: str, synthesize: Synthesizer):
+        try:
+            audio = await synthesize(text)
+            if audio:
+                self.put(key, audio, text)
+                self._seen.pop(key, None)
+                self.fills += 1
+        except Exception as e:
+            self.fill_errors += 1
+            logger.warning(f"⚠️ TTS cache fill failed for {text!r}: {e}")
+        finally:
+            self._filling.discard(key)
+
+    def stats(self) -> Dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_used,
+            "disk_bytes": self._disk_used,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "fills": self.fills,
+            "fill_errors": self.fill_errors,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else None,
+        }
+
+
+def cartesia_synthesizer(
+    api_key: str,
+    voice_id: str,
+    model_id: str,
+    sample_rate: int,
+    session_provider: Optional[Callable[[], aiohttp.ClientSession]] = None,
+) -> Synthesizer:
+    """Synthesizer for cache fills over Cartesia's REST endpoint (raw pcm_s16le)"""
+    own_session: Optional[aiohttp.ClientSession] = None
+
+    def session() -> aiohttp.ClientSession:
+        nonlocal own_session
+        if session_provider:
+            return session_provider()
+        if own_session is None or own_session.closed:
+            own_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return own_session
+
+    async def synthesize(text: str) -> bytes:
+        async with session().post(
+            f"{CARTESIA_API_URL}/tts/bytes",
+            headers={"X-API-Key": api_key, "Cartesia-Version": CARTESIA_VERSION},
+            json={
+                "model_id": model_id,
+                "transcript": text,
+                "voice": {"mode": "id", "id": voice_id},
+                "output_format": {"container": "raw", "encoding": "pcm_s16le", "sample_rate": sample_rate},
+            },
+        ) as response:
+            if response.status != 200:
+                raise RuntimeError(f"{response.status} - {await response.text()}")
+            return await response.read()
+
+    return synthesize
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from pipecat_bot_supervisor import BotSupervisor, ManagedProcess
+
+logger = logging.getLogger(__name__)
+
+# Path to the bot entrypoint, resolved once so workers start from any cwd; PIPECAT_BOT_SCRIPT
+# swaps in a stand-in bot (see benchmarks/fake_bot.py)
+BOT_SCRIPT = os.path.abspath(
+    os.getenv("PIPECAT_BOT_SCRIPT")
+    or os.path.join(os.path.dirname(os.path.abspath(__file__)), "pipecat_server.py")
+)
+
+# Line a worker prints on stdout once imports and the VAD model are loaded
+WORKER_READY_MESSAGE = "FINLEY_WORKER_READY"
+
+
+@dataclass
+class BotJob:
+    """Session parameters handed to a warm worker over its stdin pipe"""
+    room_url: str
+    token: str
+    access_token: Optional[str] = None
+    user_id: Optional[str] = None
+
+    def encode(self) -> bytes:
+        return (json.dumps(self.__dict__) + "\n").encode()
+
+    @classmethod
+    def decode(cls, line: str) -> "BotJob":
+        data = json.loads(line)
+        return cls(
+            room_url=data["room_url"],
+            token=data["token"],
+            access_token=data.get("access_token"),
+            user_id=data.get("user_id"),
+        )
+
+
+def emit_event(event: str, **data):
+    """Write one JSON event line to stdout for the manager (bot side)"""
+    try:
+        sys.stdout.write(json.dumps({"event": event, **data}) + "\n")
+        sys.stdout.flush()
+    except (BrokenPipeError, ValueError):
+        # The node that spawned this bot is gone; keep the call running without reports
+        pass
+
+
+def announce_worker_ready():
+    """Tell the manager this worker finished warming up (worker side)"""
+    try:
+        sys.stdout.write(WORKER_READY_MESSAGE + "\n")
+        sys.stdout.flush()
+    except (BrokenPipeError, ValueError):
+        # The node shut down while this worker warmed up; a job may still be in its stdin
+        pass
+
+
+async def read_worker_job() -> BotJob:
+    """Block until the manager hands this worker a session (worker side)"""
+    loop = asyncio.get_running_loop()
+    line = await loop.run_in_executor(None, sys.stdin.readline)
+    if not line:
+        raise EOFError("Worker pool closed the job channel")
+    return BotJob.decode(line)
+
+
+@dataclass
+class PooledWorker:
+    managed: ManagedProcess
+    spawned_at: float = field(default_factory=time.monotonic)
+    ready_at: Optional[float] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.managed.alive
+
+
+class BotWorkerPool:
+    """Keeps a configurable number of pre-imported bot workers ready for handoff"""
+
+    def __init__(self, supervisor: BotSupervisor, size: int = 2, refill_interval: float = 5.0):
+        self.supervisor = supervisor
+        self.size = max(0, size)
+        self.refill_interval = refill_interval
+        self._ready: Deque[PooledWorker] = deque()
+        self._warming: List[PooledWorker] = []
+        self._refill_event = asyncio.Event()
+        self._refill_task: Optional[asyncio.Task] = None
+        self.warm_hits = 0
+        self.cold_hits = 0
+        self.spawned = 0
+        self._handoff_ms: Deque[float] = deque(maxlen=100)
+
+    async def _spawn_worker(self) -> PooledWorker:
+        """Start a worker process that warms up and waits for a job"""
+        managed = await self.supervisor.spawn([sys.executable, BOT_SCRIPT, "--worker"], name="bot worker")
+        worker = PooledWorker(managed=managed)
+        # Bound to the worker once it exists; stdout is only read after this coroutine yields
+        managed.on_stdout_line = functools.partial(self._on_worker_line, worker)
+        managed.on_exit.append(lambda _: self._refill_event.set())
+        self.spawned += 1
+        self._warming.append(worker)
+        logger.info(f"🔥 Spawned pool worker {managed.pid}")
+        return worker
+
+    def _on_worker_line(self, worker: PooledWorker, line: str) -> bool:
+        if line.strip() != WORKER_READY_MESSAGE:
+            return False
+        self._mark_ready(worker)
+        return True
+
+    def _mark_ready(self, worker: PooledWorker):
+        """Move a worker that finished warming into the warm queue"""
+        worker.ready_at = time.monotonic()
+        if worker in self._warming:
+            self._warming.remove(worker)
+            self._ready.append(worker)
+            logger.info(
+                f"✅ Pool worker {worker.managed.pid} ready in "
+                f"{worker.ready_at - worker.spawned_at:.2f}s"
+            )
+
+    def _prune(self):
+        """Drop workers that died before they were used"""
+        for worker in [w for w in self._ready if not w.alive]:
+            self._ready.remove(worker)
+        self._warming = [w for w in self._warming if w.alive]
+
+    async def _refill_loop(self):
+        while True:
+            self._prune()
+            while len(self._ready) + len(self._warming) < self.size:
+                await self._spawn_worker()
+            self._refill_event.clear()
+            try:
+                await asyncio.wait_for(self._refill_event.wait(), timeout=self.refill_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self):
+        """Start the background refill task"""
+        if self._refill_task is None:
+            self._refill_task = asyncio.create_task(self._refill_loop())
+            logger.info(f"🏊 Bot worker pool started (size={self.size})")
+
+    async def stop(self):
+        """Stop refilling and stop every idle worker in parallel"""
+        if self._refill_task:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+
+        idle = [*self._ready, *self._warming]
+        self._ready.clear()
+        self._warming.clear()
+        await asyncio.gather(*(self.supervisor.terminate(w.managed, timeout=1) for w in idle))
+
+    async def _acquire(self) -> PooledWorker:
+        """Take a warm worker if one is ready, otherwise fall back to a cold one"""
+        self._prune()
+        if self._ready:
+            self.warm_hits += 1
+            return self._ready.popleft()
+
+        self.cold_hits += 1
+        if self._warming:
+            # Still importing, but already ahead of a fresh spawn
+            return self._warming.pop(0)
+        worker = await self._spawn_worker()
+        self._warming.remove(worker)
+        return worker
+
+    async def launch(
+        self, room_url: str, token: str, access_token: Optional[str] = None, user_id: Optional[str] = None
+    ) -> ManagedProcess:
+        """Hand a session to a pooled worker and return its process"""
+        started = time.perf_counter()
+        worker = await self._acquire()
+        job = BotJob(room_url=room_url, token=token, access_token=access_token, user_id=user_id)
+
+        stdin = worker.managed.process.stdin
+        stdin.write(job.encode())
+        await stdin.drain()
+        stdin.close()
+
+        handoff_ms = (time.perf_counter() - started) * 1000
+        self._handoff_ms.append(handoff_ms)
+        self._refill_event.set()
+
+        logger.info(
+            f"🤝 Handed room {room_url} to worker {worker.managed.pid} "
+            f"({'warm' if worker.ready_at else 'cold'}, {handoff_ms:.1f}ms)"
+        )
+        return worker.managed
+
+    def stats(self) -> Dict:
+        """Pool size and warm/cold hit counters for health reporting"""
+        handoffs = list(self._handoff_ms)
+        return {
+            "size": self.size,
+            "ready": len(self._ready),
+            "warming": len(self._warming),
+            "spawned": self.spawned,
+            "warm_hits": self.warm_hits,
+            "cold_hits": self.cold_hits,
+            "avg_handoff_ms": round(sum(handoffs) / len(handoffs), 2) if handoffs else None,
+        }
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import os
+import struct
+import tempfile
+import time
+import uuid
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+# WebSocket messages between a client and its bot, binary only: one type byte, then the payload
+#   MSG_AUDIO  16-bit little-endian mono PCM; client to bot at the bot's input rate, bot to
+#              client at its output rate (both announced in the "ready" event)
+#   MSG_EVENT  UTF-8 JSON object with a "type": ready, interrupt (drop queued playback), end
+MSG_AUDIO = 0x01
+MSG_EVENT = 0x02
+
+# Node <-> bot over the session's unix socket: each WebSocket message unchanged, after its
+# length. The bot reads length and type together, so the payload needs no slicing.
+RELAY_HEADER = struct.Struct("<I")
+BOT_HEADER = struct.Struct("<IB")
+MAX_MESSAGE_BYTES = 1 << 20
+
+# Sessions whose room URL has this scheme use the WebSocket transport instead of Daily
+RELAY_SCHEME = "relay:"
+SOCKET_DIR_ENV = "PIPECAT_WS_SOCKET_DIR"
+
+
+def relay_room_url() -> str:
+    """A new room URL for a WebSocket session; there is no room, it names the bot's socket"""
+    return f"{RELAY_SCHEME}{uuid.uuid4().hex}"
+
+
+def is_relay_room(room_url: str) -> bool:
+    return room_url.startswith(RELAY_SCHEME)
+
+
+def relay_socket_path(room_url: str) -> str:
+    """The unix socket the session's bot listens on; node and bot resolve it the same way"""
+    directory = os.getenv(SOCKET_DIR_ENV) or os.path.join(tempfile.gettempdir(), "finley-ws")
+    return os.path.join(directory, room_url[len(RELAY_SCHEME):] + ".sock")
+
+
+async def open_relay(path: str, timeout: float = 15.0) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to a bot's socket, waiting for a bot that is still building its pipeline"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await asyncio.open_unix_connection(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.02)
+
+
+async def relay_websocket(websocket, path: str, connect_timeout: float = 15.0):
+    """Pass an accepted WebSocket's binary messages to the bot at `path` and back, unchanged
+
+    Messages are forwarded as the server received them, behind a 4-byte length, and the
+    bot's replies are read straight into the bytes sent back; neither side is re-encoded
+    or copied here. Returns when either the client or the bot goes away.
+    """
+    try:
+        reader, writer = await open_relay(path, connect_timeout)
+    except OSError as e:
+        logger.warning(f"⚠️ No bot listening on {path}: {e}")
+        await websocket.close(code=1011)
+        return
+
+    async def upstream():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            data = message.get("bytes")
+            if not data:
+                continue  # Text frames are not part of the protocol
+            writer.write(RELAY_HEADER.pack(len(data)))
+            writer.write(data)
+            await writer.drain()
+
+    async def downstream():
+        try:
+            while True:
+                (size,) = RELAY_HEADER.unpack(await reader.readexactly(RELAY_HEADER.size))
+                await websocket.send_bytes(await reader.readexactly(size))
+        except asyncio.IncompleteReadError:
+            await websocket.close()  # The bot ended the session
+
+    tasks = [asyncio.create_task(upstream()), asyncio.create_task(downstream())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
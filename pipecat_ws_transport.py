@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    StartFrame,
+    StartInterruptionFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.transports.base_input import BaseInputTransport
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import BaseTransport, TransportParams
+
+from pipecat_ws_relay import BOT_HEADER, MAX_MESSAGE_BYTES, MSG_AUDIO, MSG_EVENT, relay_socket_path
+
+logger = logging.getLogger(__name__)
+
+
+class RelayInputTransport(BaseInputTransport):
+    def __init__(self, transport: "RelayTransport", params: TransportParams):
+        super().__init__(params)
+        self._transport = transport
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        await self.set_transport_ready(frame)
+        # StartFrame went through the rest of the pipeline first, so the output is ready too
+        await self._transport.listen()
+
+    async def cleanup(self):
+        await super().cleanup()
+        await self._transport.close()
+
+
+class RelayOutputTransport(BaseOutputTransport):
+    def __init__(self, transport: "RelayTransport", params: TransportParams):
+        super().__init__(params)
+        self._transport = transport
+        # Audio goes out as fast as TTS makes it; sleeping half a chunk per chunk emulates
+        # a playback clock while keeping the client's buffer ahead (as pipecat's websocket
+        # server transport does)
+        self._send_interval = 0.0
+        self._next_send_time = 0.0
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        self._send_interval = (self.audio_chunk_size / self.sample_rate) / 2
+        await self.set_transport_ready(frame)
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        await self._transport.send_event("end")
+        await self._transport.close()
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        await self._transport.send_event("end")
+        await self._transport.close()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartInterruptionFrame):
+            # The client drops whatever it has buffered but not played
+            await self._transport.send_event("interrupt")
+            self._next_send_time = 0
+
+    async def write_raw_audio_frames(self, frames: bytes, destination: Optional[str] = None):
+        await self._transport.send_audio(frames)
+        await self._write_audio_sleep()
+
+    async def _write_audio_sleep(self):
+        sleep_duration = max(0, self._next_send_time - time.monotonic())
+        await asyncio.sleep(sleep_duration)
+        if sleep_duration == 0:
+            self._next_send_time = time.monotonic() + self._send_interval
+        else:
+            self._next_send_time += self._send_interval
+
+
+class RelayTransport(BaseTransport):
+    """Audio to and from one WebSocket client, relayed by the node over a unix socket
+
+    The bot listens on `path` once its whole pipeline has started; the node connects when the
+    client's WebSocket does (see pipecat_ws_relay.py for the framing). Client audio is
+    pushed into the pipeline as it arrives, through VAD, like audio from a Daily room.
+    A client that reconnects replaces the previous connection.
+    """
+
+    def __init__(self, path: str, vad_analyzer, sample_rate_in: int = 0, sample_rate_out: int = 0):
+        super().__init__()
+        self.path = path
+        params = TransportParams(
+            audio_in_enabled=True,
+            audio_out_enabled=True,
+            audio_in_sample_rate=sample_rate_in or None,
+            audio_out_sample_rate=sample_rate_out or None,
+            vad_analyzer=vad_analyzer,
+        )
+        self._input = RelayInputTransport(self, params)
+        self._output = RelayOutputTransport(self, params)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    def input(self) -> RelayInputTransport:
+        return self._input
+
+    def output(self) -> RelayOutputTransport:
+        return self._output
+
+    async def listen(self):
+        if self._server:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Left behind by a bot that was killed
+        self._server = await asyncio.start_unix_server(self._serve, self.path)
+        logger.info(f"🔌 Waiting for the WebSocket relay on {self.path}")
+
+    async def close(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self._server:
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self._writer:
+            logger.warning("⚠️ WebSocket client reconnected, dropping the previous connection")
+            self._writer.close()
+        self._writer = writer
+        await self.send_event(
+            "ready", sample_rate_in=self._input.sample_rate, sample_rate_out=self._output.sample_rate
+        )
+
+        input_transport = self._input
+        sample_rate = input_transport.sample_rate
+        try:
+            while True:
+                size, kind = BOT_HEADER.unpack(await reader.readexactly(BOT_HEADER.size))
+                if not 1 <= size <= MAX_MESSAGE_BYTES:
+                    logger.warning(f"⚠️ Dropping WebSocket client: bad message length {size}")
+                    break
+                payload = await reader.readexactly(size - 1)
+                if kind == MSG_AUDIO and payload:
+                    await input_transport.push_audio_frame(InputAudioRawFrame(payload, sample_rate, 1))
+                elif kind == MSG_EVENT:
+                    logger.debug(f"WebSocket client event: {payload[:200]!r}")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if self._writer is writer:
+                self._writer = None
+            writer.close()
+
+    async def send_audio(self, audio: bytes):
+        writer = self._writer
+        if writer is None or writer.is_closing():
+            return  # No client yet or any more; audio is paced and dropped as if played
+        writer.write(BOT_HEADER.pack(len(audio) + 1, MSG_AUDIO))
+        writer.write(audio)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def send_event(self, event: str, **data):
+        writer = self._writer
+        if writer is None or writer.is_closing():
+            return
+        payload = json.dumps({"type": event, **data}).encode()
+        writer.write(BOT_HEADER.pack(len(payload) + 1, MSG_EVENT))
+        writer.write(payload)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
@@ -0,0 +1,51 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+from pipecat_bot_node import NODE_API_PREFIX, BotCluster
+from pipecat_session_registry import NodeRecord, SQLiteSessionRegistry
+from pipecat_worker_pool import BotJob
+
+
+async def start_node_stub(handler):
+    app = web.Application()
+    app.router.add_post(f"{NODE_API_PREFIX}/sessions", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+def test_placement_moves_past_failing_and_slow_nodes(tmp_path):
+    async def scenario():
+        async def failing(request):
+            return web.Response(status=500, text="bot exited during startup")
+
+        async def slow(request):
+            await asyncio.sleep(2)
+            return web.json_response({"bot_id": "late", "pid": 1})
+
+        async def healthy(request):
+            return web.json_response({"bot_id": "bot-1", "node_id": "node-c", "pid": 42})
+
+        stubs = [await start_node_stub(handler) for handler in (failing, slow, healthy)]
+        registry = SQLiteSessionRegistry(str(tmp_path / "sessions.db"))
+        cluster = BotCluster(registry)
+        cluster._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=0.5))
+        try:
+            # Best headroom first, so the healthy node is tried last
+            for (_, url), node_id, headroom in zip(stubs, ("node-a", "node-b", "node-c"), (3, 2, 1)):
+                await registry.sync_node(NodeRecord(node_id, url, headroom=headroom))
+            started = await cluster.start_session(BotJob(room_url="https://room", token="t"))
+        finally:
+            await cluster.close()
+            registry.close()
+            for runner, _ in stubs:
+                await runner.cleanup()
+
+        assert started["bot_id"] == "bot-1"
+        assert started["node_url"] == stubs[2][1]
+
+    asyncio.run(scenario())
@@ -0,0 +1,31 @@
+import asyncio
+
+from pipecat_context import ConversationMemory
+
+
+def test_turns_evicted_during_a_slow_summary_are_summarized_next():
+    async def scenario():
+        release = asyncio.Event()
+        batches = []
+
+        async def slow_summarizer(previous, turns):
+            batches.append([turn.content for turn in turns])
+            if len(batches) == 1:
+                await release.wait()
+            return " ".join(filter(None, [previous, *(turn.content for turn in turns)]))
+
+        memory = ConversationMemory(max_turns=2, summarizer=slow_summarizer)
+        memory.add_user("one")
+        memory.add_user("two")
+        memory.add_user("three")  # Evicts "one" and starts the summary
+        await asyncio.sleep(0)
+        memory.add_user("four")  # Evicts "two" while the first summary is still running
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert batches == [["one"], ["two"]]
+        assert memory.summary == "one two"
+        assert memory._evicted == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,23 @@
+import pipecat_endpointing
+from pipecat_endpointing import AdaptiveVADAnalyzer, _ProbeVADAnalyzer, adaptive_vad_from_env
+
+
+def test_adaptive_endpointing_is_opt_in(monkeypatch):
+    analyzer = _ProbeVADAnalyzer(sample_rate=16000)
+    monkeypatch.delenv("PIPECAT_ADAPTIVE_ENDPOINTING", raising=False)
+    assert adaptive_vad_from_env(analyzer) is analyzer
+
+    monkeypatch.setenv("PIPECAT_ADAPTIVE_ENDPOINTING", "true")
+    assert isinstance(adaptive_vad_from_env(analyzer), AdaptiveVADAnalyzer)
+
+
+def test_adaptive_endpointing_keeps_the_analyzer_without_its_private_state(monkeypatch):
+    analyzer = _ProbeVADAnalyzer(sample_rate=16000)
+    monkeypatch.setenv("PIPECAT_ADAPTIVE_ENDPOINTING", "true")
+    monkeypatch.setattr(pipecat_endpointing, "VAD_ANALYZER_FIELDS", ("_vad_stop_frames", "_vad_removed"))
+    pipecat_endpointing.missing_vad_analyzer_fields.cache_clear()
+    try:
+        assert pipecat_endpointing.missing_vad_analyzer_fields() == ("_vad_removed",)
+        assert adaptive_vad_from_env(analyzer) is analyzer
+    finally:
+        pipecat_endpointing.missing_vad_analyzer_fields.cache_clear()
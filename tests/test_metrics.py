@@ -0,0 +1,20 @@
+from pipecat_metrics import TurnLatencyMetrics, TurnLatencyTracker
+
+
+def run_turn(tracker: TurnLatencyTracker):
+    for mark in ("user_stopped_speaking", "transcription", "llm_first_token", "tts_started", "first_audio"):
+        tracker.mark(mark)
+
+
+def test_only_adaptive_turns_count_towards_endpointing_savings():
+    metrics = TurnLatencyMetrics()
+    fixed = TurnLatencyTracker({"vad": "fixed"}, metrics.observe, endpointing=lambda: (0.8, None))
+    adaptive = TurnLatencyTracker({"vad": "adaptive"}, metrics.observe, endpointing=lambda: (0.5, 0.3))
+
+    run_turn(fixed)
+    run_turn(fixed)
+    run_turn(adaptive)
+
+    assert metrics.turns == 3
+    assert metrics.endpointing_summary() == {"turns": 1, "saved_ms_total": 300, "saved_ms_per_turn": 300.0}
+    assert set(metrics.summary()["endpointing"]) == {"fixed", "adaptive"}
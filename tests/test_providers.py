@@ -0,0 +1,15 @@
+from pipecat_providers import create_service
+from pipecat_routing import ChatRoute, RoutedChatClient
+
+
+def test_llm_service_is_built_with_the_given_chat_client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("PIPECAT_LLM_PROVIDER", "openai")
+    routed = RoutedChatClient([ChatRoute("openai", object(), "gpt-4o")])
+
+    _, llm = create_service("llm", client=routed)
+    assert llm._client is routed
+
+    _, llm = create_service("llm")
+    assert llm._client is not routed
+    assert llm._client.base_url is not None
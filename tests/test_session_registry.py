@@ -0,0 +1,53 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from pipecat_session_registry import NodeRecord, SessionRecord, SessionRegistry, SQLiteSessionRegistry
+
+
+def test_registry_interface_is_abstract():
+    with pytest.raises(TypeError):
+        SessionRegistry()
+
+
+def test_sqlite_round_trip(tmp_path):
+    async def scenario():
+        registry = SQLiteSessionRegistry(str(tmp_path / "sessions.db"))
+        try:
+            await registry.sync_node(NodeRecord("node-a", "http://a", headroom=2))
+            await registry.add_session(SessionRecord("bot-1", "node-a", "https://room", 123))
+            await registry.reserve("node-a")
+            assert (await registry.get_node("node-a")).headroom == 1
+            assert [s.bot_id for s in await registry.sessions("node-a")] == ["bot-1"]
+            await registry.remove_node("node-a")
+            assert await registry.get_session("bot-1") is None
+        finally:
+            registry.close()
+
+    asyncio.run(scenario())
+
+
+def test_contended_write_does_not_block_the_event_loop(tmp_path):
+    path = str(tmp_path / "sessions.db")
+
+    async def scenario():
+        registry = SQLiteSessionRegistry(path)
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")  # Another process holds the write lock
+        try:
+            write = asyncio.create_task(registry.add_session(SessionRecord("bot-1", "node-a", "https://room", 1)))
+            started = time.monotonic()
+            await asyncio.sleep(0.2)
+            # The loop kept running while the write waited on the busy timeout
+            assert time.monotonic() - started < 0.5
+            assert not write.done()
+            other.execute("COMMIT")
+            await asyncio.wait_for(write, timeout=5)
+            assert await registry.get_session("bot-1") is not None
+        finally:
+            other.close()
+            registry.close()
+
+    asyncio.run(scenario())
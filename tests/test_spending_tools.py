@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from pipecat_server import build_spending_tools
+from pipecat_spending_index import fetch_transactions
+
+
+def test_session_with_only_an_access_token_gets_no_spending_tools():
+    assert build_spending_tools(None) is None
+    assert build_spending_tools("") is None
+
+
+def test_fetch_transactions_refuses_an_empty_user_id():
+    with pytest.raises(ValueError):
+        asyncio.run(fetch_transactions(""))
+
+
+def test_spending_tools_load_the_given_users_transactions():
+    async def scenario():
+        requested = []
+
+        async def list_all(request):
+            requested.append((await request.json())["userId"])
+            return web.json_response({"transactions": []})
+
+        app = web.Application()
+        app.router.add_post("/api/transactions/list-all", list_all)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            transactions = await fetch_transactions("user-42", backend_url=f"http://127.0.0.1:{port}")
+        finally:
+            await runner.cleanup()
+
+        assert transactions == []
+        assert requested == ["user-42"]
+        assert build_spending_tools("user-42") is not None
+
+    asyncio.run(scenario())
@@ -0,0 +1,65 @@
+import asyncio
+
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    TextFrame,
+    TTSAudioRawFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from pipecat_server import TTSPhraseCache
+from pipecat_tts_cache import PhraseAudioCache, phrase_key
+
+SAMPLE_RATE = 16000
+
+
+class Recorder(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+        self.audio_frames = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if type(frame) is TextFrame:
+            self.texts.append(frame.text)
+        elif isinstance(frame, TTSAudioRawFrame):
+            self.audio_frames += 1
+        await self.push_frame(frame, direction)
+
+
+def run_reply(cached, chunks):
+    async def scenario():
+        cache = PhraseAudioCache(disk_dir=None)
+        for sentence in cached:
+            cache.put(phrase_key(sentence, "voice", "model", SAMPLE_RATE), b"\x00\x00" * 1600, sentence)
+        recorder = Recorder()
+        task = PipelineTask(
+            Pipeline([TTSPhraseCache(cache, "voice", "model", SAMPLE_RATE), recorder]),
+            params=PipelineParams(allow_interruptions=False),
+            idle_timeout_secs=None,
+        )
+        frames = [LLMFullResponseStartFrame(), *(TextFrame(chunk) for chunk in chunks), LLMFullResponseEndFrame()]
+        await task.queue_frames([*frames, EndFrame()])
+        await PipelineRunner(handle_sigint=False).run(task)
+        return recorder
+
+    return asyncio.run(scenario())
+
+
+def test_sentences_after_a_miss_in_one_batch_all_reach_tts():
+    recorder = run_reply(["Great."], ["Hi there! Great. Let me check", " that."])
+    assert recorder.texts == ["Hi there! ", "Great. ", "Let me check", " that."]
+    assert recorder.audio_frames == 0
+
+
+def test_cached_opening_is_replayed_before_the_rest_goes_to_tts():
+    recorder = run_reply(["Great."], ["Great. Let me check", " that."])
+    assert recorder.texts == ["Let me check", " that."]
+    assert recorder.audio_frames == 1